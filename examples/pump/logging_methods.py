@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Methods for comparing history logging approaches in the Pump and Rover examples.
+
+Compares the per-key parsing in History.log with the compiled loggers used by
+Simulable.log_hist (see History.compile_log).
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from examples.pump.ex_pump import Pump
+import fmdtools.sim.propagate as propagate
+
+import time
+
+
+def compare_logging(mdl, reps=10, verbose=True):
+    """
+    Compare the execution time of parsed and compiled history logging for a model.
+
+    The model is first simulated nominally, after which the final state is re-logged
+    over the full history range using both methods.
+
+    Parameters
+    ----------
+    mdl : Simulable
+        fmdtools model (with the desired tracking options)
+    reps : int, optional
+        Number of times to log the history over its timerange. The default is 10.
+    verbose : bool, optional
+        Whether to output execution time. The default is True.
+
+    Returns
+    -------
+    exectimes : dict
+        Dictionary of execution times for the 'parsed' and 'compiled' methods.
+    """
+    propagate.nominal(mdl, protect=False, showprogress=False, warn_faults=False)
+    times = mdl.h.time
+    exectimes = {}
+
+    starttime = time.time()
+    for _ in range(reps):
+        for t_ind, t in enumerate(times):
+            mdl.h.log(mdl, t_ind, time=t)
+    exectimes['parsed'] = time.time() - starttime
+
+    starttime = time.time()
+    for _ in range(reps):
+        loggers = mdl.h.compile_log(mdl)
+        for t_ind, t in enumerate(times):
+            mdl.h.log_compiled(loggers, t_ind, time=t)
+    exectimes['compiled'] = time.time() - starttime
+
+    if verbose:
+        print("keys: " + str(len(mdl.h)) + ", times: " + str(len(times)))
+        for method, exectime in exectimes.items():
+            print(method + " logging exec time: " + str(exectime))
+        print("speedup: " + str(exectimes['parsed'] / exectimes['compiled']))
+    return exectimes
+
+
+if __name__ == '__main__':
+    from examples.rover.rover_model import Rover
+
+    print("PUMP + DEFAULT TRACKING")
+    compare_logging(Pump())
+    print("PUMP + FULL MODEL TRACKING")
+    compare_logging(Pump(track='all'))
+    print("PUMP + FULL MODEL TRACKING + LONG SIM")
+    compare_logging(Pump(sp=dict(phases=(('start', 0, 4), ('on', 5, 49),
+                                         ('end', 50, 5000)), end_time=5000),
+                         track='all'), reps=2)
+
+    print("ROVER + DEFAULT TRACKING")
+    compare_logging(Rover())
+    print("ROVER + FULL MODEL TRACKING")
+    compare_logging(Rover(track='all'))
@@ -71,6 +71,18 @@ class PumpTests(unittest.TestCase, CommonTests):
         mdl_all = Pump(track='all')
         self.assertGreater(len(mdl_all.h.keys()), 25)
 
+    def test_compiled_hist_logging(self):
+        """Test that compiled loggers log the same values as History.log."""
+        mdl = Pump(track='all')
+        hist = mdl.h.copy()
+        for t_ind, t in enumerate(range(30)):
+            faults = {'move_water': 'mech_break'} if t == 20 else {}
+            mdl.propagate(t, faults)
+            mdl.log_hist(t_ind, t, 0)
+            hist.log(mdl, t_ind, time=t)
+        for k, v in hist.items():
+            np.testing.assert_array_equal(v[:30], mdl.h[k][:30], err_msg=k)
+
     def test_param_sample(self):
         pd = ParameterDomain(PumpParam)
         pd.add_variable("delay")
@@ -163,6 +175,69 @@ class PumpTests(unittest.TestCase, CommonTests):
         quad_util = exp_cost_quant(fs_quad, mdl)
         self.assertAlmostEqual(full_util, quad_util, places=2)
 
+    def test_adaptive_cost_calc(self):
+        """Test that adaptive sampling approximates the expected cost of the full
+        sample with fewer scenarios."""
+        mdl = Pump(p={'cost': ('ee', 'repair', 'water'), 'delay': 0})
+        fs_full = FaultSample(self.fd)
+        fs_full.add_fault_phases(method='all')
+        full_util = exp_cost_quant(fs_full, mdl)
+
+        fs_adapt = FaultSample(self.fd)
+        res, hist = prop.fault_sample_adaptive(mdl, fs_adapt, showprogress=False,
+                                               metrics=['endclass.cost'], tol=1000)
+        fmea = tabulate.FMEA(res, fs_adapt)
+        adapt_util = fmea.as_table()['expected_cost'].sum()
+        self.assertAlmostEqual(full_util, adapt_util, places=2)
+        self.assertLess(fs_adapt.num_scenarios(), fs_full.num_scenarios())
+
+    def test_adaptive_rates(self):
+        """Test that adaptively-sampled scenarios are simulated with the rates of the
+        final sample, so results calculated from the rate match fault_sample."""
+        mdl = Pump(p={'cost': ('ee', 'repair', 'water'), 'delay': 0})
+        for staged in [False, True]:
+            fs_adapt = FaultSample(self.fd)
+            res, hist = prop.fault_sample_adaptive(mdl, fs_adapt, showprogress=False,
+                                                   metrics=['endclass.cost'],
+                                                   tol=1000, staged=staged)
+            res_fs, hist_fs = prop.fault_sample(mdl, fs_adapt, showprogress=False,
+                                                staged=staged)
+            for scen in fs_adapt.scenarios():
+                scen_res = res.get(scen.name)
+                self.assertEqual(scen_res.endclass['rate'], scen.rate)
+                self.assertAlmostEqual(scen_res.endclass['expected_cost'],
+                                       res_fs.get(scen.name).endclass['expected_cost'])
+            self.check_same_res(res, res_fs, res1name="adaptive")
+
+    def test_reconverge(self):
+        """Test that scenarios ended early when reconverging to nominal have the same
+        results/histories as when simulated to the end."""
+        mdl = Pump(track='all')
+        disturbances = {10: {'wat_2.s.flowrate': 5.0}}
+        res, hist = prop.sequence(mdl, disturbances=disturbances)
+        res_rc, hist_rc = prop.sequence(mdl, disturbances=disturbances, reconverge=True)
+        self.check_same_hist(hist, hist_rc, hist1name="reconverge")
+        self.assertEqual(res.endclass.cost, res_rc.endclass.cost)
+        res, hist = prop.fault_sample(self.mdl, self.fs, showprogress=False)
+        res_rc, hist_rc = prop.fault_sample(self.mdl, self.fs, showprogress=False,
+                                            reconverge=True)
+        self.check_same_res(res, res_rc, res1name="reconverge")
+        self.check_same_hist(hist, hist_rc, hist1name="reconverge")
+
+    def test_share_nominal(self):
+        """Test that fault scenario histories sharing values with the nominal history
+        are the same as full histories, and take up less memory."""
+        res, hist = prop.fault_sample(self.mdl, self.fs, showprogress=False)
+        res_sh, hist_sh = prop.fault_sample(self.mdl, self.fs, showprogress=False,
+                                            share_nominal=True, max_mem=2.5e4)
+        self.check_same_res(res, res_sh, res1name="share_nominal")
+        self.check_same_hist(hist, hist_sh, hist1name="share_nominal")
+        scen = self.fs.scen_names()[0]
+        self.assertLess(hist_sh.get(scen).share_nominal(hist_sh.get('nominal')),
+                        hist.get(scen).get_memory()[0])
+        with self.assertRaises(Exception):
+            prop.fault_sample(self.mdl, self.fs, showprogress=False, max_mem=2.5e4)
+
     def test_approach_parallelism(self):
         """Test whether the pump simulates the same when simulated using parallel or
         staged options"""
@@ -171,6 +246,25 @@ class PumpTests(unittest.TestCase, CommonTests):
         fs.add_fault_phases(args=(4,))
         self.check_fs_parallel(self.default_mdl, fs)
 
+    def test_model_pool(self):
+        """Test that parameter/nested samples simulate the same in a ModelPool."""
+        res, hist = prop.parameter_sample(self.mdl, self.ps, showprogress=False)
+        res_mp, hist_mp = prop.parameter_sample(self.mdl, self.ps, showprogress=False,
+                                                pool=prop.ModelPool(2))
+        self.check_same_res(res, res_mp, res1name="modelpool")
+        self.check_same_hist(hist, hist_mp, hist1name="modelpool")
+        ps = ParameterSample()
+        ps.add_variable_replicates([], replicates=2)
+        res, hist, _ = prop.nested_sample(self.mdl, ps, showprogress=False,
+                                          faultdomains=self.faultdomains,
+                                          faultsamples=self.faultsamples)
+        res_mp, hist_mp, _ = prop.nested_sample(self.mdl, ps, showprogress=False,
+                                                faultdomains=self.faultdomains,
+                                                faultsamples=self.faultsamples,
+                                                pool=prop.ModelPool(2))
+        self.check_same_res(res, res_mp, res1name="modelpool")
+        self.check_same_hist(hist, hist_mp, hist1name="modelpool")
+
     def test_pickleability(self):
         unpickleable = check_pickleability(Pump(), verbose=False)
         self.assertTrue(unpickleable == [])
@@ -279,11 +373,30 @@ class PumpTests(unittest.TestCase, CommonTests):
         self.check_fs_save(self.mdl, self.fs, "pump_res.npz", "pump_hist.npz")
         self.check_fs_save(self.mdl, self.fs, "pump_res.csv", "pump_hist.csv")
         self.check_fs_save(self.mdl, self.fs, "pump_res.json", "pump_hist.json")
+        self.check_fs_save(self.mdl, self.fs, "pump_res.cols", "pump_hist.cols")
 
     def test_fault_sample_isave(self):
         self.check_fs_isave(self.mdl, self.fs, *self.filenames, "npz")
         self.check_fs_isave(self.mdl, self.fs, *self.filenames, "csv")
         self.check_fs_isave(self.mdl, self.fs, *self.filenames, "json")
+        self.check_fs_isave(self.mdl, self.fs, *self.filenames, "cols")
+
+    def test_fault_sample_stream(self):
+        self.check_fs_stream(self.mdl, self.fs, "pump_stream")
+        self.check_fs_stream(self.mdl, self.fs, "pump_stream", staged=True,
+                             pool=prop.ModelPool(2))
+
+    def test_nested_sample_stream(self):
+        self.check_ns_stream(self.mdl, self.ps, self.faultdomains, self.faultsamples,
+                             "pump_stream", *self.filenames, "npz")
+        self.check_ns_stream(self.mdl, self.ps, self.faultdomains, self.faultsamples,
+                             "pump_stream", *self.filenames, "npz",
+                             pool=prop.ModelPool(2))
+
+    def test_fault_sample_cache(self):
+        self.check_fs_cache(self.mdl, self.fs, "pump_cache")
+        self.check_fs_cache(self.mdl, self.fs, "pump_cache", staged=True,
+                            pool=prop.ModelPool(2))
 
     def test_fmea_options(self):
         fd = FaultDomain(self.mdl)
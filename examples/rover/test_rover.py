@@ -16,9 +16,16 @@ specific language governing permissions and limitations under the License.
 """
 
 from examples.rover.optimization.search_rover import line_dist, line_dist_faster
+from examples.rover.rover_model import Rover
+from fmdtools.sim import propagate as prop
+from fmdtools.sim.sample import FaultDomain, FaultSample
+from fmdtools.analyze.result import ResultStore
+from fmdtools.analyze.history import History
 from tests.common import CommonTests
 
 import unittest
+import shutil
+import numpy as np
 
 
 class RoverTests(unittest.TestCase, CommonTests):
@@ -34,6 +41,47 @@ class RoverTests(unittest.TestCase, CommonTests):
             self.assertEqual(enddist, enddist_int)
             self.assertEqual(endpt, endpt_int)
 
+    def test_all_at_many(self):
+        """Check batched geom queries on the ground against per-point queries."""
+        mdl = Rover()
+        res, hist = prop.nominal(mdl)
+        pts = np.array([hist.flows.pos.s.x, hist.flows.pos.s.y]).T
+        for ga in [mdl.flows['ground'].ga, mdl.copy().flows['ground'].ga]:
+            ats = ga.all_at_many(pts)
+            self.assertEqual(ats, [ga.all_at(*pt) for pt in pts])
+            self.assertTrue(any(ats))
+            # cached index should be kept when the geom state changes
+            keys, tree = ga.get_geom_index()
+            ga.points['end'].s.near = not ga.points['end'].s.near
+            self.assertIs(ga.get_geom_index()[1], tree)
+            self.assertEqual(ga.all_at_many(pts), ats)
+
+    def test_fault_sample_stream(self):
+        """Check streaming results of a model with object-valued tracked values."""
+        mdl = Rover()
+        fd = FaultDomain(mdl)
+        fd.add_all_fxn_modes('drive')
+        fs = FaultSample(fd)
+        fs.add_fault_times([5])
+        _, hist = prop.fault_sample(mdl, fs, staged=True, showprogress=False)
+        _, hist_store = prop.fault_sample(mdl, fs, staged=True,
+                                          stream="rover_stream", showprogress=False)
+        # re-opened stores only load object values if allow_pickle=True
+        with self.assertRaises(Exception):
+            ResultStore("rover_stream/hist", History).load()
+        hist_open = ResultStore("rover_stream/hist", History, allow_pickle=True)
+        for hist_load in [hist_store.load(), hist_store.load(lazy=True),
+                          hist_open.load()]:
+            self.assertEqual(set(hist), set(hist_load))
+            for k, v in hist.items():
+                if v.dtype == object:
+                    # objects are unpickled as copies
+                    self.assertEqual([type(o) for o in v],
+                                     [type(o) for o in hist_load[k]])
+                else:
+                    np.testing.assert_array_equal(v, hist_load[k])
+        shutil.rmtree("rover_stream")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,15 +5,22 @@ Defines :class:`History`: class and for structuring/analyzing simulation histori
 
 - :class:`History`: Class for defining simulation histories
   (nested dictionaries of arrays or lists)
+- :class:`SparseHist`: Class for storing histories of array-valued attributes as
+  keyframes and per-step changes.
 
 And functions/methods:
 
+- :func:`copy_logged`: Copies a known mutable value (dict/set) for logging.
 - :func:`diff`: Helper function for finding inconsistent states between val1, val2, with
   the difftype option
+- :func:`is_same_as_nominal`: Checks if a history array is the same as the start of
+  the corresponding nominal history array.
 - :func:`init_hist_iter`: Initializes the history for a given attribute att with value
   val. Enables the recursive definition of a history as a nested structure.
 - :func:`init_dicthist`: Initializes histories for dictionary attributes (if any)
 - :func:`def prep_hists`: Prepare the history for plotting.
+- :func:`compile_logger`: Resolves a history key into a direct accessor on an object
+  for use in :meth:`History.log_compiled`.
 
 Copyright © 2024, United States Government, as represented by the Administrator
 of the National Aeronautics and Space Administration. All rights reserved.
@@ -40,7 +47,9 @@ from fmdtools.analyze.common import mark_times, consolidate_legend, add_title_xy
 from fmdtools.analyze.common import prep_animation_title, clear_prev_figure
 
 from matplotlib import animation
+from numpy.lib.mixins import NDArrayOperatorsMixin
 from functools import partial
+from inspect import signature
 import numpy as np
 import copy
 
@@ -55,6 +64,34 @@ def is_known_mutable(val):
     return type(val) in [dict, set]
 
 
+def copy_logged(val):
+    """
+    Copy a known mutable value val so that it may be logged in a history.
+
+    Sets are copied shallowly (since their entries must be hashable), as are dicts of
+    known immutables, so a full deepcopy is only needed for nested/unknown values.
+
+    Examples
+    --------
+    >>> s = {'a', 'b'}
+    >>> copy_logged(s) == s
+    True
+    >>> type(copy_logged(s))
+    <class 'set'>
+    >>> copy_logged(s) is s
+    False
+    >>> d = {'a': 1, 'b': [1]}
+    >>> copy_logged(d)['b'] is d['b']
+    False
+    """
+    if type(val) is set:
+        return set(val)
+    elif all(is_known_immutable(v) for v in val.values()):
+        return dict(val)
+    else:
+        return copy.deepcopy(val)
+
+
 def init_hist_iter(att, val, timerange=None, track=None, dtype=None, str_size='<U20'):
     """
     Initialize the history for a given attribute att with value val.
@@ -138,6 +175,143 @@ def diff(val1, val2, difftype='bool'):
         raise Exception("Unable to diff "+str(val1)+" and "+str(val2)) from e
 
 
+def is_same_as_nominal(val, nom_val):
+    """Check if the history array val is the same as the start of nom_val."""
+    if not (isinstance(val, np.ndarray) and isinstance(nom_val, np.ndarray)):
+        return False
+    if val is nom_val or nom_val.dtype != val.dtype or nom_val.dtype == object:
+        return False
+    if nom_val.shape[1:] != val.shape[1:] or len(nom_val) < len(val):
+        return False
+    equal_nan = np.issubdtype(val.dtype, np.inexact)
+    return np.array_equal(val, nom_val[:len(val)], equal_nan=equal_nan)
+
+
+def resolve_owner(obj, path):
+    """
+    Walk the attribute/key path from obj to the object owning the final field.
+
+    Unlike :func:`get_var`, this returns the owning object itself (rather than its
+    value) and returns None if the path cannot be resolved without string-parsing
+    (e.g., for dotted dictionary keys).
+    """
+    for k in path:
+        if isinstance(obj, dict):
+            if k not in obj:
+                return None
+            obj = obj[k]
+        elif hasattr(obj, 'keys') and hasattr(obj, 'values'):
+            return None
+        else:
+            obj = getattr(obj, k)
+    return obj
+
+
+def compile_logger(obj, att):
+    """
+    Resolve the history key att into a direct accessor on obj.
+
+    Used by :meth:`History.compile_log` so that the key is only parsed once, rather
+    than at every time-step.
+
+    Parameters
+    ----------
+    obj : Model/Function/State...
+        Object to log.
+    att : str
+        (Flattened) key of the history, e.g. 'fxns.fxnname.s.x'
+
+    Returns
+    -------
+    logger : tuple
+        Tuple (att, logtype, owner, name), where logtype is one of:
+
+        - 'time': logs the time given to :meth:`History.log_compiled` (if given)
+        - 'attr': logs getattr(owner, name)
+        - 'item': logs owner.get(name)
+        - 'ind'/'ind_t': logs the indicator method owner() or owner(time)
+        - 'fault': logs whether name is in owner.faults
+        - 'var': logs get_var(owner, name) (fallback for keys that can't be resolved)
+
+    Examples
+    --------
+    >>> from fmdtools.define.container.state import ExampleState
+    >>> ex = ExampleState()
+    >>> compile_logger(ex, 'x')
+    ('x', 'attr', ExampleState(x=1.0, y=1.0), 'x')
+    >>> compile_logger({'a': ex}, 'a.y')
+    ('a.y', 'attr', ExampleState(x=1.0, y=1.0), 'y')
+    """
+    if att == 'time':
+        return (att, 'time', obj, att)
+    split_att = att.split('.')
+    try:
+        if 'i' in split_att[:-1]:
+            i_ind = split_att.index('i')
+            meth = get_var(obj, split_att[:i_ind] + ['indicate_' + split_att[-1]])
+            if bool(signature(meth).parameters):
+                return (att, 'ind_t', meth, None)
+            else:
+                return (att, 'ind', meth, None)
+        elif 'faults' in split_att[:-1]:
+            faultind = split_att.index('faults')
+            mode = resolve_owner(obj, split_att[:faultind])
+            if mode is not None and hasattr(mode, 'faults'):
+                return (att, 'fault', mode, split_att[faultind+1])
+        else:
+            owner = resolve_owner(obj, split_att[:-1])
+            name = split_att[-1]
+            if isinstance(owner, dict):
+                logger = (att, 'item', owner, name)
+            elif owner is not None:
+                logger = (att, 'attr', owner, name)
+            else:
+                logger = False
+            # only use the direct accessor if it returns the same object as get_var
+            if logger and run_logger(logger) is get_var(obj, att):
+                return logger
+    except Exception:
+        pass
+    return (att, 'var', obj, att)
+
+
+def run_logger(logger, time=None):
+    """Get the value from a logger created with :func:`compile_logger`."""
+    att, logtype, owner, name = logger
+    if logtype == 'attr':
+        return getattr(owner, name)
+    elif logtype == 'fault':
+        return name in owner.faults
+    elif logtype == 'ind':
+        return owner()
+    elif logtype == 'ind_t':
+        return owner(time)
+    elif logtype == 'item':
+        return owner.get(name)
+    elif logtype == 'time' and time is not None:
+        return time
+    else:
+        return get_var(owner, name)
+
+
+def raise_log_error(obj, att, val, hist, t_ind, e):
+    """Raise an informative exception when a value cannot be logged in hist."""
+    obj_str = "Error logging obj "+obj.__class__.__name__+": "
+    if t_ind >= len(hist):
+        raise Exception(obj_str + "Time beyond range of model" +
+                        "history--check staged execution " +
+                        "and simulation time settings" +
+                        " (end condition, mdl.sp.end_time)") from e
+    elif not np.can_cast(type(val), type(hist[t_ind])):
+        raise Exception(obj_str + str(att)+" changed type: " +
+                        str(type(hist[t_ind])) + " to " +
+                        str(type(val)) + " at t_ind=" +
+                        str(t_ind)) from e
+    else:
+        raise Exception(obj_str + "Value too large to represent: "
+                        + att + "=" + str(val)) from e
+
+
 def prep_hists(simhists, plot_values, comp_groups, indiv_kwargs):
     """Prepare hists for plotting."""
     # Process data - clip and flatten
@@ -165,6 +339,203 @@ def prep_hists(simhists, plot_values, comp_groups, indiv_kwargs):
     return simhists, plot_values, grouphists, indiv_kwargs
 
 
+class SparseHist(NDArrayOperatorsMixin):
+    """
+    History of an array-valued attribute stored as keyframes and per-step changes.
+
+    Rather than allocating the full (time x array shape) array, only the indices and
+    values of the entries which change at each step are stored, along with a full
+    keyframe of the array every keyframe_interval steps. Indexing (e.g., hist[t])
+    reconstructs the array at a given time, and numpy functions/operators act on the
+    full (reconstructed) array, so it may be used in place of an np.ndarray in a
+    History. Steps which have not been logged take the value of the preceding step.
+
+    Attributes
+    ----------
+    shape : tuple
+        Shape of the full history (length, *array shape)
+    dtype : np.dtype
+        Data type of the array.
+    keyframe_interval : int
+        Number of steps between keyframes.
+    keyframes : dict
+        Full arrays at given steps {t_ind: array}
+    changes : dict
+        Changes from the previous step {t_ind: (flat_inds, values)}
+    last_ind : int
+        Index of the last step logged.
+
+    Examples
+    --------
+    >>> h = SparseHist(np.zeros((2, 2)), 4, keyframe_interval=2)
+    >>> h[1] = np.array([[0.0, 1.0], [0.0, 0.0]])
+    >>> h[2] = np.array([[0.0, 1.0], [0.0, 0.0]])
+    >>> h[3] = np.array([[0.0, 1.0], [2.0, 0.0]])
+    >>> h[3]
+    array([[0., 1.],
+           [2., 0.]])
+    >>> h.changes
+    {1: (array([1]), array([1.])), 3: (array([2]), array([2.]))}
+    >>> h[1:3]
+    SparseHist(shape=(2, 2, 2), keyframes=2, changes=0)
+    >>> np.max(h, axis=(1, 2))
+    array([0., 1., 1., 2.])
+    >>> (h == np.asarray(h)).all()
+    True
+
+    Multiple steps may also be set at once (e.g., from another history):
+
+    >>> h[[2, 3]] = np.ones((2, 2, 2))
+    >>> h[1:] = h[1:] * 2.0
+    >>> np.max(h, axis=(1, 2))
+    array([0., 2., 2., 2.])
+    """
+
+    def __init__(self, val, length, keyframe_interval=100):
+        val = np.array(val)
+        self.shape = (length, *val.shape)
+        self.dtype = val.dtype
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {0: val}
+        self.changes = {}
+        self.last_ind = 0
+        self._last = (0, val)
+
+    def __repr__(self):
+        return ("SparseHist(shape=" + str(self.shape) + ", keyframes="
+                + str(len(self.keyframes)) + ", changes=" + str(len(self.changes)) + ")")
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        """Memory used by the keyframes and changes (in bytes)."""
+        return (sum(k.nbytes for k in self.keyframes.values())
+                + sum(i.nbytes + v.nbytes for i, v in self.changes.values()))
+
+    def _to_ind(self, t_ind):
+        t_ind = int(t_ind)
+        if t_ind < 0:
+            t_ind += len(self)
+        if not 0 <= t_ind < len(self):
+            raise IndexError("index " + str(t_ind) + " out of range for SparseHist"
+                             + " of length " + str(len(self)))
+        return t_ind
+
+    def get(self, t_ind):
+        """Reconstruct the array at the time-index t_ind."""
+        t_ind = self._to_ind(t_ind)
+        if t_ind == self._last[0]:
+            return self._last[1].copy()
+        k_ind = max(k for k in self.keyframes if k <= t_ind)
+        val = self.keyframes[k_ind].copy()
+        for i in range(k_ind + 1, t_ind + 1):
+            if i in self.keyframes:
+                val = self.keyframes[i].copy()
+            elif i in self.changes:
+                inds, vals = self.changes[i]
+                val.flat[inds] = vals
+        return val
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self[key[0]][key[1:]] if len(key) > 1 else self[key[0]]
+        elif isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return self.get_range(start, stop)
+            return np.array([self.get(i) for i in range(start, stop, step)])
+        elif isinstance(key, (int, np.integer)):
+            return self.get(key)
+        else:
+            return np.asarray(self)[key]
+
+    def get_range(self, start, stop):
+        """Get a SparseHist of the steps from start to stop (used in cutting)."""
+        stop = max(start, stop)
+        cut = SparseHist(self.get(start) if start < len(self) else self.keyframes[0],
+                         stop - start, self.keyframe_interval)
+        for i in range(start + 1, stop):
+            if i in self.keyframes:
+                cut.keyframes[i - start] = self.keyframes[i]
+            elif i in self.changes:
+                cut.changes[i - start] = self.changes[i]
+        cut.last_ind = max(0, min(self.last_ind - start, len(cut) - 1))
+        return cut
+
+    def __setitem__(self, t_ind, val):
+        if not isinstance(t_ind, (int, np.integer)):
+            # slices/index arrays are logged one step at a time (in the given order)
+            t_inds = np.arange(len(self))[t_ind]
+            vals = np.broadcast_to(np.asarray(val, dtype=self.dtype),
+                                   (len(t_inds), *self.shape[1:]))
+            for i, v in zip(t_inds, vals):
+                self[i] = v
+            return
+        t_ind = self._to_ind(t_ind)
+        val = np.array(val, dtype=self.dtype)
+        if val.shape != self.shape[1:]:
+            raise ValueError("Cannot log value of shape " + str(val.shape)
+                             + " in SparseHist of shape " + str(self.shape))
+        if t_ind < self.last_ind:
+            # keep the values after t_ind by making the next step a keyframe
+            self.keyframes[t_ind + 1] = self.get(t_ind + 1)
+            self.changes.pop(t_ind + 1, None)
+        self.keyframes.pop(t_ind, None)
+        self.changes.pop(t_ind, None)
+        if t_ind == 0 or t_ind % self.keyframe_interval == 0:
+            self.keyframes[t_ind] = val
+        else:
+            if self._last[0] == t_ind - 1:
+                prev = self._last[1]
+            else:
+                prev = self.get(t_ind - 1)
+            changed = val != prev
+            if np.issubdtype(self.dtype, np.inexact):
+                changed &= ~(np.isnan(val) & np.isnan(prev))
+            inds = np.flatnonzero(changed)
+            if inds.size:
+                self.changes[t_ind] = (inds, val.flat[inds])
+        self.last_ind = max(self.last_ind, t_ind)
+        self._last = (t_ind, val)
+
+    def __array__(self, dtype=None, copy=None):
+        arr = np.empty(self.shape, dtype=self.dtype)
+        val = self.keyframes[0].copy()
+        for i in range(len(self)):
+            if i in self.keyframes:
+                val = self.keyframes[i].copy()
+            elif i in self.changes:
+                inds, vals = self.changes[i]
+                val.flat[inds] = vals
+            arr[i] = val
+        if dtype is not None:
+            arr = arr.astype(dtype)
+        return arr
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [np.asarray(i) if isinstance(i, SparseHist) else i for i in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def copy(self):
+        """Copy the SparseHist (the stored arrays are not modified, so are shared)."""
+        cop = SparseHist(self.keyframes[0], len(self), self.keyframe_interval)
+        cop.keyframes = {**self.keyframes}
+        cop.changes = {**self.changes}
+        cop.last_ind = self.last_ind
+        cop._last = self._last
+        return cop
+
+
 class History(Result):
     """
     Class for recording and analyzing simulation histories.
@@ -212,7 +583,8 @@ class History(Result):
             elif isinstance(val, str):
                 self[att] = np.empty([len(timerange)], dtype=str_size)
             elif isinstance(val, np.ndarray) or dtype == np.ndarray:
-                self[att] = np.array([val for i in timerange])
+                val = np.asarray(val)
+                self[att] = np.repeat(val[np.newaxis], len(timerange), axis=0)
             elif dtype:
                 self[att] = np.empty([len(timerange)], dtype=dtype)
             else:
@@ -224,19 +596,27 @@ class History(Result):
     def fromdict(inputdict):
         return fromdict(History, inputdict)
 
-    def load(filename, filetype="", renest_dict=False, indiv=False):
-        """Load file as History using :func:`load'."""
-        inputdict = load(filename, filetype=filetype,
-                         renest_dict=renest_dict, indiv=indiv, Rclass=History)
+    def load(filename, filetype="", renest_dict=False, indiv=False, lazy=False,
+             allow_pickle=False):
+        """
+        Load file as History using :func:`load'.
+
+        If lazy, arrays are memory-mapped from the (npz) file and are read-only, so
+        only the data which is accessed (e.g. by get_values, plot_line) is read.
+        Object values in cols folders are only loaded if allow_pickle=True.
+        """
+        inputdict = load(filename, filetype=filetype, renest_dict=renest_dict,
+                         indiv=indiv, Rclass=History, lazy=lazy,
+                         allow_pickle=allow_pickle)
         return fromdict(History, inputdict)
 
-    def load_folder(folder, filetype, renest_dict=False):
+    def load_folder(folder, filetype, renest_dict=False, lazy=False):
         """Load folder as History using :func:`load_folder'."""
         files_toread = load_folder(folder, filetype)
         hist = History()
         for filename in files_toread:
             hist.update(History.load(folder+'/'+filename, filetype,
-                                     renest_dict=renest_dict, indiv=True))
+                                     renest_dict=renest_dict, indiv=True, lazy=lazy))
         if renest_dict == False:
             hist = hist.flatten()
         return hist
@@ -267,10 +647,81 @@ class History(Result):
         for k, v in self.items():
             if isinstance(v, History):
                 newhist[k] = v.copy()
+            elif isinstance(v, SparseHist):
+                newhist[k] = v.copy()
             else:
                 newhist[k] = np.copy(v)
         return newhist
 
+    def share_nominal(self, nomhist):
+        """
+        Replace the values which are the same as in nomhist with views of nomhist.
+
+        Used to store fault scenario histories sparsely, since most tracked values
+        in a given fault scenario do not deviate from the nominal. Shared values are
+        read-only views of the nominal arrays, so the history otherwise behaves the
+        same (e.g., in get_degraded_hist, plot_line, get_values, and save).
+
+        Since the arrays are shared:
+
+        - writing to a shared value (e.g., hist.a[0] = 0.0) raises a ValueError.
+          Use History.copy() to get a history with independent, writeable arrays.
+        - nomhist must not be modified in place afterwards, since the changes would
+          show in every history sharing it (the views are read-only, but the nominal
+          arrays themselves are not).
+
+        Values are only shared as a whole: a value which deviates from the nominal
+        at any time (e.g., after the fault is injected) is stored in full.
+
+        Parameters
+        ----------
+        nomhist : History
+            Nominal history to share values with. Values are shared when they are
+            equal to the nominal over the length of the current history.
+
+        Returns
+        -------
+        mem : int
+            Memory (in bytes) of the values that are not shared with nomhist.
+
+        Examples
+        --------
+        >>> nomhist = History({'a': np.array([1.0, 2.0, 3.0]),
+        ...                    'b': np.array([1.0, 1.0, 1.0])})
+        >>> hist = History({'a': np.array([1.0, 2.0]), 'b': np.array([1.0, 0.0])})
+        >>> hist.share_nominal(nomhist)
+        16
+        >>> np.shares_memory(hist.a, nomhist.a)
+        True
+        >>> np.shares_memory(hist.b, nomhist.b)
+        False
+        >>> hist.a
+        array([1., 2.])
+        >>> hist.a[0] = 0.0
+        Traceback (most recent call last):
+          ...
+        ValueError: assignment destination is read-only
+        >>> hist_copy = hist.copy()
+        >>> hist_copy.a[0] = 0.0
+        >>> nomhist.a
+        array([1., 2., 3.])
+        """
+        mem = 0
+        for k, v in self.items():
+            nom_v = nomhist.data.get(k, None)
+            if isinstance(v, History):
+                if isinstance(nom_v, History):
+                    mem += v.share_nominal(nom_v)
+                else:
+                    mem += v.get_memory()[0]
+            elif is_same_as_nominal(v, nom_v):
+                shared_v = nom_v[:len(v)]
+                shared_v.flags.writeable = False
+                self[k] = shared_v
+            else:
+                mem += getattr(v, 'nbytes', 0)
+        return mem
+
     def log(self, obj, t_ind, time=None):
         """
         Update the history from obj at the time t_ind.
@@ -315,27 +766,87 @@ class History(Result):
                 hist.log(val, t_ind)
             else:
                 if is_known_mutable(val):
-                    val = copy.deepcopy(val)
+                    val = copy_logged(val)
                 if isinstance(hist, list):
                     hist.append(val)
-                elif isinstance(hist, np.ndarray):
+                elif isinstance(hist, (np.ndarray, SparseHist)):
                     try:
                         hist[t_ind] = val
                     except Exception as e:
-                        obj_str = "Error logging obj "+obj.__class__.__name__+": "
-                        if t_ind >= len(hist):
-                            raise Exception(obj_str + "Time beyond range of model" +
-                                            "history--check staged execution " +
-                                            "and simulation time settings" +
-                                            " (end condition, mdl.sp.end_time)") from e
-                        elif not np.can_cast(type(val), type(hist[t_ind])):
-                            raise Exception(obj_str + str(att)+" changed type: " +
-                                            str(type(hist[t_ind])) + " to " +
-                                            str(type(val)) + " at t_ind=" +
-                                            str(t_ind)) from e
-                        else:
-                            raise Exception(obj_str + "Value too large to represent: "
-                                            + att + "=" + str(val)) from e
+                        raise_log_error(obj, att, val, hist, t_ind, e)
+
+    def compile_log(self, obj):
+        """
+        Resolve each key of the history into a direct accessor on obj.
+
+        The returned loggers are used by :meth:`History.log_compiled` to log obj
+        without re-parsing each key at every time-step.
+
+        Parameters
+        ----------
+        obj : Model/Function/State...
+            Object to log
+
+        Returns
+        -------
+        loggers : tuple
+            Loggers (see :func:`compile_logger`) for each key in the history.
+
+        Examples
+        --------
+        >>> from fmdtools.define.container.state import ExampleState
+        >>> hist = ExampleState().create_hist([0.0, 1.0])
+        >>> loggers = hist.compile_log(ExampleState(x=2.0, y=3.0))
+        >>> [l[:2] for l in loggers]
+        [('x', 'attr'), ('y', 'attr')]
+        >>> hist.log_compiled(loggers, 0)
+        >>> hist.log_compiled(loggers, 1)
+        >>> hist.x
+        array([2., 2.])
+        """
+        return tuple([compile_logger(obj, att) for att in self.keys()])
+
+    def log_compiled(self, loggers, t_ind, time=None):
+        """
+        Update the history at the time t_ind using loggers from :meth:`compile_log`.
+
+        Equivalent to :meth:`History.log`, but without parsing the keys.
+
+        Parameters
+        ----------
+        loggers : tuple
+            Loggers created using :meth:`History.compile_log`.
+        t_ind : int
+            Time-index of the log.
+        time : float
+            Real time for the history (if initialized).
+        """
+        data = self.data
+        for logger in loggers:
+            att, logtype, owner, name = logger
+            try:
+                if logtype == 'attr':
+                    val = getattr(owner, name)
+                elif logtype == 'fault':
+                    val = name in owner.faults
+                else:
+                    val = run_logger(logger, time)
+            except Exception as e:
+                raise Exception("Unable to log att " + str(att) + " in " +
+                                str(owner.__class__.__name__)) from e
+            hist = data[att]
+            if isinstance(hist, History):
+                hist.log(val, t_ind)
+            else:
+                if type(val) in (dict, set):
+                    val = copy_logged(val)
+                if isinstance(hist, list):
+                    hist.append(val)
+                else:
+                    try:
+                        hist[t_ind] = val
+                    except Exception as e:
+                        raise_log_error(owner, att, val, hist, t_ind, e)
 
     def cut(self, end_ind=None, start_ind=None, newcopy=False):
         """
@@ -389,6 +900,84 @@ class History(Result):
                                     " in history "+str(hist.data)) from e
         return hist
 
+    def init_batch(self, num):
+        """
+        Create a copy of the history for simulating num scenarios as a batch.
+
+        Each array in the history is given a second dimension of size num, so that
+        array-valued states (one value per scenario) may be logged at each time.
+
+        Parameters
+        ----------
+        num : int
+            Number of scenarios in the batch.
+
+        Returns
+        -------
+        hist : History
+            History with arrays of shape (len(timerange), num).
+
+        Examples
+        --------
+        >>> hist = History({'a': np.array([1.0, 2.0]), 'b': np.array([True, False])})
+        >>> bhist = hist.init_batch(3)
+        >>> bhist.a.shape
+        (2, 3)
+        >>> bhist.a[1] = [4.0, 5.0, 6.0]
+        >>> bhist.split_batch(3)[2].a
+        array([1., 6.])
+        """
+        hist = History()
+        for k, v in self.items():
+            if isinstance(v, History):
+                hist[k] = v.init_batch(num)
+            elif isinstance(v, np.ndarray):
+                hist[k] = np.repeat(v[:, np.newaxis], num, axis=1)
+            else:
+                hist[k] = copy.deepcopy(v)
+        return hist
+
+    def split_batch(self, num):
+        """
+        Split a batched history (see History.init_batch) into a list of histories.
+
+        Parameters
+        ----------
+        num : int
+            Number of scenarios in the batch.
+
+        Returns
+        -------
+        hists : list
+            List of History for each scenario in the batch.
+
+        Examples
+        --------
+        Since every array in the batched history (other than the time, which is the
+        same for every scenario) has a batch axis, arrays without one are not copied
+        silently:
+
+        >>> History({'a': np.array([1.0, 2.0])}).split_batch(2)
+        Traceback (most recent call last):
+          ...
+        Exception: Value a does not have a batch axis of size 2
+        """
+        hists = [History() for i in range(num)]
+        for k, v in self.items():
+            if isinstance(v, History):
+                for i, subhist in enumerate(v.split_batch(num)):
+                    hists[i][k] = subhist
+            elif isinstance(v, np.ndarray) and k != 'time':
+                if v.ndim < 2 or v.shape[1] != num:
+                    raise Exception("Value " + k + " does not have a batch axis "
+                                    + "of size " + str(num))
+                for i, hist in enumerate(hists):
+                    hist[k] = v[:, i].copy()
+            else:
+                for hist in hists:
+                    hist[k] = copy.deepcopy(v)
+        return hists
+
     def get_slice(self, t_ind=0):
         """Return dict of values from (flattenned) version of the history at t_ind."""
         flathist = self.flatten()
@@ -9,6 +9,7 @@ Has classes:
 And functions:
 
 - :func:`from_hist`: Creates dict of PhaseMaps based on mode progression in history.
+- :func:`find_mode_runs`: Finds the phases (runs of the same mode) in a mode history.
 - :func:`phaseplot`: Plots the progression of phases over time.
 - :func:`samplemetric`: plots a metric for a single fault sampled by a SampleApproach
   over time with rates/
@@ -34,7 +35,6 @@ specific language governing permissions and limitations under the License.
 from fmdtools.analyze.common import setup_plot
 
 import numpy as np
-from ordered_set import OrderedSet
 import itertools
 
 from matplotlib.collections import PolyCollection
@@ -75,10 +75,47 @@ class PhaseMap(object):
         self.phases = phases
         self.modephases = modephases
         self.dt = dt
+        self._interval_index = {}
 
     def __repr__(self):
         return 'PhaseMap(' + str(self.phases) + ', ' + str(self.modephases) + ')'
 
+    def get_interval_index(self, dt=1.0):
+        """
+        Get the (sorted) phase intervals used to look up phases with np.searchsorted.
+
+        Parameters
+        ----------
+        dt : float, optional
+            Timestep added to the end of each phase. The default is 1.0.
+
+        Returns
+        -------
+        index : tuple/None
+            Tuple of (starts, ends, phase_inds, phasenames), with the start and end
+            (+dt) of each interval sorted by start time, the index of the phase in
+            phases of each interval, and the names of the phases. None if there are no
+            phases or the intervals overlap (and thus must be searched in order).
+
+        Examples
+        --------
+        >>> pm = PhaseMap({"off": [5, 10], "on": [0, 4]})
+        >>> pm.get_interval_index()
+        (array([0., 5.]), array([ 5., 11.]), array([1, 0]), ['off', 'on'])
+        >>> PhaseMap({"a": [0, 4], "b": [2, 5]}).get_interval_index() is None
+        True
+        """
+        if dt not in self._interval_index:
+            intervals = np.array([*self.phases.values()], dtype=float).reshape(-1, 2)
+            phase_inds = np.argsort(intervals[:, 0], kind='stable')
+            starts = intervals[phase_inds, 0]
+            ends = intervals[phase_inds, 1] + dt
+            if len(starts) and np.all(ends[:-1] <= starts[1:]):
+                self._interval_index[dt] = (starts, ends, phase_inds, [*self.phases])
+            else:
+                self._interval_index[dt] = None
+        return self._interval_index[dt]
+
     def find_phase(self, time, dt=1.0):
         """
         Find the phase that a time occurs in.
@@ -92,10 +129,23 @@ class PhaseMap(object):
         -------
         phase : str
             Name of the phase time occurs in.
+
+        Examples
+        --------
+        >>> pm = PhaseMap({"on": [0, 4], "off": [5, 10]})
+        >>> pm.find_phase(5.5)
+        'off'
         """
-        for phase, times in self.phases.items():
-            if times[0] <= time < times[1]+dt:
-                return phase
+        index = self.get_interval_index(dt)
+        if index:
+            starts, ends, phase_inds, phasenames = index
+            ind = np.searchsorted(starts, time, side='right') - 1
+            if ind >= 0 and time < ends[ind]:
+                return phasenames[phase_inds[ind]]
+        else:
+            for phase, times in self.phases.items():
+                if times[0] <= time < times[1]+dt:
+                    return phase
         raise Exception("time "+str(time)+" not in phases: "+str(self.phases))
 
     def find_modephase(self, phase):
@@ -142,6 +192,81 @@ class PhaseMap(object):
             phase = self.find_modephase(phase)
         return phase
 
+    def find_phase_inds(self, *times, dt=1.0):
+        """
+        Find the index of the phase (in phases) that each of the given times occurs in.
+
+        Vectorized version of find_phase, which compares all times to the phase
+        intervals at once.
+
+        Parameters
+        ----------
+        *times : float
+            Occurence times.
+
+        Returns
+        -------
+        phase_inds : np.array
+            Index of the phase in phases for each time.
+
+        Examples
+        --------
+        >>> pm = PhaseMap({'on': [0, 3], 'off': [4, 5]})
+        >>> pm.find_phase_inds(0, 3.5, 5)
+        array([0, 0, 1])
+        """
+        if not times:
+            return np.array([], dtype=int)
+        index = self.get_interval_index(dt)
+        if index:
+            starts, ends, phase_inds, _ = index
+            t = np.array(times, dtype=float)
+            inds = np.searchsorted(starts, t, side='right') - 1
+            found = (inds >= 0) & (t < ends[np.maximum(inds, 0)])
+        else:
+            intervals = np.array([*self.phases.values()], dtype=float).reshape(-1, 2)
+            t = np.array(times, dtype=float).reshape(-1, 1)
+            in_phase = (intervals[:, 0] <= t) & (t < intervals[:, 1] + dt)
+            found = in_phase.any(axis=1)
+        if not found.all():
+            time = times[np.argmin(found)]
+            raise Exception("time "+str(time)+" not in phases: "+str(self.phases))
+        if index:
+            return phase_inds[inds]
+        else:
+            return np.argmax(in_phase, axis=1)
+
+    def find_base_phases(self, *times):
+        """
+        Find the phase or modephase (if provided) that each of the given times occur in.
+
+        Parameters
+        ----------
+        *times : float
+            Times to check.
+
+        Returns
+        -------
+        phases : list
+            Phase or modephase for each time.
+
+        Examples
+        --------
+        >>> pm = PhaseMap({'on': [0, 3], 'off': [4, 5]},
+        ...               {'oper': {'on'}, 'rest': {'off'}})
+        >>> pm.find_base_phases(1, 2, 4.5)
+        ['oper', 'oper', 'rest']
+        """
+        inds = self.find_phase_inds(*times)
+        phasenames = [*self.phases]
+        base_phases = {}
+        for ind in np.unique(inds).tolist():
+            phase = phasenames[ind]
+            if self.modephases:
+                phase = self.find_modephase(phase)
+            base_phases[ind] = phase
+        return [base_phases[ind] for ind in inds.tolist()]
+
     def calc_samples_in_phases(self, *times):
         """
         Calculate the number of times the provided times show up in phases/modephases.
@@ -169,10 +294,7 @@ class PhaseMap(object):
             phase_times = {ph: 0 for ph in self.modephases}
         else:
             phase_times = {ph: 0 for ph in self.phases}
-        for time in times:
-            phase = self.find_phase(time)
-            if self.modephases:
-                phase = self.find_modephase(phase)
+        for phase in self.find_base_phases(*times):
             phase_times[phase] += 1
         return phase_times
 
@@ -250,6 +372,35 @@ class PhaseMap(object):
         else:
             return self.calc_phase_time(phase)
 
+    def calc_scen_exposure_times(self, *times):
+        """
+        Calculate the time for the phase/modephase at each of the given times.
+
+        Parameters
+        ----------
+        *times : float
+            Times within the phases.
+
+        Returns
+        -------
+        exposure_times : np.array
+            Exposure time at each of the given times.
+
+        Examples
+        --------
+        >>> pm = PhaseMap({"on": [0, 4], "off": [5, 10]})
+        >>> pm.calc_scen_exposure_times(1, 5, 7)
+        array([5., 6., 6.])
+        """
+        phases = self.find_base_phases(*times)
+        exposure_times = {}
+        for phase in set(phases):
+            if self.modephases:
+                exposure_times[phase] = self.calc_modephase_time(phase)
+            else:
+                exposure_times[phase] = self.calc_phase_time(phase)
+        return np.array([exposure_times[phase] for phase in phases], dtype=float)
+
     def get_phase_times(self, phase):
         """
         Get the set of discrete times in the interval for a phase.
@@ -394,25 +545,7 @@ def from_hist(hist, fxn_modephases = 'all'):
             k = k.split(".")
         fxn = k[k.index('m')-1]
         if len(modehist) != 0:
-            modes = OrderedSet(modehist)
-            modephases = dict.fromkeys(modes)
-            phases_unsorted = dict()
-            for mode in modes:
-                modeinds = [ind for ind, m in enumerate(modehist) if m == mode]
-                startind = modeinds[0]
-                phasenum = 0
-                phaseid = mode
-                modephases[mode] = set()
-                for i, ind in enumerate(modeinds):
-                    if ind+1 not in modeinds:
-                        phases_unsorted[phaseid] = [times[startind], times[ind]]
-                        modephases[mode].add(phaseid)
-                        if i != len(modeinds)-1:
-                            startind = modeinds[i+1]
-                            phasenum += 1
-                            phaseid = mode+str(phasenum)
-            phases = dict(sorted(phases_unsorted.items(),
-                                 key=lambda item: item[1][0]))
+            phases, modephases = find_mode_runs(modehist, times)
             if fxn_modephases == 'all' or fxn in fxn_modephases:
                 mph = modephases
             else:
@@ -421,6 +554,55 @@ def from_hist(hist, fxn_modephases = 'all'):
     return modephasemaps
 
 
+def find_mode_runs(modehist, times):
+    """
+    Find the phases (runs of the same mode) in a mode history.
+
+    Runs are found in one pass by detecting the indices where the mode changes.
+
+    Parameters
+    ----------
+    modehist : np.array
+        History of modes.
+    times : np.array
+        Times corresponding to the modes in modehist.
+
+    Returns
+    -------
+    phases : dict
+        Phases (in order of occurence) with structure {phase: [starttime, endtime]},
+        where the first run of a mode is named mode and subsequent runs are named
+        mode1, mode2, etc.
+    modephases : dict
+        Phases corresponding to each mode with structure {mode: {phase1, phase2...}}
+
+    Examples
+    --------
+    >>> modehist = np.array(['off', 'on', 'on', 'off', 'on'])
+    >>> phases, modephases = find_mode_runs(modehist, np.arange(5))
+    >>> {ph: [int(t) for t in times] for ph, times in phases.items()}
+    {'off': [0, 0], 'on': [1, 2], 'off1': [3, 3], 'on1': [4, 4]}
+    >>> {mode: sorted(phs) for mode, phs in modephases.items()}
+    {'off': ['off', 'off1'], 'on': ['on', 'on1']}
+    """
+    modehist = np.asarray(modehist)
+    changes = np.flatnonzero(modehist[1:] != modehist[:-1]) + 1
+    starts = [0, *changes.tolist()]
+    ends = [*(changes - 1).tolist(), len(modehist) - 1]
+    phases = dict()
+    modephases = dict()
+    for startind, endind in zip(starts, ends):
+        mode = modehist[startind]
+        if mode not in modephases:
+            modephases[mode] = set()
+            phaseid = mode
+        else:
+            phaseid = mode + str(len(modephases[mode]))
+        phases[phaseid] = [times[startind], times[endind]]
+        modephases[mode].add(phaseid)
+    return phases, modephases
+
+
 def phaseplot(phasemaps, modephases=[], mdl=[], dt=1.0, singleplot=True,
               phase_ticks='both', figsize="default", v_padding=0.5, title_padding=-0.05,
               title="Progression of model through operational phases"):
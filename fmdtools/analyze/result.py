@@ -6,11 +6,16 @@ Defines how simulation results (histories) structured and processed.
 Has classes:
 
 - :class:`Result`: Class for defining simulation results
+- :class:`KeyIndex`: Class for indexing the (dotted) keys of a Result
+- :class:`ResultStore`: Class for streaming per-scenario results to/from a folder
 
 And functions:
 
 - :func:`load`: Loads a given file to a Result/History
 - :func:`load_folder`: Loads a given folder to a Result/History
+- :func:`load_npz_mmap`: Memory-maps the arrays in a given npz file
+- :func:`save_cols`: Saves a Result/History to a columnar (cols) folder
+- :func:`load_cols`: Loads (selected columns of) a columnar (cols) folder
 
 Private Methods:
 
@@ -22,6 +27,9 @@ Private Methods:
 - :func:`clean_resultdict_keys`: Helper function for recreating results dictionary keys
   (tuples) from a dictionary loaded from a file (where keys are strings)
   (used in csv/json results)
+- :func:`get_col_paths`: Helper function that gets the nested paths of the values in a
+  Result for columnar saving
+- :func:`load_col`: Helper function that loads a single column of a cols folder
 - :func:`get_dict_attr`: Gets attributes *attr from a given nested dict dict_in of class
   des_class
 - :func:`fromdict`: Creates new history/result from given dictionary
@@ -55,7 +63,13 @@ from fmdtools.analyze.common import set_empty_multiplots
 
 import numpy as np
 import pandas as pd
+import zipfile
+import struct
+import shutil
+import zlib
+import json
 import sys
+import io
 import os
 from collections import UserDict
 
@@ -67,7 +81,10 @@ def file_check(filename, overwrite):
             raise Exception("File already exists: "+filename)
         else:
             print("File already exists: "+filename+", writing anyway...")
-            os.remove(filename)
+            if os.path.isdir(filename):
+                shutil.rmtree(filename)
+            else:
+                os.remove(filename)
     if "/" in filename:
         last_split_index = filename.rfind("/")
         foldername = filename[:last_split_index]
@@ -86,9 +103,11 @@ def auto_filetype(filename, filetype=""):
             filetype = "csv"
         elif filename[-5:] == '.json':
             filetype = "json"
+        elif filename[-5:] == '.cols':
+            filetype = "cols"
         else:
             raise Exception("Invalid File Type in: " + filename +
-                            ", ensure extension is npz, csv, or json ")
+                            ", ensure extension is npz, csv, json, or cols ")
     return filetype
 
 
@@ -168,6 +187,133 @@ def check_include_error(result, to_include):
                         " not in result keys: " + str(result.keys()))
 
 
+class KeyIndex(object):
+    """
+    Index of the (dotted) keys of a Result/History.
+
+    The keys are kept in a trie of their components (e.g., 'scen.fxns.f.s.x' ->
+    'scen' -> 'fxns' -> ...), with the nodes of the trie indexed by component name, so
+    that keys with a given prefix, suffix, or scenario may be found without scanning
+    every key, e.g.,:
+
+    >>> ki = KeyIndex({'a.s.x': 1, 'a.s.y': 2, 'b.s.x': 3, 'b.sx': 4})
+    >>> ki.with_prefix('a')
+    ['a.s.x', 'a.s.y']
+    >>> ki.with_component('s')
+    ['a.s.x', 'a.s.y', 'b.s.x']
+    >>> ki.with_suffix('x')
+    ['a.s.x', 'b.s.x', 'b.sx']
+
+    Attributes
+    ----------
+    data : dict
+        Dict (e.g., Result.data) whose keys are indexed.
+    trie : dict
+        Nested dict of key components, where the full key is at the entry None.
+    nodes : dict
+        Nodes of the trie for each component, with structure {comp: [nodes]}
+    ranks : dict
+        Insertion order of each key, with structure {key: rank}
+    nonstr : int
+        Number of keys which are not strings (and are thus not in the trie).
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.trie = {}
+        self.nodes = {}
+        self.ranks = {}
+        self.count = 0
+        self.nonstr = 0
+        for key in data:
+            self.add(key)
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def is_current(self, data):
+        """Check whether the index is (still) an index of the keys of data."""
+        return self.data is data and len(self) == len(data)
+
+    def add(self, key):
+        """Add a key to the index."""
+        if key in self.ranks:
+            return
+        self.ranks[key] = self.count
+        self.count += 1
+        if not isinstance(key, str):
+            self.nonstr += 1
+            return
+        node = self.trie
+        for comp in key.split("."):
+            if comp not in node:
+                node[comp] = {}
+                self.nodes.setdefault(comp, []).append(node[comp])
+            node = node[comp]
+        node[None] = key
+
+    def remove(self, key):
+        """Remove a key from the index."""
+        if key not in self.ranks:
+            return
+        self.ranks.pop(key)
+        if not isinstance(key, str):
+            self.nonstr -= 1
+            return
+        node = self.trie
+        for comp in key.split("."):
+            node = node[comp]
+        node.pop(None)
+
+    def sort(self, keys):
+        """Sort keys into the order they were added in."""
+        return sorted(keys, key=self.ranks.__getitem__)
+
+    def get_node(self, node, path):
+        """Get the node at the path (list of components) from the given node."""
+        for comp in path:
+            node = node.get(comp)
+            if node is None:
+                break
+        return node
+
+    def get_under(self, node, keys):
+        """Append the keys in the nodes below the given node to the list keys."""
+        to_visit = [v for k, v in node.items() if k is not None]
+        while to_visit:
+            node = to_visit.pop()
+            for comp, child in node.items():
+                if comp is None:
+                    keys.append(child)
+                else:
+                    to_visit.append(child)
+        return keys
+
+    def with_prefix(self, prefix):
+        """Get the keys that start with prefix+'.' (e.g., for all_with)."""
+        node = self.get_node(self.trie, prefix.split("."))
+        if node is None:
+            return []
+        return self.sort(self.get_under(node, []))
+
+    def with_component(self, comp):
+        """Get the keys which have comp as a non-final (sequence of) component(s)."""
+        comps = comp.split(".")
+        keys = []
+        for node in self.nodes.get(comps[0], []):
+            node = self.get_node(node, comps[1:])
+            if node is not None:
+                self.get_under(node, keys)
+        return self.sort(set(keys))
+
+    def with_suffix(self, suffix):
+        """Get the keys which end with suffix (as a string)."""
+        last = suffix.split(".")[-1]
+        keys = [node[None] for comp, nodes in self.nodes.items() if comp.endswith(last)
+                for node in nodes if None in node and node[None].endswith(suffix)]
+        return self.sort(keys)
+
+
 class Result(UserDict):
     """
     Result is a special type of dictionary for simulation results.
@@ -206,7 +352,8 @@ class Result(UserDict):
     def __repr__(self, ind=0):
         str_rep = ""
         for k, val in self.items():
-            if isinstance(val, np.ndarray) or isinstance(val, list):
+            if isinstance(val, (np.ndarray, list)) or (hasattr(val, '__array__')
+                                                      and hasattr(val, '__len__')):
                 if type(k) is tuple:
                     k = str(k)
                 val_rep = ind*"--"+k+": "
@@ -235,6 +382,90 @@ class Result(UserDict):
             str_rep = str_rep[:-1]
         return str_rep
 
+    def __setitem__(self, key, val):
+        if len(self.__dict__) > 1:
+            self.update_caches(key, val)
+        self.data[key] = val
+
+    def __delitem__(self, key):
+        if len(self.__dict__) > 1:
+            self.update_caches(key, delete=True)
+        del self.data[key]
+
+    def update_caches(self, key, val=None, delete=False):
+        """
+        Update the cached key index/children/version for a change to the given key.
+
+        Called prior to item assignment/deletion if the Result has any caches.
+        """
+        index = self.__dict__.get('_keyindex')
+        if index is not None and index.is_current(self.data):
+            if delete and key in self.data:
+                index.remove(key)
+            elif not delete and key not in self.data:
+                index.add(key)
+        children = self.__dict__.get('_children')
+        if children is not None and children[0] is self.data:
+            if not delete and isinstance(val, Result):
+                children[1][key] = val
+            else:
+                children[1].pop(key, None)
+        self.__dict__['_version'] = self.__dict__.get('_version', 0) + 1
+
+    def get_index(self):
+        """
+        Get the KeyIndex of the keys of the Result.
+
+        The index is built when first used and then kept up-to-date as keys are added
+        or removed.
+
+        Returns
+        -------
+        index : KeyIndex/None
+            Index of the keys. None if the Result has non-str keys (which cannot be
+            indexed).
+        """
+        index = self.__dict__.get('_keyindex')
+        if index is None or not index.is_current(self.data):
+            index = KeyIndex(self.data)
+            self.__dict__['_keyindex'] = index
+        if index.nonstr:
+            return None
+        return index
+
+    def get_children(self):
+        """Get the nested Results in the Result as a dict {key: Result}."""
+        children = self.__dict__.get('_children')
+        if children is None or children[0] is not self.data:
+            children = (self.data, {k: v for k, v in self.data.items()
+                                    if isinstance(v, Result)})
+            self.__dict__['_children'] = children
+        return children[1]
+
+    def get_signature(self):
+        """Get a signature which changes when the Result or its children are changed."""
+        return (id(self.data), self.__dict__.get('_version', 0), len(self.data),
+                tuple([child.get_signature() for child in self.get_children().values()]))
+
+    def get_flat(self):
+        """
+        Get the flattened Result (see :meth:`Result.flatten`).
+
+        The flattened Result is cached until the Result (or a nested Result) is changed
+        by item assignment/deletion, so it should not be modified. Use flatten() to
+        get a flattened Result which can be modified.
+        """
+        signature = self.get_signature()
+        cached = self.__dict__.get('_flat')
+        if cached is None or cached[0] != signature:
+            if self.get_children() or self.get_index() is None:
+                flat = self.flatten(self.__class__())
+            else:
+                flat = self
+            cached = (signature, flat)
+            self.__dict__['_flat'] = cached
+        return cached[1]
+
     def all(self):
         return tuple(self.data.values())
 
@@ -338,7 +569,7 @@ class Result(UserDict):
         if key == "data":
             UserDict.__setattr__(self, key, val)
         else:
-            self.data[key] = val
+            self[key] = val
 
     def get(self, *argstr,  **to_include):
         """
@@ -370,9 +601,14 @@ class Result(UserDict):
         if attr in self:
             return self[attr]
         new = self.__class__()
-        for k, v in self.items():
-            if k.startswith(attr+'.'):
-                new[k[len(attr)+1:]] = v
+        index = self.get_index()
+        if index is not None:
+            for k in index.with_prefix(attr):
+                new[k[len(attr)+1:]] = self.data[k]
+        else:
+            for k, v in self.items():
+                if k.startswith(attr+'.'):
+                    new[k[len(attr)+1:]] = v
         if len(new) > 1:
             return new
         elif len(new) > 0:
@@ -387,19 +623,21 @@ class Result(UserDict):
     def fromdict(inputdict):
         return fromdict(Result, inputdict)
 
-    def load(filename, filetype="", renest_dict=False, indiv=False):
+    def load(filename, filetype="", renest_dict=False, indiv=False, lazy=False,
+             allow_pickle=False):
         """Load as Result using :func:`load'."""
         inputdict = load(filename, filetype="", renest_dict=renest_dict,
-                         indiv=indiv, Rclass=Result)
+                         indiv=indiv, Rclass=Result, lazy=lazy,
+                         allow_pickle=allow_pickle)
         return fromdict(Result, inputdict)
 
-    def load_folder(folder, filetype, renest_dict=False):
+    def load_folder(folder, filetype, renest_dict=False, lazy=False):
         """Load as History using :func:`load_folder'."""
         files_toread = load_folder(folder, filetype)
         result = Result()
         for filename in files_toread:
             result.update(Result.load(folder+'/'+filename, filetype,
-                          renest_dict=renest_dict, indiv=True))
+                          renest_dict=renest_dict, indiv=True, lazy=lazy))
         if renest_dict == False:
             result = result.flatten()
         return result
@@ -407,10 +645,14 @@ class Result(UserDict):
     def get_values(self, *values):
         """Get a dict with all values corresponding to the strings in *values."""
         h = self.__class__()
-        flatself = self.flatten()
+        flatself = self.get_flat()
+        index = flatself.get_index()
         k_vs = []
         for v in values:
-            ks = [k for k in flatself.keys() if k.endswith(v)]
+            if index is not None:
+                ks = index.with_suffix(v)
+            else:
+                ks = [k for k in flatself.keys() if k.endswith(v)]
             if not ks:
                 raise Exception("Value "+v+" not in Result keys.")
             k_vs.extend(ks)
@@ -422,8 +664,12 @@ class Result(UserDict):
     def get_scens(self, *scens):
         """Get a dictlike with all scenarios corresponding to the strings in *scens."""
         h = self.__class__()
-        k_s = [k for k in self.keys()
-               for s in scens if k.startswith(s+".") or '.'+s+'.' in k]
+        index = self.get_index()
+        if index is not None:
+            k_s = index.sort({k for s in scens for k in index.with_component(s)})
+        else:
+            k_s = [k for k in self.keys()
+                   for s in scens if k.startswith(s+".") or '.'+s+'.' in k]
         for k in k_s:
             h[k] = self[k]
         return h
@@ -511,7 +757,11 @@ class Result(UserDict):
         newhist : dict
             Flattened model history of form: {(fxnflow, ..., attname):array(att)}
         """
-        if newhist is False:
+        if newhist is False and not prevname and to_include == 'all':
+            newhist = self.__class__()
+            newhist.data = self.get_flat().data.copy()
+            return newhist
+        elif newhist is False:
             newhist = self.__class__()
 
         check_include_errors(self, to_include)
@@ -574,11 +824,13 @@ class Result(UserDict):
             mem_profile[k] = mem
         return mem_total, mem_profile
 
-    def save(self, filename, filetype="", overwrite=False, result_id=''):
+    def save(self, filename, filetype="", overwrite=False, result_id='', append=False,
+             compress=False):
         """
         Save a given result variable (endclasses or mdlhists) to a file filename.
 
-        Files can be saved as npz, csv, or json.
+        Files can be saved as npz, csv, json, or cols (a folder with a file per value,
+        see :func:`save_cols`).
 
         Parameters
         ----------
@@ -593,13 +845,21 @@ class Result(UserDict):
         result_id : str, optional
             For individual results saving. Places an identifier for the result in the
             file. The default is ''.
+        append : bool, optional
+            Whether to add the values to an existing file (cols only).
+            The default is False.
+        compress : bool, optional
+            Whether to compress the values (cols only). The default is False.
         """
-        import json
         import csv
+        filetype = auto_filetype(filename, filetype)
+        if filetype == 'cols':
+            save_cols(self, filename, overwrite=overwrite, result_id=result_id,
+                      append=append, compress=compress)
+            return
         file_check(filename, overwrite)
 
         variable = self
-        filetype = auto_filetype(filename, filetype)
         if filetype == 'npz':
             with open(filename, 'wb') as file_handle:
                 if result_id:
@@ -1024,7 +1284,250 @@ class Result(UserDict):
         return fig, axs
 
 
-def load(filename, filetype="", renest_dict=True, indiv=False, Rclass=Result):
+class ResultStore(object):
+    """
+    Store of per-scenario Results/Histories written incrementally to a folder.
+
+    Each scenario is saved as a separate (uncompressed) npz shard, with the scenario
+    names listed (in order) in an index file. The store is a lazy handle on these
+    shards, so only the scenarios/values that are used are loaded, e.g.,:
+
+    >>> import tempfile
+    >>> folder = tempfile.mkdtemp() + "/res"
+    >>> rs = ResultStore(folder, new=True)
+    >>> rs.write('scen_1', Result(endclass=Result(rate=1.0, cost=10.0)))
+    >>> rs.write('scen_2', Result(endclass=Result(rate=2.0, cost=20.0)))
+    >>> rs
+    ResultStore of Result with 2 scenarios
+    >>> rs.get_values('cost')
+    scen_1.endclass.cost:               10.0
+    scen_2.endclass.cost:               20.0
+    >>> rs.get_metric('cost', metric=np.sum)
+    30.0
+    >>> rs.get_metric('cost', metric='expected')
+    50.0
+    >>> rs.get('scen_2')
+    endclass.rate:                       2.0
+    endclass.cost:                      20.0
+
+    Stores may be re-opened from the folder:
+
+    >>> ResultStore(folder).keys()
+    ['scen_1', 'scen_2']
+
+    Nested results (e.g., from nested_sample) may be written using a prefixed view:
+
+    >>> rs_nom = rs.with_prefix('nom_1.')
+    >>> rs_nom['scen_1'] = Result(endclass=Result(cost=5.0))
+    >>> rs.keys()
+    ['scen_1', 'scen_2', 'nom_1.scen_1']
+    >>> rs_nom['scen_1']
+    endclass.cost:                       5.0
+
+    Attributes
+    ----------
+    folder : str
+        Folder the shards are saved in.
+    Rclass : class
+        Class of the stored results (Result or History).
+    scens : list
+        Names of the scenarios in the store (in order of shards).
+    prefix : str
+        Prefix added to the names of scenarios written to the store. Default is ''.
+    allow_pickle : bool
+        Whether to load object (pickled) values from the shards.
+    """
+
+    prefix = ''
+
+    def __init__(self, folder, Rclass=Result, new=False, overwrite=False,
+                 allow_pickle=False):
+        """
+        Open (or create) the store in the given folder.
+
+        Parameters
+        ----------
+        folder : str
+            Folder to save shards in.
+        Rclass : class, optional
+            Class of the stored results. The default is Result.
+        new : bool, optional
+            Whether to create a new store. The default is False.
+        overwrite : bool, optional
+            Whether to overwrite an existing store in the folder if new=True.
+            The default is False.
+        allow_pickle : bool, optional
+            Whether to load object (pickled) values from the shards (e.g., written
+            from models with object-valued states). Since loading pickled data can
+            execute arbitrary code, only use with trusted stores. The default is False.
+        """
+        self.folder = folder
+        self.Rclass = Rclass
+        self.allow_pickle = allow_pickle
+        self.index_file = folder + "/index.txt"
+        if new:
+            if os.path.exists(self.index_file):
+                if not overwrite:
+                    raise Exception("ResultStore already exists: " + folder)
+                for file in os.listdir(folder):
+                    if file == "index.txt" or file.endswith(".npz"):
+                        os.remove(folder + "/" + file)
+            elif not os.path.exists(folder):
+                os.makedirs(folder)
+            self.scens = []
+            open(self.index_file, 'w').close()
+        elif os.path.exists(self.index_file):
+            with open(self.index_file, 'r', encoding='utf8') as file_handle:
+                self.scens = file_handle.read().splitlines()
+        else:
+            raise Exception("No ResultStore in folder: " + folder)
+        self.inds = {scen: i for i, scen in enumerate(self.scens)}
+
+    def __repr__(self):
+        return ("ResultStore of " + self.Rclass.__name__ + " with "
+                + str(len(self.scens)) + " scenarios")
+
+    def __len__(self):
+        return len(self.scens)
+
+    def __contains__(self, scen):
+        return self.prefix + scen in self.inds
+
+    def __getitem__(self, scen):
+        return self.get(scen)
+
+    def __setitem__(self, scen, result):
+        self.write(scen, result)
+
+    def keys(self):
+        """Get the names of the scenarios in the store."""
+        return [*self.scens]
+
+    def with_prefix(self, prefix):
+        """
+        Get a view of the store which writes/gets scenarios with prefixed names.
+
+        The view shares the index (and shards) of the store, so the scenarios written
+        to it are in the store (with the full names).
+        """
+        view = object.__new__(self.__class__)
+        view.__dict__.update(self.__dict__)
+        view.prefix = self.prefix + prefix
+        return view
+
+    def get_shardname(self, scen):
+        """Get the filename of the shard for the given scenario."""
+        return self.folder + "/" + str(self.inds[scen]) + ".npz"
+
+    def get_shard_keys(self, scen):
+        """Get the keys saved in the shard for the given scenario (without loading)."""
+        with np.load(self.get_shardname(scen)) as loaded:
+            return loaded.files
+
+    def write(self, scen, result):
+        """
+        Write the result of the given scenario to the store.
+
+        Parameters
+        ----------
+        scen : str
+            Name of the scenario.
+        result : Result/History
+            Result of the scenario.
+        """
+        scen = self.prefix + scen
+        if scen in self.inds:
+            raise Exception("Scenario already in ResultStore: " + scen)
+        self.inds[scen] = len(self.scens)
+        self.scens.append(scen)
+        np.savez(self.get_shardname(scen), **Result({scen: result}).flatten())
+        with open(self.index_file, 'a', encoding='utf8') as file_handle:
+            file_handle.write(scen + "\n")
+
+    def update(self, other):
+        """Write the scenarios in the Result other (e.g., extra classes) to the store."""
+        for scen, result in Result(other).nest(levels=1).items():
+            self.write(scen, result)
+
+    def load_values(self, scen, *values):
+        """
+        Load the values ending with the strings *values from the given scenario.
+
+        If no values are given, loads all values.
+        """
+        res = self.Rclass()
+        shardname = self.get_shardname(scen)
+        with np.load(shardname, allow_pickle=self.allow_pickle) as loaded:
+            for k in loaded.files:
+                if not values or any([k.endswith(v) for v in values]):
+                    try:
+                        res[k] = loaded[k][()]
+                    except ValueError as e:
+                        if self.allow_pickle:
+                            raise e
+                        raise Exception("Value " + k + " has object values: open "
+                                        "with allow_pickle=True if trusted") from e
+        return res
+
+    def load(self, *scens, lazy=False):
+        """
+        Load the given scenarios (or all, if none given) as a flat Result/History.
+
+        If lazy, the shards are memory-mapped (see :func:`load_npz_mmap`).
+        """
+        res = self.Rclass()
+        for scen in scens or self.scens:
+            if lazy:
+                res.update(load_npz_mmap(self.get_shardname(scen),
+                                         allow_pickle=self.allow_pickle))
+            else:
+                res.update(self.load_values(scen))
+        return res
+
+    def get(self, *scens):
+        """Get the given scenarios, with the same structure as Result.get."""
+        res = self.Rclass()
+        for scen in scens:
+            res[scen] = self.load(self.prefix + scen).all_with(self.prefix + scen)
+        if len(scens) == 1:
+            return res[scens[0]]
+        else:
+            return res
+
+    def get_values(self, *values):
+        """Get a flat Result/History of the given values over all scenarios."""
+        res = self.Rclass()
+        for scen in self.scens:
+            res.update(self.load_values(scen, *values))
+        for v in values:
+            if not any([k.endswith(v) for k in res]):
+                raise Exception("Value " + v + " not in ResultStore keys.")
+        return res
+
+    def get_metric(self, value, metric=np.mean, args=(), axis=None, prob_key='rate'):
+        """
+        Calculate a statistic of the value (see Result.get_metric).
+
+        Only the value (and the prob_key, when a Result method such as 'expected' is
+        given as the metric) is loaded from the shards.
+        """
+        values = (value,)
+        if isinstance(metric, str) and any([k.endswith(prob_key)
+                                            for k in self.get_shard_keys(self.scens[0])]):
+            values = values + (prob_key,)
+        res = self.get_values(*values)
+        return res.get_metric(value, metric=metric, args=args, axis=axis)
+
+    def get_metrics(self, *values, metric=np.mean, args=(), axis=None):
+        """Calculate a statistic of the values (see Result.get_metrics)."""
+        metrics = Result()
+        for value in values:
+            metrics[value] = self.get_metric(value, metric=metric, args=args, axis=axis)
+        return metrics
+
+
+def load(filename, filetype="", renest_dict=True, indiv=False, Rclass=Result,
+         lazy=False, allow_pickle=False):
     """
     Load a given (endclasses or mdlhists) results dictionary from a (npz/csv/json) file.
 
@@ -1045,6 +1548,14 @@ def load(filename, filetype="", renest_dict=True, indiv=False, Rclass=Result):
         The default is False.
     Rclass : class
         Class to return (Result, History, or Dict)
+    lazy : bool
+        Whether to memory-map the arrays in the file (npz only), so that only the data
+        which is accessed is read from disk (see :func:`load_npz_mmap`).
+        The default is False.
+    allow_pickle : bool
+        Whether to load object (pickled) values in cols folders (see :func:`load_cols`).
+        Since loading pickled data can execute arbitrary code, only use with trusted
+        files. The default is False.
 
     Returns
     -------
@@ -1054,13 +1565,18 @@ def load(filename, filetype="", renest_dict=True, indiv=False, Rclass=Result):
     if not os.path.exists(filename):
         raise Exception("File does not exist: "+filename)
     filetype = auto_filetype(filename, filetype)
-    if filetype == 'npz':
-        loaded = np.load(filename)
-        resultdict = {k: v[()] for k, v in loaded.items()}
+    if filetype == 'npz' and lazy:
+        resultdict = load_npz_mmap(filename)
+    elif filetype == 'npz':
+        with np.load(filename) as loaded:
+            resultdict = {k: v[()] for k, v in loaded.items()}
     elif filetype == 'csv':  # add support for nested dict mdlhist using flatten_hist?
         resultdict = load_csv(filename, indiv=indiv)
     elif filetype == 'json':
         resultdict = load_json(filename, indiv=indiv)
+    elif filetype == 'cols':
+        resultdict = load_cols(filename, renest_dict=renest_dict, lazy=lazy,
+                               allow_pickle=allow_pickle)
     else:
         raise Exception("Invalid File Type")
     if Rclass not in [dict, 'dict']:
@@ -1073,6 +1589,243 @@ def load(filename, filetype="", renest_dict=True, indiv=False, Rclass=Result):
     return result
 
 
+def load_npz_mmap(filename, allow_pickle=False):
+    """
+    Memory-map the arrays in an npz file.
+
+    Arrays stored uncompressed (as saved by np.savez/Result.save) are returned as
+    read-only views into a single memory-map of the file, so their data is only read
+    from disk when it is accessed. Compressed or object arrays are read directly.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the npz file.
+    allow_pickle : bool, optional
+        Whether to load object (pickled) arrays. The default is False.
+
+    Returns
+    -------
+    resultdict : dict
+        Dict of arrays in the file with structure {key: array}
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> filename = tempfile.mkdtemp() + "/hist.npz"
+    >>> np.savez(filename, **{'a.x': np.array([1.0, 2.0]), 'a.y': np.array(3)})
+    >>> loaded = load_npz_mmap(filename)
+    >>> loaded
+    {'a.x': array([1., 2.]), 'a.y': 3}
+    >>> loaded['a.x'].flags.writeable
+    False
+    """
+    mmap = np.memmap(filename, dtype=np.uint8, mode='r')
+    resultdict = {}
+    with zipfile.ZipFile(filename) as zip_file, open(filename, 'rb') as file_handle:
+        for info in zip_file.infolist():
+            k = info.filename[:-4]
+            arr = None
+            if info.compress_type == zipfile.ZIP_STORED:
+                # skip the zip local file header to get to the npy header
+                file_handle.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack('<HH', file_handle.read(4))
+                file_handle.seek(name_len + extra_len, 1)
+                version = np.lib.format.read_magic(file_handle)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(file_handle)
+                else:
+                    header = np.lib.format.read_array_header_2_0(file_handle)
+                shape, fortran_order, dtype = header
+                if not dtype.hasobject:
+                    arr = np.ndarray(shape, dtype=dtype, buffer=mmap,
+                                     offset=file_handle.tell(),
+                                     order='F' if fortran_order else 'C')
+            if arr is None:
+                with np.load(filename, allow_pickle=allow_pickle) as loaded:
+                    arr = loaded[k]
+            resultdict[k] = arr[()]
+    return resultdict
+
+
+def get_col_paths(result, path=()):
+    """
+    Get the nested paths of the (non-Result) values in the Result.
+
+    Examples
+    --------
+    >>> [*get_col_paths(Result(a=Result(b=1.0), c=[2.0]))]
+    [(('a', 'b'), 1.0), (('c',), [2.0])]
+    """
+    for k, val in result.items():
+        if is_numeric(k):
+            k = t_key(k)
+        if isinstance(val, Result):
+            yield from get_col_paths(val, path + (k,))
+        else:
+            yield path + (k,), val
+
+
+def save_cols(result, foldername, overwrite=False, result_id='', append=False,
+              compress=False):
+    """
+    Save a Result/History in a columnar format.
+
+    Each value is saved as a separate .npy file in the folder, and a schema.json file
+    records the nested path, dtype, shape, and type of each value, so that
+    individual values can be read (see :func:`load_cols`) and the nesting of the
+    Result/History can be restored on loading.
+
+    Parameters
+    ----------
+    result : Result/History
+        Result/History to save.
+    foldername : str
+        Name of the folder (e.g. 'hist.cols').
+    overwrite : bool, optional
+        Whether to overwrite an existing folder. The default is False.
+    result_id : str, optional
+        Identifier to nest the result under (for individual results saving).
+        The default is ''.
+    append : bool, optional
+        Whether to add the values to an existing folder (e.g., to save the results of
+        scenarios as they are simulated). The default is False.
+    compress : bool, optional
+        Whether to (zlib) compress each value. Values are compressed separately, so
+        only the values which are loaded are decompressed. The default is False.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> foldername = tempfile.mkdtemp() + "/hist.cols"
+    >>> hist = Result(nominal=Result({'a.x': np.array([1.0, 2.0]), 'b': True}))
+    >>> save_cols(hist, foldername)
+    >>> save_cols(Result(y=[3, 4]), foldername, result_id='faulty', append=True,
+    ...           compress=True)
+    >>> load(foldername, renest_dict=True)
+    nominal: 
+    --a.x:                          array(2)
+    --b:                                True
+    faulty: 
+    --y:                            array(2)
+    >>> load_cols(foldername, 'y')
+    {'faulty.y': [3, 4]}
+    """
+    schemafile = foldername + "/schema.json"
+    if append and os.path.exists(schemafile):
+        with open(schemafile, 'r', encoding='utf8') as file_handle:
+            schema = json.load(file_handle)
+    else:
+        file_check(foldername, overwrite)
+        os.makedirs(foldername)
+        schema = {'class': result.__class__.__name__, 'columns': {}}
+    if result_id:
+        result = result.__class__({result_id: result})
+    cols = schema['columns']
+    for path, val in get_col_paths(result):
+        key = ".".join(path)
+        if key in cols:
+            raise Exception("Value already in file: " + key)
+        arr = np.asarray(val)
+        colfile = str(len(cols)) + ".npy"
+        if compress:
+            colfile = colfile + ".z"
+            buffer = io.BytesIO()
+            np.save(buffer, arr)
+            with open(foldername + "/" + colfile, 'wb') as file_handle:
+                file_handle.write(zlib.compress(buffer.getvalue()))
+        else:
+            np.save(foldername + "/" + colfile, arr)
+        if type(val) in (bool, int, float, str, list):
+            valtype = type(val).__name__
+        else:
+            valtype = 'array'
+        cols[key] = {'path': [*path], 'file': colfile, 'dtype': arr.dtype.str,
+                     'shape': [*arr.shape], 'type': valtype}
+    with open(schemafile, 'w', encoding='utf8') as file_handle:
+        json.dump(schema, file_handle, indent=1)
+
+
+def load_col(foldername, col, lazy=False, allow_pickle=False):
+    """
+    Load a column with schema entry col from the given cols folder.
+
+    Object columns are stored as pickles, so they are only loaded if allow_pickle=True.
+    """
+    colfile = foldername + "/" + col['file']
+    if col['dtype'] == '|O' and not allow_pickle:
+        raise Exception("Column " + colfile + " has object values: load with "
+                        + "allow_pickle=True if trusted")
+    if col['file'].endswith(".z"):
+        with open(colfile, 'rb') as file_handle:
+            buffer = io.BytesIO(zlib.decompress(file_handle.read()))
+        arr = np.load(buffer, allow_pickle=allow_pickle)
+    elif lazy and col['dtype'] != '|O':
+        arr = np.load(colfile, mmap_mode='r')
+    else:
+        arr = np.load(colfile, allow_pickle=allow_pickle)
+    if col['type'] == 'array':
+        return arr[()]
+    else:
+        return arr.tolist()
+
+
+def load_cols(foldername, *values, renest_dict=False, lazy=False, allow_pickle=False):
+    """
+    Load the values (columns) ending with the strings *values from a cols folder.
+
+    Parameters
+    ----------
+    foldername : str
+        Name of the folder.
+    *values : str
+        Values to load. If none are given, all values are loaded.
+    renest_dict : bool, optional
+        Whether to return a dict with the same nesting as the saved Result/History
+        (or flat dict with keys of the form 'a.b.c'). The default is False.
+    lazy : bool, optional
+        Whether to memory-map the (uncompressed) arrays. The default is False.
+    allow_pickle : bool, optional
+        Whether to load object values, which are stored as pickles. Since loading
+        pickled data can execute arbitrary code, only use with trusted files.
+        The default is False, which raises an exception for object values.
+
+    Returns
+    -------
+    resultdict : dict
+        Dict of the loaded values.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> foldername = tempfile.mkdtemp() + "/res.cols"
+    >>> save_cols(Result(a=1.0, b={'x': 1}), foldername)
+    >>> load_cols(foldername, 'a')
+    {'a': 1.0}
+    >>> load_cols(foldername, 'b')
+    Traceback (most recent call last):
+      ...
+    Exception: Column ... has object values: load with allow_pickle=True if trusted
+    >>> load_cols(foldername, 'b', allow_pickle=True)
+    {'b': {'x': 1}}
+    """
+    with open(foldername + "/schema.json", 'r', encoding='utf8') as file_handle:
+        schema = json.load(file_handle)
+    resultdict = {}
+    for key, col in schema['columns'].items():
+        if values and not any([key.endswith(v) for v in values]):
+            continue
+        val = load_col(foldername, col, lazy=lazy, allow_pickle=allow_pickle)
+        if renest_dict:
+            subdict = resultdict
+            for k in col['path'][:-1]:
+                subdict = subdict.setdefault(k, {})
+            subdict[col['path'][-1]] = val
+        else:
+            resultdict[key] = val
+    return resultdict
+
+
 def load_csv(filename, indiv=False):
     """Load csv files."""
     import pandas
@@ -245,6 +245,10 @@ class ActionArchitecture(Architecture):
         cop.active_actions = {*self.active_actions}
         return cop
 
+    def get_snapshot_roles(self):
+        """Extend Architecture to include active actions in snapshots."""
+        return {**super().get_snapshot_roles(), 'active_actions': self.active_actions}
+
     def reset(self):
         super().reset()
         self.set_initial_active_action()
@@ -308,6 +308,11 @@ class Architecture(Simulable):
                     rand_states[objname] = rand_state
         return rand_states
 
+    def is_batch_safe(self):
+        """Check whether all contained simulables can be simulated as a batch."""
+        return all([obj.is_batch_safe() for obj in self.get_flex_role_objs().values()
+                    if hasattr(obj, 'is_batch_safe')])
+
     def get_faults(self):
         """Get faults from contained roles."""
         return {obj.name+"_"+f for obj in self.get_flex_role_objs().values()
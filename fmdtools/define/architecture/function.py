@@ -432,6 +432,10 @@ class FunctionArchitecture(Architecture):
         Keeps track of which functions run in dynamic execution step
     staticflows : list
         Flows to keep track of in static execution step
+    _static_flow_fxns : dict
+        Static functions connected to each static flow, as {flowname: (fxnnames)}
+    _fxn_static_flows : dict
+        Static flows connected to each static function, as {fxnname: (flownames)}
     graph : networkx graph
         multigraph view of functions and flows
 
@@ -496,7 +500,8 @@ class FunctionArchitecture(Architecture):
     """
 
     __slots__ = ['fxns', 'functionorder', '_fxnflows', '_flowstates',
-                 'graph', 'staticfxns', 'dynamicfxns', 'staticflows']
+                 'graph', 'staticfxns', 'dynamicfxns', 'staticflows',
+                 '_static_flow_fxns', '_fxn_static_flows']
     default_track = ('fxns', 'flows', 'i')
     default_name = 'model'
     flexible_roles = ['flows', 'fxns']
@@ -593,9 +598,6 @@ class FunctionArchitecture(Architecture):
         self.dynamicfxns = OrderedSet([fxnname for fxnname, fxn in self.fxns.items()
                                        if fxn.is_dynamic()])
         self.construct_graph(require_connections=require_connections)
-        self.staticflows = [flow for flow in self.flows
-                            if any([n in self.staticfxns
-                                    for n in self.graph.neighbors(flow)])]
 
     def construct_graph(self, require_connections=True):
         """Create .graph nx.graph representation of the model."""
@@ -608,6 +610,52 @@ class FunctionArchitecture(Architecture):
         dangling_nodes = [e for e in nx.isolates(self.graph)]
         if dangling_nodes and require_connections:
             raise Exception("Fxns/flows disconnected from model: "+str(dangling_nodes))
+        self.construct_static_index()
+
+    def construct_static_index(self):
+        """
+        Index the connections between static functions and flows.
+
+        Used in prop_static so that the graph does not need to be traversed at each
+        propagation step.
+
+        Examples
+        --------
+        >>> class ExStaticFxn(ExampleFunction):
+        ...     __slots__ = ('exf2',)
+        ...     flow_exf2 = ExampleFlow
+        ...     def static_behavior(self, time):
+        ...         self.exf2.s.put(x=self.exf.s.x)
+        >>> class ExStaticArch(FunctionArchitecture):
+        ...     def init_architecture(self, **kwargs):
+        ...         self.add_flow("exf", ExampleFlow)
+        ...         self.add_flow("exf2", ExampleFlow)
+        ...         self.add_fxn("ex_fxn", ExampleFunction, "exf")
+        ...         self.add_fxn("ex_static", ExStaticFxn, "exf", "exf2")
+        >>> ex = ExStaticArch()
+        >>> ex.staticflows
+        ['exf', 'exf2']
+        >>> ex._static_flow_fxns
+        {'exf': ('ex_static',), 'exf2': ('ex_static',)}
+        >>> ex._fxn_static_flows
+        {'ex_static': ('exf', 'exf2')}
+
+        Which is then used to propagate values between static functions:
+
+        >>> ex.propagate(1.0)
+        >>> ex.flows['exf2'].s.x == ex.flows['exf'].s.x
+        True
+        """
+        staticfxns = getattr(self, 'staticfxns', OrderedSet())
+        self._static_flow_fxns = {}
+        for flow in self.flows:
+            flowfxns = tuple([n for n in self.graph.neighbors(flow) if n in staticfxns])
+            if flowfxns:
+                self._static_flow_fxns[flow] = flowfxns
+        self.staticflows = [*self._static_flow_fxns]
+        self._fxn_static_flows = {fxn: tuple([n for n in self.graph.neighbors(fxn)
+                                              if n in self._static_flow_fxns])
+                                  for fxn in staticfxns}
 
     def calc_repaircost(self, additional_cost=0, default_cost=0, max_cost=np.inf):
         """
@@ -683,6 +731,40 @@ class FunctionArchitecture(Architecture):
             fxn.reset()
         super().reset()
 
+    def get_snapshot(self, prefix='', snap=None, seen=None):
+        """
+        Extend BaseObject.get_snapshot to include the flow changes pending propagation.
+
+        Since the flow versions in _flowstates are specific to the flows of this
+        model, the snapshot instead records which static flows have changed since the
+        last static propagation step (or None if static propagation has not started).
+
+        Examples
+        --------
+        >>> exfa = ExFxnArch()
+        >>> exfa.get_snapshot()['_flowstates'] is None
+        True
+        """
+        snap = super().get_snapshot(prefix, snap, seen)
+        if self._flowstates:
+            snap[prefix + '_flowstates'] = {
+                flowname for flowname, version in self._flowstates.items()
+                if version != self.flows[flowname].return_version(observe=False)}
+        else:
+            snap[prefix + '_flowstates'] = None
+        return snap
+
+    def restore(self, snap, prefix='', seen=None):
+        """Extend BaseObject.restore to restore the flow changes pending propagation."""
+        super().restore(snap, prefix, seen)
+        changed = snap[prefix + '_flowstates']
+        if changed is None:
+            self._flowstates = {}
+        else:
+            self._flowstates = {flowname: None if flowname in changed
+                                else self.flows[flowname].return_version()
+                                for flowname in self.staticflows}
+
     def return_probdens(self):
         """Return the probability density of the model distributions."""
         probdens = 1.0
@@ -795,44 +877,40 @@ class FunctionArchitecture(Architecture):
             random states over time.
         """
         # set up history of flows to see if any has changed
-        activefxns = self.staticfxns.copy()
-        nextfxns = set()
         if not self._flowstates:
-            self._flowstates = dict.fromkeys(self.staticflows)
-            for flowname in self.staticflows:
-                self._flowstates[flowname] = self.flows[flowname].return_mutables()
+            self._flowstates = {flowname: self.flows[flowname].return_version()
+                                for flowname in self.staticflows}
+        activefxns = self.staticfxns
         n = 0
         while activefxns:
-            flows_to_check = {*self.staticflows}
-            for fxnname in list(activefxns).copy():
+            nextfxns = set()
+            changedflows = set()
+            for fxnname in activefxns:
                 # Update functions with new values, check to see if new faults or states
-                oldmutables = self.fxns[fxnname].return_mutables()
-                self.fxns[fxnname]('static', time=time, run_stochastic=run_stochastic)
-                if oldmutables != self.fxns[fxnname].return_mutables():
-                    nextfxns.update([fxnname])
+                fxn = self.fxns[fxnname]
+                oldversion = fxn.return_version()
+                fxn('static', time=time, run_stochastic=run_stochastic)
+                if oldversion != fxn.return_version():
+                    nextfxns.add(fxnname)
 
                 # Check what flows now have new values and add connected functions
                 # (done for each because of communications potential)
-                for flowname in self.fxns[fxnname].flows:
-                    if flowname in flows_to_check:
+                for flowname in self._fxn_static_flows[fxnname]:
+                    if flowname not in changedflows:
                         try:
-                            if self._flowstates[flowname] != self.flows[flowname].return_mutables():
-                                nextfxns.update(set([n for n in self.graph.neighbors(flowname)
-                                                     if n in self.staticfxns]))
-                                flows_to_check.remove(flowname)
+                            if self._flowstates[flowname] != self.flows[flowname].return_version():
+                                nextfxns.update(self._static_flow_fxns[flowname])
+                                changedflows.add(flowname)
                         except ValueError as e:
                             raise Exception("Invalid mutables in flow: "
                                             + flowname) from e
-            # check remaining flows that have not been checked already
-            for flowname in flows_to_check:
-                if self._flowstates[flowname] != self.flows[flowname].return_mutables():
-                    nextfxns.update(set([n for n in self.graph.neighbors(flowname)
-                                         if n in self.staticfxns]))
-            # update flowstates
+            # check remaining flows and update flowstates
             for flowname in self.staticflows:
-                self._flowstates[flowname] = self.flows[flowname].return_mutables()
-            activefxns = nextfxns.copy()
-            nextfxns.clear()
+                newversion = self.flows[flowname].return_version()
+                if flowname not in changedflows and self._flowstates[flowname] != newversion:
+                    nextfxns.update(self._static_flow_fxns[flowname])
+                self._flowstates[flowname] = newversion
+            activefxns = [fxnname for fxnname in self.staticfxns if fxnname in nextfxns]
             n += 1
             if n > 1000:  # break if this is going for too long
                 raise Exception("Undesired looping for functions in static propagation",
@@ -29,6 +29,9 @@ from fmdtools.analyze.common import setup_plot
 from fmdtools.define.object.geom import GeomPoint, GeomLine, GeomPoly
 from fmdtools.define.object.geom import ExPoint, ExLine, ExPoly
 
+import numpy as np
+import shapely
+
 
 class GeomArchitecture(Architecture):
     """
@@ -166,6 +169,91 @@ class GeomArchitecture(Architecture):
                 all_at[geomname] = at_geom
         return all_at
 
+    def get_geom_index(self):
+        """
+        Get the (cached) STRtree over the shapes and buffers of all geoms.
+
+        The tree is kept in ._geom_index and only re-built if the underlying shapes
+        change (e.g., if geoms are added/replaced). Since shapes and buffers are
+        defined by the geom parameters, changes in geom states do not re-build it.
+
+        Returns
+        -------
+        keys : list
+            List of tuples (geomname, buffername) for each geometry in the tree.
+        tree : shapely.STRtree
+            STRtree over all shapes/buffers (in the order of keys).
+
+        Examples
+        --------
+        >>> exga = ExGeomArch()
+        >>> keys, tree = exga.get_geom_index()
+        >>> keys[:3]
+        [('ex_point', 'shape'), ('ex_point', 'on'), ('ex_line', 'shape')]
+        >>> len(tree)
+        5
+        >>> exga.get_geom_index()[1] is tree
+        True
+
+        Changing the state of a geom keeps the cached tree:
+
+        >>> exga.points['ex_point'].s.occupied = True
+        >>> exga.get_geom_index()[1] is tree
+        True
+        """
+        geoms = self.geoms()
+        keys, shapes = [], []
+        for geomname, geom in geoms.items():
+            for bname in ['shape', *geom.buffers]:
+                keys.append((geomname, bname))
+                shapes.append(getattr(geom, bname))
+        index = getattr(self, '_geom_index', None)
+        if (not index or len(index[2]) != len(shapes)
+                or not all(a is b for a, b in zip(index[2], shapes))):
+            shapes = [geoms[gname].get_prepared(bname) for gname, bname in keys]
+            self._geom_index = (keys, shapely.STRtree(shapes), shapes)
+        return self._geom_index[:2]
+
+    def all_at_many(self, pts):
+        """
+        Find all geoms (and buffers) each of the given points is at.
+
+        Uses a single STRtree query over all geoms rather than checking each geom and
+        buffer individually.
+
+        Parameters
+        ----------
+        pts : array-like
+            Array of points [[x1, y1], [x2, y2], ...] (z-coordinates are ignored).
+
+        Returns
+        -------
+        all_at : list
+            List of dicts of the geoms each point is at (see GeomArchitecture.all_at).
+
+        Examples
+        --------
+        >>> exga = ExGeomArch()
+        >>> ats = exga.all_at_many([[1.0, 1.0], [0.0, 0.0], [0.4, 0.3], [5.0, 5.0]])
+        >>> ats[0]
+        {'ex_point': ['shape', 'on'], 'ex_line': ['shape', 'on'], 'ex_poly': ['shape']}
+        >>> ats[1]
+        {'ex_line': ['shape', 'on'], 'ex_poly': ['shape']}
+        >>> ats[2:]
+        [{'ex_point': ['on'], 'ex_line': ['on']}, {}]
+        """
+        keys, tree = self.get_geom_index()
+        pts = np.atleast_2d(np.asarray(pts, dtype=float))
+        # for points, intersection with a geometry is the same as being covered by it
+        pt_inds, key_inds = tree.query(shapely.points(pts[:, :2]),
+                                       predicate='intersects')
+        order = np.lexsort((key_inds, pt_inds))
+        all_at = [{} for _ in range(len(pts))]
+        for pt_ind, key_ind in zip(pt_inds[order], key_inds[order]):
+            geomname, bname = keys[key_ind]
+            all_at[pt_ind].setdefault(geomname, []).append(bname)
+        return all_at
+
     def show(self, geoms={'all': {}}, fig=None, ax=None, figsize=(4, 4), z=False,
              **kwargs):
         """
@@ -27,7 +27,6 @@ specific language governing permissions and limitations under the License.
 
 from collections.abc import Iterable
 from recordclass import dataobject
-from ordered_set import OrderedSet
 import numpy as np
 import inspect
 import sys
@@ -134,14 +133,17 @@ def nest_dict(dic, levels=float('inf'), separator="."):
         Nested dictionary. e.g. {'a': {'b': 1.0}}
     """
     newhist = dic.__class__()
-    key_options = OrderedSet([h.split(separator)[0] for h in dic.keys()])
-    for key in key_options:
+    # group the sub-keys by their first component in one pass over the keys
+    subdicts = {}
+    for histkey, val in dic.items():
+        key, sep, subkey = histkey.partition(separator)
+        subdict = subdicts.setdefault(key, {})
+        if sep:
+            subdict[subkey] = val
+    for key, subdict in subdicts.items():
         if key in dic:
             newhist[key] = dic[key]
         else:
-            subdict = {histkey[len(key)+1:]: val
-                       for histkey, val in dic.items()
-                       if histkey.startswith(key+separator)}
             subhist = dic.__class__(**subdict)
             lev = levels-1
             if lev > 0:
@@ -181,14 +181,19 @@ class Simulable(BaseObject):
         Parameters defining the simulation.
     mut_kwargs : dict
         Non-default kwargs for mutable containers/roles (to use for reset)
+    batch_safe : bool
+        Class variable declaring that the behaviors hold when parameters and states are
+        arrays (with a value for each scenario in a batch). Default is False.
     """
 
-    __slots__ = ('p', 'sp', 'r', 't', 'h', 'track', 'flows', 'mut_kwargs')
+    __slots__ = ('p', 'sp', 'r', 't', 'h', 'track', 'flows', 'mut_kwargs',
+                 '_hist_loggers')
     container_t = Time
     default_track = ["all"]
     immutable_roles = BaseObject.immutable_roles + ['sp']
     default_sp = {}
     container_sp = SimParam
+    batch_safe = False
 
     def __init__(self, sp={}, **kwargs):
         """
@@ -214,6 +219,7 @@ class Simulable(BaseObject):
             self.h = self.create_hist(timerange)
         else:
             self.h = h.copy()
+        self._hist_loggers = None
 
     def init_time_hist(self):
         """Add time history to the model (only done at top level)."""
@@ -221,11 +227,23 @@ class Simulable(BaseObject):
             timerange = self.sp.get_histrange()
             self.h['time'] = timerange
 
+    def compile_hist_loggers(self):
+        """
+        Compile the loggers used to log the history (see History.compile_log).
+
+        Loggers are resolved once for the current history and re-compiled if the
+        history is replaced or has keys added.
+        """
+        loggers = getattr(self, '_hist_loggers', None)
+        if loggers is None or loggers[0] is not self.h or len(loggers[1]) != len(self.h):
+            self._hist_loggers = (self.h, self.h.compile_log(self))
+        return self._hist_loggers[1]
+
     def log_hist(self, t_ind, t, shift):
         """Log the history over time."""
         if self.sp.track_times:
             t_ind_rec = self.sp.get_hist_ind(t_ind, t, shift)
-            self.h.log(self, t_ind_rec, time=t)
+            self.h.log_compiled(self.compile_hist_loggers(), t_ind_rec, time=t)
 
     def update_seed(self, seed=[]):
         """
@@ -350,6 +368,43 @@ class Simulable(BaseObject):
                                 sim_units=self.sp.units, weight=weight)
         return rate
 
+    def get_scen_rates(self, fxnname, faultmode, times, phasemap={}, weights=1.0):
+        """
+        Get the scenario rates for the given fault injected at each of the given times.
+
+        Parameters
+        ----------
+        fxnname: str
+            Name of the function with the fault
+        faultmode: str
+            Name of the fault mode
+        times: list
+            Times when the scenarios are to occur
+        phasemap : PhaseMap, optional
+            Map of phases/modephases that define operations the mode will be injected
+            during (and maps to the opportunity vector phases). The default is {}.
+        weights : float/list, optional
+            Scenario weight(s) for each time. The default is 1.
+
+        Returns
+        -------
+        rates: np.array
+            Rate of the scenario at each time
+        """
+        fxn = self.get_fxns()[fxnname]
+        fm = fxn.m.faultmodes.get(faultmode, False)
+        if not fm:
+            raise Exception("faultmode "+faultmode+" not in "+str(fxn.m.__class__))
+        else:
+            sim_time = self.sp.start_time - self.sp.end_time + self.sp.dt
+            rates = fm.calc_rates(times, phasemap=phasemap, sim_time=sim_time,
+                                  sim_units=self.sp.units, weights=weights)
+        return rates
+
+    def is_batch_safe(self):
+        """Check whether the Simulable can be simulated as a batch of scenarios."""
+        return self.batch_safe
+
     def return_probdens(self):
         """Get the probability density associated with Block and things it contains."""
         if hasattr(self, 'r'):
@@ -658,8 +713,8 @@ class Block(Simulable):
 
         # Step 2: Run Static Propagation Methods
         active = True
-        oldmutables = self.return_mutables()
-        flows_mutables = {f: fl.return_mutables() for f, fl in self.get_flows().items()}
+        oldmutables = self.return_version()
+        flows_mutables = {f: fl.return_version() for f, fl in self.get_flows().items()}
         while active:
             if self.is_static():
                 self("static", time=time, faults=faults, run_stochastic=run_stochastic)
@@ -669,12 +724,12 @@ class Block(Simulable):
             # Check to see what flows now have new values and add connected functions
             # (done for each because of communications potential)
             active = False
-            newmutables = self.return_mutables()
+            newmutables = self.return_version()
             if oldmutables != newmutables:
                 active = True
                 oldmutables = newmutables
             for flowname, fl in self.get_flows().items():
-                newflowmutables = fl.return_mutables()
+                newflowmutables = fl.return_version()
                 if flows_mutables[flowname] != newflowmutables:
                     active = True
                     flows_mutables[flowname] = newflowmutables
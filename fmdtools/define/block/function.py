@@ -105,8 +105,8 @@ class Function(Block):
         modeprops : dict
             Dict of corresponding fault mode properties.
         """
-        if hasattr(self, 'm'):
-            ms = [m for m in self.m.faults.copy() if m != 'nom']
+        if hasattr(self, 'm') and self.m.faults:
+            ms = [m for m in self.m.faults if m != 'nom']
             modeprops = dict.fromkeys(ms)
             for mode in ms:
                 modeprops[mode] = self.m.faultmodes.get(mode)
@@ -154,7 +154,8 @@ class Function(Block):
         """Get faults from contained components and add to .m."""
         for objname in self.get_roles('arch'):
             obj = getattr(self, objname)
-            self.m.faults.difference_update(obj.faultmodes)
+            if self.m.faults:
+                self.m.faults.difference_update(obj.faultmodes)
             self.m.faults.update(obj.get_faults())
 
     def __call__(self, proptype, faults=[], time=0, run_stochastic=False):
@@ -207,6 +208,11 @@ class Function(Block):
                             "\n Is the mode representation nonexclusive?")
         return
 
+    def is_batch_safe(self):
+        """Check whether the Function and its archs can be simulated as a batch."""
+        return self.batch_safe and all([getattr(self, arch).is_batch_safe()
+                                        for arch in self.archs])
+
     def return_probdens(self):
         """Get the probability density associated with FxnBlock and its archs."""
         pd = super().return_probdens()
@@ -22,13 +22,128 @@ from fmdtools.analyze.common import get_sub_include
 from fmdtools.analyze.history import History
 
 from recordclass import dataobject, astuple, asdict
+from functools import partial
 import copy
 import pickle
+import weakref
 import numpy as np
 import sys
 
+VERSIONED_TYPES = (float, int, bool, str, complex)
 
-class BaseContainer(dataobject, mapping=True, iterable=True, copy_default=True):
+
+class ContainerVersions(object):
+    """
+    Registry of container versions used to check for changes in propagation.
+
+    Versions are kept outside of the containers (which are dataobjects without a
+    __dict__) and are indexed by container id. Each change is given a new version from
+    a global counter, so a container has changed if its version has changed. Since
+    behaviors may change a value and then change it back (e.g., when a fault overrides
+    a nominal assignment), the values at the last observed version are kept (when the
+    container is first changed after being observed) and compared when the version is
+    next checked, so that such containers revert to that version.
+
+    Entries are removed (via a weak reference to the container) when the container is
+    garbage-collected, so the registry only holds entries for live containers and ids
+    reused by new containers do not inherit stale versions.
+
+    Attributes
+    ----------
+    count : int
+        Number of changes recorded.
+    changed : dict
+        Dict of {id: version} for changed containers. Containers without a recorded
+        change have version 0.
+    base : dict
+        Dict of {id: (version, values)} of the containers at their last observed
+        version, for containers changed since they were last observed.
+    refs : dict
+        Dict of {id: weakref} for the containers in changed, which remove the entries
+        of the container when it is garbage-collected.
+
+    Examples
+    --------
+    >>> versions = ContainerVersions()
+    >>> ex = ExContainer()
+    >>> versions.observe(ex)
+    0
+    >>> ex.x = 2.0
+    >>> versions.bump(ex, 'x', 1.0)
+    >>> versions.get(ex)
+    1
+    >>> ex.x = 1.0
+    >>> versions.bump(ex, 'x', 2.0)
+    >>> versions.get(ex)
+    0
+    >>> ex.x = 3.0
+    >>> versions.bump(ex, 'x', 1.0)
+    >>> len(versions.changed)
+    1
+    >>> del ex
+    >>> len(versions.changed)
+    0
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.changed = {}
+        self.base = {}
+        self.refs = {}
+
+    def bump(self, obj, fieldname='', old_value=None):
+        """
+        Record a change in field fieldname of obj (previously old_value).
+
+        The values of the container before the change are only kept for the first
+        change since it was last observed. If no fieldname is given, the previous
+        values are unknown and the container will not revert to its prior version.
+        """
+        key = id(obj)
+        if not fieldname:
+            self.base.pop(key, None)
+        elif key not in self.base:
+            values = list(astuple(obj))
+            values[obj.__fields__.index(fieldname)] = old_value
+            self.base[key] = (self.changed.get(key, 0), tuple(values))
+        if key not in self.refs:
+            self.refs[key] = weakref.ref(obj, partial(self.remove, key))
+        self.count += 1
+        self.changed[key] = self.count
+
+    def remove(self, key, ref=None):
+        """Remove the entries of the container with id key (e.g., when collected)."""
+        self.changed.pop(key, None)
+        self.base.pop(key, None)
+        self.refs.pop(key, None)
+
+    def get(self, obj):
+        """Get the current version of the given object."""
+        key = id(obj)
+        if key in self.base:
+            version, values = self.base[key]
+            try:
+                same = astuple(obj) == values
+            except ValueError:
+                same = all([np.array_equal(v, bv)
+                            for v, bv in zip(astuple(obj), values)])
+            if same:
+                self.changed[key] = version
+                self.base.pop(key)
+        return self.changed.get(key, 0)
+
+    def observe(self, obj):
+        """Get the current version of the object, setting it as its base version."""
+        version = self.get(obj)
+        self.base.pop(id(obj), None)
+        return version
+
+
+container_versions = ContainerVersions()
+
+
+class BaseContainer(dataobject, mapping=True, iterable=True, copy_default=True,
+                    use_weakref=True):
     """
     Base container class.
 
@@ -39,6 +154,49 @@ class BaseContainer(dataobject, mapping=True, iterable=True, copy_default=True):
 
     default_track = 'all'
     rolename = 'x'
+    _versioned = True
+
+    def __init_subclass__(cls, **kwargs):
+        """Check whether the container is versioned once, when the class is created."""
+        super().__init_subclass__(**kwargs)
+        cls._versioned = all(cls.__annotations__.get(f) in VERSIONED_TYPES
+                             for f in cls.__fields__)
+
+    def __setattr__(self, name, value):
+        """Set attribute, bumping the version of versioned containers if changed."""
+        if self._versioned:
+            old = getattr(self, name)
+            dataobject.__setattr__(self, name, value)
+            if old is not value:
+                try:
+                    changed = bool(old != value)
+                except ValueError:
+                    changed = not np.array_equal(old, value)
+                if changed:
+                    container_versions.bump(self, name, old)
+            elif isinstance(value, np.ndarray):
+                # arrays (e.g., batched states) may have been modified in-place
+                container_versions.bump(self)
+        else:
+            dataobject.__setattr__(self, name, value)
+
+    @classmethod
+    def is_versioned(cls):
+        """
+        Check whether changes in the container can be tracked by version.
+
+        Only containers whose fields are all annotated with immutable types (float,
+        int, bool, str) are versioned, since other fields (e.g., sets, dicts, arrays)
+        may be modified in place. Other containers fall back to return_mutables.
+
+        Examples
+        --------
+        >>> ExContainer.is_versioned()
+        True
+        >>> ExNestContainer.is_versioned()
+        False
+        """
+        return cls._versioned
 
     def get_typename(self):
         """Containers are typed as containers unless specified otherwise."""
@@ -410,6 +568,41 @@ class BaseContainer(dataobject, mapping=True, iterable=True, copy_default=True):
         """Return mutable aspects of the container."""
         return astuple(self)
 
+    def return_version(self, observe=True):
+        """
+        Return the version of the container (used to check if it has changed).
+
+        Versioned containers return (id, version) integers, which change whenever a
+        field is set to a new value (e.g., via setattr, put, inc, assign, or
+        set_field). Other containers return their mutables.
+
+        Parameters
+        ----------
+        observe : bool, optional
+            Whether to set the current version as the base version the container
+            reverts to (see ContainerVersions.observe). Set to False to check the
+            version without changing it. The default is True.
+
+        Examples
+        --------
+        >>> ex = ExContainer()
+        >>> v0 = ex.return_version()
+        >>> ex.x = 1.0
+        >>> v0 == ex.return_version()
+        True
+        >>> ex.assign([3.0, 4.0], 'x', 'y')
+        >>> v0 == ex.return_version()
+        False
+        >>> ExNestContainer().return_version()
+        (ExContainer(x=1.0, y=2.0), 20.0)
+        """
+        if not self._versioned:
+            return self.return_mutables()
+        elif observe:
+            return (id(self), container_versions.observe(self))
+        else:
+            return (id(self), container_versions.get(self))
+
     def asdict(self):
         """Return fields as a dictionary."""
         return asdict(self)
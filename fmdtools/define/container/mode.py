@@ -121,6 +121,68 @@ class Fault(BaseContainer, readonly=True):
                 opp_factor = 1.0
             return baserate * opp_factor * t_factor * weight
 
+    def calc_rates(self, times, phasemap={}, sim_time=1.0, sim_units='hr', weights=1.0):
+        """
+        Calculate the rates of the fault mode at each of the given times.
+
+        Vectorized version of calc_rate, which finds the phases and exposure times of
+        all the given times at once.
+
+        Parameters
+        ----------
+        times : list
+            Times the fault will be injected.
+        phasemap : PhaseMap, optional
+            Map of phases/modephases that define operations the mode will be injected
+            during (and maps to the opportunity vector phases). The default is {}.
+        sim_time : float, optional
+            Duration of the simulation. The default is 1.0.
+        sim_units : float, optional
+            Simulation time units. The default is 'hr'.
+        weights : float/list, optional
+            Weight(s) for the scenario at each time. The default is 1.0.
+
+        Returns
+        -------
+        rates : np.array
+            Calculated rate of the scenario at each time.
+
+        Examples
+        --------
+        >>> from fmdtools.analyze.phases import PhaseMap
+        >>> pm = PhaseMap({'on': [0, 5], 'off': [6, 10]})
+        >>> exfault = Fault(prob=0.5, phases = {'on': 0.9, 'off': 0.1}, units='hr')
+        >>> rates = exfault.calc_rates([4, 7], pm, sim_time=10.0, sim_units='min')
+        >>> rates[0] == exfault.calc_rate(4, pm, sim_time=10.0, sim_units='min')
+        True
+        >>> rates[1] == exfault.calc_rate(7, pm, sim_time=10.0, sim_units='min')
+        True
+        """
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), (len(times),))
+        if self.units == 'sim':
+            sim_exposure_time = 1.0
+            baserate = self['prob']
+        else:
+            sim_exposure_time = eq_units(self['units'], sim_units) * sim_time
+            baserate = self['prob'] * sim_exposure_time
+
+        if not phasemap:
+            return baserate * weights
+        else:
+            if self.units == 'sim':
+                t_factor = 1.0
+            else:
+                t_exposure = phasemap.calc_scen_exposure_times(*times)
+                t_exposure *= eq_units(self['units'], sim_units)
+                t_factor = t_exposure/sim_exposure_time
+            if self.phases:
+                phases = phasemap.find_base_phases(*times)
+                opp_factor = np.array([self.phases.get(phase, 0.0) for phase in phases],
+                                      dtype=float)
+            else:
+                opp_factor = 1.0
+            return baserate * opp_factor * t_factor * weights
+
 
 class Mode(BaseContainer, readonly=False):
     """
@@ -243,6 +305,7 @@ class Mode(BaseContainer, readonly=False):
             self.init_n_faultstates(self.nfs_args[0], **self.nfs_args[1])
         if self.fsm_args:
             self.init_faultstates_modes(self.fsm_args[0], **self.fsm_args[1])
+        self.update_fault_index()
 
     def __repr__(self):
         reprstr = (self.__class__.__name__ +
@@ -282,7 +345,90 @@ class Mode(BaseContainer, readonly=False):
         return Mode
 
     def return_mutables(self):
-        return (self.mode, copy.copy(self.faults))
+        """
+        Return the mode and faults (as a bitmask, if possible) of the Mode.
+
+        Examples
+        --------
+        >>> exm = ExampleMode()
+        >>> exm.return_mutables()
+        ('standby', 0)
+        >>> exm.add_fault('short')
+        >>> exm.return_mutables()
+        ('short', 2)
+        """
+        try:
+            return (self.mode, self.get_fault_bits())
+        except KeyError:
+            return (self.mode, copy.copy(self.faults))
+
+    def get_fault_index(self):
+        """
+        Get the dict {faultmode: bit} used to encode faults (see get_fault_bits).
+
+        The index is kept on the class, so it is shared by (and only built once for)
+        all instances of the Mode. Since it is only ever added to, the bits of the
+        faultmodes already in it do not change.
+        """
+        index = type(self).__dict__.get('_fault_index')
+        if index is None:
+            index = type(self)._fault_index = dict()
+        return index
+
+    def update_fault_index(self):
+        """
+        Add the faultmodes of the Mode which are not yet in the fault index.
+
+        Examples
+        --------
+        >>> exm = ExampleMode()
+        >>> exm.get_fault_index()
+        {'no_charge': 0, 'short': 1}
+        """
+        index = self.get_fault_index()
+        for faultmode in self.faultmodes:
+            if faultmode not in index:
+                index[faultmode] = len(index)
+        return index
+
+    def get_fault_bits(self):
+        """
+        Get the faults present as an integer bitmask over the faultmodes.
+
+        Bit i of the mask is set for the faultmode with bit i in the fault index of the
+        Mode class (see get_fault_index), so faults may be compared/copied as ints
+        rather than sets.
+
+        Returns
+        -------
+        bits : int
+            Bitmask of faults present.
+
+        Raises
+        ------
+        KeyError
+            If a fault is present which is not in self.faultmodes.
+
+        Examples
+        --------
+        >>> exm = ExampleMode()
+        >>> exm.add_fault('short')
+        >>> exm.get_fault_bits()
+        2
+        """
+        if not self.faults:
+            return 0
+        index = self.get_fault_index()
+        bits = 0
+        for fault in self.faults:
+            bit = index.get(fault)
+            if bit is None:
+                # faultmodes may be added after the Mode is initialized
+                if fault not in self.faultmodes:
+                    raise KeyError(fault)
+                bit = self.update_fault_index()[fault]
+            bits |= 1 << bit
+        return bits
 
     def init_faultmodes(self, fm_args):
         """
@@ -464,7 +610,7 @@ class Mode(BaseContainer, readonly=False):
         *faults : strs
             names of the fault to check.
         """
-        return any(self.faults.intersection(set(faults)))
+        return not self.faults.isdisjoint(faults)
 
     def no_fault(self, fault):
         """
@@ -475,11 +621,11 @@ class Mode(BaseContainer, readonly=False):
         fault : str
             name of the fault to check.
         """
-        return not (any(self.faults.intersection(set([fault]))))
+        return fault not in self.faults
 
     def any_faults(self):
         """Check if the block has any fault modes."""
-        return any(self.faults)
+        return bool(self.faults)
 
     def to_fault(self, fault):
         """
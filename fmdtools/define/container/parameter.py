@@ -212,6 +212,66 @@ class Parameter(BaseContainer, readonly=True):
         return ()
 
 
+class BatchArray(np.ndarray):
+    """
+    Array holding a value for each scenario in a batch (along its first axis).
+
+    Since numpy arithmetic and ufuncs on BatchArrays return BatchArrays, values
+    computed from batched parameters (see :func:`batch_params`) keep this marking,
+    which is used to split the results of a batch by scenario (see
+    propagate.unbatch_result). Functions which are not numpy operations (e.g.,
+    np.where) return plain arrays, which are not split.
+
+    Examples
+    --------
+    >>> a = np.array([1.0, 2.0]).view(BatchArray)
+    >>> type(a * 2.0 + 1.0).__name__
+    'BatchArray'
+    """
+
+
+def batch_params(*params):
+    """
+    Create a single Parameter representing a batch of parameters.
+
+    Fields which are the same in all parameters keep their value, while fields which
+    differ are given as (read-only) BatchArrays with a value for each parameter. Used
+    for batched simulation of many scenarios (see propagate.parameter_sample).
+
+    Parameters
+    ----------
+    *params : Parameter
+        Parameters (of the same class) to batch.
+
+    Returns
+    -------
+    batch_param : Parameter
+        Parameter with array-valued fields where the given parameters differ.
+
+    Examples
+    --------
+    >>> p = batch_params(ExampleParameter(x=1.0), ExampleParameter(x=2.0))
+    >>> p.x
+    BatchArray([1., 2.])
+    >>> p.y
+    3.0
+    """
+    fields = {}
+    for field in params[0].__fields__:
+        vals = [getattr(p, field) for p in params]
+        if all([val == vals[0] for val in vals[1:]]):
+            fields[field] = vals[0]
+        elif all([isinstance(val, Parameter) for val in vals]):
+            fields[field] = batch_params(*vals)
+        elif all([isinstance(val, (int, float, bool, np.number)) for val in vals]):
+            fields[field] = np.array(vals).view(BatchArray)
+            fields[field].flags.writeable = False
+        else:
+            raise Exception("Cannot batch non-numeric field " + field + ": " + str(vals))
+    return params[0].__class__(**fields, strict_immutability=False, check_type=False,
+                               set_type=False, check_lim=False)
+
+
 class ExampleParameter(Parameter, readonly=True):
     """Example parameter for testing and documentation."""
 
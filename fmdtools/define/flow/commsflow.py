@@ -241,6 +241,12 @@ class CommsFlow(MultiFlow):
             mutes.append([f['in'], f['received']])
         return mutes
 
+    def get_snapshot_roles(self):
+        """Extend MultiFlow to include in/received dicts in snapshots."""
+        return {**super().get_snapshot_roles(),
+                **{"fxns." + f + "." + box: fxn[box]
+                   for f, fxn in self.fxns.items() for box in ("in", "received")}}
+
     def add_subgraph_edges(self, g, with_flowedges=True, **kwargs):
         """Add subgraph edges that account for the CommsFlow's comms structure."""
         super().add_subgraph_edges(g, **kwargs)
@@ -32,6 +32,7 @@ from fmdtools.analyze.common import get_sub_include
 from fmdtools.analyze.history import History
 from fmdtools.analyze.graph.model import add_node, add_edge, remove_base, ModelGraph
 
+import copy
 import dill
 import pickle
 import time
@@ -607,16 +608,30 @@ class BaseObject(object):
                             if at_h:
                                 hist[at] = at_h
                         elif isinstance(attr, np.ndarray):
-                            hist.init_att(at, attr, timerange, at_track,
-                                          dtype=np.ndarray)
+                            self.init_array_hist(hist, at, attr, timerange, at_track)
                         else:
                             hist.init_att(at, attr, timerange, at_track)
             return hist.flatten()
 
+    def init_array_hist(self, hist, att, val, timerange, track):
+        """Initialize the history of the array-valued attribute att (with value val)."""
+        hist.init_att(att, val, timerange, track, dtype=np.ndarray)
+
     def find_mutables(self):
-        """Return list of mutable roles."""
-        return [v for v in self.get_roles_as_dict(with_immutable=False).values()
-                if not ismethod(v)]
+        """
+        Return list of mutable roles.
+
+        Gives the same roles as get_roles_as_dict(with_immutable=False), but without
+        its options, since it is called for every block in each static step.
+        """
+        flex_roles = [r+'s' for r in self.roletypes if r+'s' in self.flexible_roles]
+        roles = self.get_flex_role_objs(*flex_roles)
+        for roletype in self.roletypes:
+            if roletype+'s' not in self.flexible_roles:
+                for role in getattr(self, roletype+'s', []):
+                    if role not in self.immutable_roles:
+                        roles[role] = getattr(self, role)
+        return [v for v in roles.values() if not ismethod(v)]
 
     def return_mutables(self):
         """
@@ -632,6 +647,140 @@ class BaseObject(object):
         return tuple([mut.return_mutables() if hasattr(mut, 'return_mutables')
                       else mut for mut in self.find_mutables()])
 
+    def return_version(self, observe=True):
+        """
+        Return the version of all mutable roles in the object.
+
+        Used in static propagation steps to check if the block has changed. Unlike
+        return_mutables, versioned containers (see BaseContainer.return_version) are
+        represented by integer versions, so checking for changes does not require
+        copying and comparing their values. Objects which override return_mutables
+        (e.g., Coords) fall back to it.
+
+        Parameters
+        ----------
+        observe : bool, optional
+            Whether to observe the versions of versioned containers (see
+            BaseContainer.return_version). The default is True.
+
+        Returns
+        -------
+        version : tuple
+            tuple of versions of all mutable roles for the object.
+
+        Examples
+        --------
+        >>> exec(example_object_code)
+        >>> ex = ExampleObject()
+        >>> v0 = ex.return_version()
+        >>> ex.s.put(x=1.0)
+        >>> v0 == ex.return_version()
+        True
+        >>> ex.s.inc(x=1.0)
+        >>> v0 == ex.return_version()
+        False
+        """
+        if type(self).return_mutables is not BaseObject.return_mutables:
+            return self.return_mutables()
+        return tuple([mut.return_version(observe) if hasattr(mut, 'return_version')
+                      else mut.return_mutables() if hasattr(mut, 'return_mutables')
+                      else mut for mut in self.find_mutables()])
+
+    def get_snapshot_roles(self):
+        """Return dict of the mutable roles saved in snapshots (see get_snapshot)."""
+        return {k: v for k, v in self.get_roles_as_dict(with_immutable=False,
+                                                         flex_prefixes=True).items()
+                if not ismethod(v)}
+
+    def get_snapshot(self, prefix='', snap=None, seen=None):
+        """
+        Capture the mutable state of the object and its contained objects.
+
+        Unlike copy, this does not re-instantiate the object, but only copies the
+        mutable roles (e.g., states, modes, rands, times, flows) into a flat dict,
+        which may then be restored into an object with the same structure (see
+        restore).
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Prefix for the keys of the snapshot. The default is ''.
+        snap : dict, optional
+            Snapshot to add to (used for contained objects). The default is None.
+        seen : set, optional
+            ids of objects already saved (so shared objects are only saved once).
+            The default is None.
+
+        Returns
+        -------
+        snap : dict
+            Flat dict of copied mutable roles with structure {'role.subrole': value}
+
+        Examples
+        --------
+        >>> exec(example_object_code)
+        >>> ex = ExampleObject()
+        >>> snap = ex.get_snapshot()
+        >>> snap
+        {'s': ExampleState(x=1.0, y=1.0)}
+        >>> ex.s.put(x=10.0, y=20.0)
+        >>> ex.restore(snap)
+        >>> ex.s
+        ExampleState(x=1.0, y=1.0)
+        """
+        if snap is None:
+            snap = {}
+        if seen is None:
+            seen = set()
+        seen.add(id(self))
+        for rolename, role in self.get_snapshot_roles().items():
+            if isinstance(role, BaseObject):
+                if id(role) not in seen:
+                    role.get_snapshot(prefix + rolename + ".", snap, seen)
+            elif hasattr(role, 'assign') or isinstance(role, np.ndarray):
+                snap[prefix + rolename] = role.copy()
+            else:
+                snap[prefix + rolename] = copy.deepcopy(role)
+        return snap
+
+    def restore(self, snap, prefix='', seen=None):
+        """
+        Restore the mutable state of the object to that of the given snapshot.
+
+        Roles are restored in-place, so the object (and references to its roles)
+        are kept.
+
+        Parameters
+        ----------
+        snap : dict
+            Snapshot from get_snapshot.
+        prefix : str, optional
+            Prefix for the keys of the snapshot. The default is ''.
+        seen : set, optional
+            ids of objects already restored. The default is None.
+        """
+        if seen is None:
+            seen = set()
+        seen.add(id(self))
+        for rolename, role in self.get_snapshot_roles().items():
+            if isinstance(role, BaseObject):
+                if id(role) not in seen:
+                    role.restore(snap, prefix + rolename + ".", seen)
+                continue
+            value = snap[prefix + rolename]
+            if hasattr(role, 'assign'):
+                role.assign(value, as_copy=True)
+            elif isinstance(role, np.ndarray):
+                np.copyto(role, value)
+            elif isinstance(role, (dict, set)):
+                role.clear()
+                role.update(copy.deepcopy(value))
+            elif isinstance(role, list):
+                role[:] = copy.deepcopy(value)
+            else:
+                raise Exception("Cannot restore role " + prefix + rolename +
+                                " of type " + str(type(role)))
+
     def get_node_attrs(self, roles=['container'], with_immutable=False,
                        time=0.0, indicators=True, obj=False):
         """
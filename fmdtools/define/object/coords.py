@@ -8,6 +8,10 @@ Has classes:
 - :class:`CoordsParam`, which is used to define :class:`Coords` attributes.
 - :class:`Coords`, which is used to define coordinate systems.
 
+And functions:
+
+- :func:`array_mutables`, which is used to check if state arrays have changed.
+
 Copyright © 2024, United States Government, as represented by the Administrator
 of the National Aeronautics and Space Administration. All rights reserved.
 
@@ -26,11 +30,15 @@ from fmdtools.define.container.parameter import Parameter
 from fmdtools.define.container.rand import Rand
 from fmdtools.define.base import is_iter
 from fmdtools.define.object.base import BaseObject
+from fmdtools.analyze.history import SparseHist
 from fmdtools.analyze.common import setup_plot, consolidate_legend, clear_prev_figure
 from fmdtools.analyze.common import prep_animation_title, add_title_xylabs
 
 import numpy as np
+import copy
+import types
 from typing import ClassVar
+from scipy.spatial import cKDTree
 
 from matplotlib import pyplot as plt
 from matplotlib import colormaps, cm
@@ -93,6 +101,29 @@ class CoordsParam(Parameter):
     gapwidth: ClassVar[float] = 0.0
 
 
+def array_mutables(arr):
+    """
+    Represent the values of an array as bytes (used to check if it has changed).
+
+    Copying the array buffer is much faster than converting the values to tuples of
+    python objects, and bytes compare by value. Arrays of objects fall back to tuples.
+
+    Examples
+    --------
+    >>> arr = np.zeros((2, 2))
+    >>> m0 = array_mutables(arr)
+    >>> arr[0, 0] = 1.0
+    >>> m0 == array_mutables(arr)
+    False
+    >>> arr[0, 0] = 0.0
+    >>> m0 == array_mutables(arr)
+    True
+    """
+    if arr.dtype.hasobject:
+        return tuple(map(tuple, arr))
+    return (arr.dtype.str, arr.shape, arr.tobytes())
+
+
 class Coords(BaseObject):
     """
     Class for generating, accessing, and setting gridworld properties.
@@ -111,6 +142,15 @@ class Coords(BaseObject):
         Random number generator. sets the .r container.
     init_properties: method
         Method that initializes the (non-default) properties of the Coords.
+    sparse_hist: bool
+        Whether to track the history of states as per-step changes with keyframes
+        every keyframe_interval steps (see :class:`SparseHist`), rather than as full
+        arrays at each time-step. The default is False.
+    keyframe_interval: int
+        Number of steps between keyframes in sparse histories. The default is 100.
+    max_spatial_indexes: int
+        Max number of feature/collection queries to cache (see get_spatial_index).
+        The default is 64.
 
     Examples
     --------
@@ -175,12 +215,15 @@ class Coords(BaseObject):
     """
 
     __slots__ = ("p", "r", "grid", "pts", "points", "collections", "features", "states",
-                 "properties", "_args", "_kwargs")
+                 "properties", "_args", "_kwargs", "_spatial_indexes")
     container_p = CoordsParam
     container_r = Rand
     roledicts = ['points', 'collections', 'features', 'states']
     immutable_roles = BaseObject.immutable_roles + ['points', 'collections', 'features']
     default_track = ["r", "states"]
+    sparse_hist = False
+    keyframe_interval = 100
+    max_spatial_indexes = 64
 
     def __init__(self, *args, track='default', **kwargs):
         """Initialize class with properties in init_properties."""
@@ -226,6 +269,7 @@ class Coords(BaseObject):
 
     def build(self):
         """Set features as immutable."""
+        self._spatial_indexes = {}
         for propname, prop in self.properties.items():
             if propname in self.features:
                 proparray = getattr(self, propname)
@@ -264,9 +308,140 @@ class Coords(BaseObject):
                [10.,  0.]])
         """
         prop = getattr(self, name)
-        where = np.where(comparator(prop, value))
-        pts_with_condition = [(p, where[1][i]) for i, p in enumerate(where[0])]
-        return np.array([self.grid[tuple(p)] for p in pts_with_condition])
+        return self.grid_pts(comparator(prop, value))
+
+    def grid_pts(self, mask):
+        """
+        Get the points in the grid where a given boolean mask is True.
+
+        Parameters
+        ----------
+        mask : np.array
+            Boolean array of size (x_size, y_size).
+
+        Returns
+        -------
+        pts : np.array
+            List of points (in row-major order) where the mask is True.
+
+        Examples
+        --------
+        >>> ex = ExampleCoords()
+        >>> ex.grid_pts(ex.v > 5.0)
+        array([[ 0.,  0.],
+               [10.,  0.]])
+        >>> ex.grid_pts(ex.v > 20.0)
+        array([], dtype=float64)
+        """
+        if not mask.any():
+            return np.array([])
+        return self.grid[mask]
+
+    def pts_to_mask(self, pts):
+        """
+        Get a boolean mask of the grid which is True at the given points.
+
+        Parameters
+        ----------
+        pts : np.array
+            List of x-y points in the grid.
+
+        Returns
+        -------
+        mask : np.array
+            Boolean array of size (x_size, y_size).
+
+        Examples
+        --------
+        >>> ex = ExampleCoords()
+        >>> np.argwhere(ex.pts_to_mask(ex.high_v))
+        array([[0, 0],
+               [1, 0]])
+        """
+        mask = np.full((self.p.x_size, self.p.y_size), False)
+        pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+        inds = np.rint(pts / self.p.blocksize).astype(int)
+        mask[inds[:, 0], inds[:, 1]] = True
+        return mask
+
+    def get_spatial_index(self, prop, value=True, comparator=np.equal):
+        """
+        Get the (cached) spatial index of a collection or feature query.
+
+        Since collections and features are immutable, the mask of points they cover
+        and the KD-tree used to search over them are only computed once and then
+        re-used (and shared with copies) in subsequent queries.
+
+        Feature queries are only cached for hashable values and built-in comparators
+        (e.g., numpy ufuncs such as np.equal), since other comparators (e.g., lambdas)
+        are new objects on every call. At most max_spatial_indexes queries are cached,
+        with the oldest removed first.
+
+        Parameters
+        ----------
+        prop : str
+            Name of the collection or feature (or 'pts' for all points).
+        value : bool/float/str/etc, optional
+            Value to compare the feature against. The default is True.
+        comparator : function, optional
+            Comparator for the feature. The default is np.equal.
+
+        Returns
+        -------
+        index : tuple
+            Tuple (mask, pts, tree) with the boolean mask over the grid, the array of
+            points, and a scipy cKDTree over those points.
+
+        Examples
+        --------
+        >>> ex = ExampleCoords()
+        >>> mask, pts, tree = ex.get_spatial_index("high_v")
+        >>> pts
+        array([[ 0.,  0.],
+               [10.,  0.]])
+        >>> ex.get_spatial_index("high_v")[2] is tree
+        True
+        >>> ex.get_spatial_index("v", 1.0)[1].shape
+        (98, 2)
+
+        Queries with unhashable values or other comparators are not cached:
+
+        >>> ex.get_spatial_index("v", [1.0])[1].shape
+        (98, 2)
+        >>> ex.get_spatial_index("v", 5.0, lambda a, b: a > b)[1].shape
+        (2, 2)
+        >>> len(ex._spatial_indexes)
+        2
+        """
+        if prop in self.features:
+            key = (prop, value, comparator)
+            if not isinstance(comparator, (np.ufunc, types.BuiltinFunctionType)):
+                return self.make_spatial_index(prop, value, comparator)
+            try:
+                hash(key)
+            except TypeError:
+                return self.make_spatial_index(prop, value, comparator)
+        elif prop in self.collections or prop == 'pts':
+            key = prop
+        else:
+            raise Exception(prop+" not a feature or collection")
+        if key not in self._spatial_indexes:
+            if len(self._spatial_indexes) >= self.max_spatial_indexes:
+                self._spatial_indexes.pop(next(iter(self._spatial_indexes)))
+            self._spatial_indexes[key] = self.make_spatial_index(prop, value,
+                                                                 comparator)
+        return self._spatial_indexes[key]
+
+    def make_spatial_index(self, prop, value=True, comparator=np.equal):
+        """Make the (mask, pts, tree) index of the query (see get_spatial_index)."""
+        if prop in self.features:
+            mask = comparator(getattr(self, prop), value)
+            pts = self.grid_pts(mask)
+        else:
+            pts = getattr(self, prop)
+            mask = self.pts_to_mask(pts)
+        tree = cKDTree(pts) if len(pts) > 0 else None
+        return (mask, pts, tree)
 
     def find_all(self, *points_colls, in_points_colls=True, **prop_kwargs):
         """
@@ -320,8 +495,8 @@ class Coords(BaseObject):
                 else:
                     raise Exception(name+"not in points or collections")
             true_array = np.full((self.p.x_size, self.p.y_size), not in_points_colls)
-            for pt in pts:
-                true_array[self.to_index(*pt)] = in_points_colls
+            if pts:
+                true_array[self.pts_to_mask(np.array(pts))] = in_points_colls
         else:
             true_array = np.full((self.p.x_size, self.p.y_size), True)
 
@@ -329,9 +504,7 @@ class Coords(BaseObject):
         for name, (value, comparator) in prop_kwargs.items():
             prop = getattr(self, name)
             true_array *= comparator(prop, value)
-        where = np.where(true_array)
-        pts_with_condition = [(p, where[1][i]) for i, p in enumerate(where[0])]
-        return np.array([self.grid[tuple(p)] for p in pts_with_condition])
+        return self.grid_pts(true_array)
 
     def to_index(self, *args):
         """
@@ -708,25 +881,34 @@ class Coords(BaseObject):
         >>> ex.set(0, 0, "st", 1.0)
         >>> ex.find_closest(20, 0, "st", value=1.0, comparator=np.equal)
         array([0., 0.])
+
+        Ties are resolved by the first point in the collection:
+
+        >>> ex.find_closest(5, 10, "pts")
+        array([ 0., 10.])
         """
-        if prop in self.properties:
-            pts = self.find_all_prop(prop, value, comparator)
-        elif prop in self.collections or prop == 'pts':
-            pts = getattr(self, prop)
+        if prop in self.states:
+            mask = comparator(getattr(self, prop), value)
+            pts = self.grid_pts(mask)
+            tree = None
+        elif prop in self.properties or prop in self.collections or prop == 'pts':
+            mask, pts, tree = self.get_spatial_index(prop, value, comparator)
         else:
             raise Exception(prop+" not in .properties or .collections")
 
-        p_rounded = self.to_gridpoint(x, y)
-
-        if p_rounded.tolist() in pts.tolist():
+        index = self.to_index(x, y)
+        p_rounded = self.grid[index]
+        if mask[index]:
             return p_rounded
-        else:
-            if not include_pt:
-                pts = np.array([p for p in pts if all(p != p_rounded)])
-            dists = np.sqrt(np.sum((np.array([x, y])-pts)**2, 1))
-            closest_ind = np.argmin(dists)
-            xy = pts[closest_ind]
-            return xy
+        elif not include_pt:
+            pts = pts[np.all(pts != p_rounded, axis=1)]
+        elif tree is not None:
+            # only need exact distances for points at (or near) the nearest distance
+            dist, _ = tree.query([x, y])
+            cands = tree.query_ball_point([x, y], dist * (1 + 1e-9) + 1e-12)
+            pts = pts[np.sort(cands)]
+        dists = np.sqrt(np.sum((np.array([x, y])-pts)**2, 1))
+        return pts[np.argmin(dists)]
 
     def in_range(self, x, y):
         """
@@ -839,9 +1021,25 @@ class Coords(BaseObject):
         setattr(self, prop, new_p)
 
     def return_mutables(self):
-        """Check if grid properties have changed (used in propagation)."""
-        return tuple([*(tuple(map(tuple, getattr(self, state)))
-                        for state in self.states)])
+        """
+        Check if grid properties have changed (used in propagation).
+
+        States are represented by the bytes of their values (see
+        :func:`array_mutables`), so that large grids may be compared without
+        converting them to tuples.
+
+        Examples
+        --------
+        >>> ex = ExampleCoords()
+        >>> m0 = ex.return_mutables()
+        >>> ex.st[0, 0] = 1.0
+        >>> m0 == ex.return_mutables()
+        False
+        >>> ex.set(0, 0, "st", 0.0)
+        >>> m0 == ex.return_mutables()
+        True
+        """
+        return tuple([array_mutables(getattr(self, state)) for state in self.states])
 
     def copy(self):
         """
@@ -858,12 +1056,64 @@ class Coords(BaseObject):
         True
         >>> id(ex.st) == id(cop.st)
         False
+
+        Since features, collections, and the grid are read-only, they are shared with
+        the copy rather than rebuilt:
+
+        >>> id(ex.v) == id(cop.v)
+        True
+
+        The spatial indexes (see get_spatial_index) are also shared on purpose, since
+        they are only built over these read-only features/collections, so an index
+        built by either object may be used by the other. The copy keeps the current
+        state of the rng (rather than re-seeding it):
+
+        >>> _ = ex.r.rng.random()
+        >>> ex.copy().r.rng.random() == ex.r.rng.random()
+        True
         """
-        cop = self.__class__(*self._args, **self._kwargs)
+        cop = copy.copy(self)
+        cop.r = self.r.copy()
+        cop.track = copy.deepcopy(self.track)
+        cop.states = {**self.states}
+        cop.properties = {**self.properties}
+        cop._kwargs = {**self._kwargs}
         for state in self.states:
             setattr(cop, state, np.copy(getattr(self, state)))
+        if hasattr(self, 'h'):
+            cop.h = self.h.copy()
         return cop
 
+    def get_snapshot_roles(self):
+        """Extend BaseObject to include state arrays in snapshots."""
+        return {**super().get_snapshot_roles(),
+                **{state: getattr(self, state) for state in self.states}}
+
+    def init_array_hist(self, hist, att, val, timerange, track):
+        """
+        Extend BaseObject to track states sparsely (if sparse_hist is True).
+
+        Examples
+        --------
+        >>> class SparseCoords(ExampleCoords):
+        ...     sparse_hist = True
+        >>> ex = SparseCoords()
+        >>> h = ex.create_hist([0, 1, 2])
+        >>> h.st
+        SparseHist(shape=(3, 10, 10), keyframes=1, changes=0)
+        >>> ex.set(10.0, 10.0, "st", 1.0)
+        >>> h.log(ex, 1)
+        >>> h.st.changes
+        {1: (array([11]), array([1.]))}
+        >>> ex.assign_from(h, 0)
+        >>> ex.get(10.0, 10.0, "st")
+        0.0
+        """
+        if self.sparse_hist and att in self.states:
+            hist[att] = SparseHist(val, len(timerange), self.keyframe_interval)
+        else:
+            super().init_array_hist(hist, att, val, timerange, track)
+
     def get_all_possible_track(self):
         """Extend BaseObject to include states in tracking."""
         return BaseObject.get_all_possible_track(self) + [*self.states]
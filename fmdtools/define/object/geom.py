@@ -38,6 +38,7 @@ from fmdtools.define.container.state import State
 from fmdtools.analyze.common import setup_plot, consolidate_legend
 
 from shapely import LineString, Point, Polygon
+import shapely
 from shapely.ops import nearest_points
 from typing import ClassVar
 from recordclass import astuple
@@ -75,8 +76,37 @@ class Geom(BaseObject):
         self.init_role_dict("buffer")
         for buffer, rad in self.buffers.items():
             setattr(self, buffer, self.shape.buffer(rad))
+        for bname in ['shape', *self.buffers]:
+            shapely.prepare(getattr(self, bname))
         self.init_track(track=track)
 
+    def get_prepared(self, buffername='shape'):
+        """
+        Get the shape/buffer 'buffername' as a prepared shapely geometry.
+
+        Shapes and buffers are defined by the (immutable) parameter, so they are
+        prepared once at instantiation. Since prepared geometries are not kept when
+        pickled, this re-prepares the geometry if needed (which is otherwise a no-op).
+
+        Parameters
+        ----------
+        buffername : str
+            Name of buffer property. Default is 'shape'.
+
+        Returns
+        -------
+        buffer : shapely.Geometry
+            Prepared shape/buffer.
+
+        Examples
+        --------
+        >>> shapely.is_prepared(ExPoint().get_prepared('on'))
+        True
+        """
+        buffer = getattr(self, buffername)
+        shapely.prepare(buffer)
+        return buffer
+
     def at(self, pt, buffername='shape'):
         """
         Determine whether the point x, y is within the buffer 'buffername'.
@@ -96,6 +126,33 @@ class Geom(BaseObject):
         buffer = getattr(self, buffername)
         return buffer.covers(Point(*pt))
 
+    def at_many(self, pts, buffername='shape'):
+        """
+        Determine whether each of the points in pts is within the buffer 'buffername'.
+
+        Parameters
+        ----------
+        pts : array-like
+            Array of points [[x1, y1], [x2, y2], ...] (z-coordinates are ignored).
+        buffername : str
+            Name of buffer property
+
+        Returns
+        -------
+        at : np.array
+            Boolean array of whether each point is within the buffer.
+
+        Examples
+        --------
+        >>> exp = ExPoint()
+        >>> exp.at_many([[1.0, 1.0], [0.0, 0.0], [1.0, 0.1]], "on")
+        array([ True, False,  True])
+        """
+        pts = np.atleast_2d(np.asarray(pts, dtype=float))
+        buffer = self.get_prepared(buffername)
+        # for a point, intersecting the buffer is the same as being covered by it
+        return shapely.intersects_xy(buffer, pts[:, 0], pts[:, 1])
+
     def all_at(self, *pt):
         """
         Find all geom attributes (shape, buffers, etc.) containing the point.
@@ -127,6 +184,30 @@ class Geom(BaseObject):
                 all_at.append(bname)
         return all_at
 
+    def all_at_many(self, pts):
+        """
+        Find all geom attributes (shape, buffers, etc.) containing each point in pts.
+
+        Parameters
+        ----------
+        pts : array-like
+            Array of points [[x1, y1], [x2, y2], ...] (z-coordinates are ignored).
+
+        Returns
+        -------
+        all_at : list
+            List of buffer/shape names containing each point (see Geom.all_at).
+
+        Examples
+        --------
+        >>> exp = ExPoint()
+        >>> exp.all_at_many([[1.0, 1.0], [1.0, 0.1], [0.0, 0.0]])
+        [['shape', 'on'], ['on'], []]
+        """
+        buffernames = ['shape', *self.buffers]
+        ats = np.array([self.at_many(pts, bname) for bname in buffernames])
+        return [[b for b, at in zip(buffernames, pt_ats) if at] for pt_ats in ats.T]
+
     def copy(self, *args, **kwargs):
         """Copy the Geom with given *args and **kwargs."""
         cop = self.__class__(*args, **kwargs)
@@ -10,6 +10,8 @@ Main Methods:
 - :func:`single_faults()`: Creates and propagates a list of failure scenarios in a model
   over given model times.
 - :func:`fault_sample`: Injects and propagates faults defined by a FaultSample.
+- :func:`fault_sample_adaptive`: Injects and propagates faults at times adaptively
+  sampled where the outcomes of the faults change.
 - :func:`parameter_sample`: Simulates a model over a range of parameters defined by a
   ParameterSample
 - :func:`nested_sample`: Injects and propagates faults in the model defined by a
@@ -21,6 +23,11 @@ Shared Method Parameters:
 - :data:`run_kwargs`: Run keyword arguments.
 - :data:`mult_kwargs`: Multi-scenario keyword arguments
 
+Classes:
+
+- :class:`ModelPool`: Process pool which loads the model in each worker once.
+- :class:`ResultCache`: On-disk cache of the results/histories of simulated scenarios.
+
 Private Methods:
 
 - :func:`list_init_faults()`: Creates a list of single-fault scenarios for the graph,
@@ -28,13 +35,30 @@ Private Methods:
 - :func:`prop_one_scen()`: Runs a fault scenario in the model over time
 - :func:`save_helper()`: Helper function for inline results saving.
 - :func:`unpack _res_list()`: Helper function for unpacking results
+- :func:`init_stores`: Helper function for creating ResultStores to stream results to
+- :func:`return_helper`: Helper function for saving/returning results
 - :func:`exec_nom_par`: Helper function for executing nominal scenarios in parallel
 - :func:`exec_nom_helper`: Helper function for executing nominal scenarios
+- :func:`batch_helper`: Helper function for executing nominal scenarios as a batch
+- :func:`unbatch_result`: Helper function for getting scenario results from a batch
+- :func:`is_batch_ambiguous`: Helper function for checking if a value in a batch result
+  may or may not be batched
+- :func:`same_values`: Helper function for comparing batched and non-batched results
 - :func:`nom_helper`: Helper function for initial run of nominal scenario
 - :func:`scenlist_helper`: Helper function for `approach`
+- :func:`outcomes_differ`: Helper function for `fault_sample_adaptive` to compare
+  the outcomes of neighboring sample times.
+- :func:`restore_helper`: Helper function for restoring a model to a staged snapshot
 - :func:`exec_scen_par`:  Helper function for executing the scenario in parallel
+- :func:`init_worker`: Initializer for the workers of a ModelPool
+- :func:`load_worker`: Helper function for loading the model in a ModelPool worker
+- :func:`exec_scen_worker`: Helper function for executing a scenario in a ModelPool
+- :func:`exec_nom_worker`: Helper function for executing a nominal scenario in a
+  ModelPool
 - :func:`exec_scen`: Executes a scenario and generates results and classifications given
   a model and nominal model history
+- :func:`share_helper`: Helper function for sharing the values of fault scenario
+  histories with the nominal history (when share_nominal=True)
 - :func:`check_hist_memory`: Checks if the memory will be exhausted given the size of
   the mdlhist and number of scenarios
 - :func:`check_mdl_memory`: Raises exception if model size is too large.
@@ -44,6 +68,15 @@ Private Methods:
 - :func:`get_result`: Helper function for `prop_one_scen` to get result at specific
   timestep.
 - :func:`get_endclass_vars`: Helper function for `get_result`
+- :func:`get_state_hash`: Helper function for `prop_one_scen` to compare the state of
+  the model with the nominal state
+- :func:`state_repr`: Helper function for `get_state_hash`
+- :func:`splice_nominal`: Helper function for `prop_one_scen` to splice the nominal
+  run into a reconverged scenario
+- :func:`get_code_sources`: Helper function for getting the code of a model (for
+  `ResultCache`)
+- :func:`canonical_repr`: Helper function for representing dicts/sets consistently
+  (for `ResultCache`)
 
 Copyright © 2024, United States Government, as represented by the Administrator
 of the National Aeronautics and Space Administration. All rights reserved.
@@ -60,16 +93,27 @@ specific language governing permissions and limitations under the License.
 """
 
 from fmdtools.define.base import get_var, t_key
-from fmdtools.sim.sample import SampleApproach
+from fmdtools.sim.sample import SampleApproach, calc_nearest_weights
 from fmdtools.sim.scenario import Sequence, Scenario, SingleFaultScenario
-from fmdtools.analyze.result import Result, create_indiv_filename, file_check
+from fmdtools.sim.scenario import create_scenname
+from fmdtools.analyze.common import is_numeric
+from fmdtools.analyze.result import Result, ResultStore, create_indiv_filename
+from fmdtools.analyze.result import file_check
 from fmdtools.analyze.history import History
 from fmdtools.analyze.phases import from_hist
+from fmdtools.define.container.parameter import batch_params, BatchArray
 
 import numpy as np
+import multiprocessing
 import copy
 import tqdm
 import os
+import time
+import shutil
+import hashlib
+import inspect
+import sys
+from recordclass import asdict
 
 # DEFAULT ARGUMENTS
 sim_kwargs = {'desired_result': 'endclass',
@@ -77,7 +121,9 @@ sim_kwargs = {'desired_result': 'endclass',
               'cut_hist': True,
               'run_stochastic': False,
               'use_end_condition': True,
-              'warn_faults': True}
+              'warn_faults': True,
+              'cache': False,
+              'reconverge': False}
 """
 Simulation keyword arguments.
 
@@ -107,11 +153,23 @@ run_stochastic : bool
     Can set as 'track_pdf' to calculate/track the probability densities of random
     states over time.
 staged : bool, optional
-    Whether to inject the faults in a copy of the nominal model at the fault time
-    (True) or instantiate a new model for the fault (False). Setting to True
-    roughly halves execution time. The default is False.
+    Whether to inject the faults in the nominal model (restored from a snapshot) at
+    the fault time (True) or instantiate a new model for the fault (False). Setting
+    to True roughly halves execution time. The default is False.
 warn_faults : bool
     Whether to produce a warning when faults occur in a nominal sim.
+cache : ResultCache/bool
+    :class:`ResultCache` to load the result/history of each (non-staged-nominal)
+    scenario from if it has been simulated before (and save it to if not).
+    Note that, when a scenario is loaded from the cache, the model is not simulated,
+    so its state is not updated. Default is False, which does not use a cache.
+reconverge : bool
+    Whether to end fault scenarios early when the state of the model (see
+    Simulable.return_mutables) becomes the same as the nominal state at the same time
+    (after all injections), in which case the rest of the nominal history and the
+    final nominal state are spliced into the scenario. Only used for scenarios
+    simulated with the states of the nominal run (e.g., in fault_sample) and not used
+    with time-specific (or 'all') desired_results or end conditions. Default is False.
 """
 
 
@@ -171,7 +229,9 @@ def pack_run_kwargs(**kwargs):
 mult_kwargs = {'max_mem': 2e9,
                'showprogress': True,
                'pool': False,
-               'close_pool': True}
+               'close_pool': True,
+               'stream': False,
+               'share_nominal': False}
 
 
 """
@@ -183,11 +243,27 @@ Parameters
         Process Pool Object from multiprocessing or pathos packages.
         e.g. parallelpool = mp.pool(n) for n cores (multiprocessing)
         or parallelpool = ProcessPool(nodes=n) for n cores (pathos)
+        May also be a :class:`ModelPool`, which sends the model to each worker once
+        (rather than with every scenario).
         If False, the set of scenarios is run serially. The default is False
     showprogress: bool, optional
         whether to show a progress bar during execution. default is true
     max_mem : int
         Max memory (warns the user when memory is above threshold)
+    stream : str/dict, optional
+        Folder to write the result and history of each scenario to as it completes
+        (see :func:`init_stores`), rather than holding them in memory. May also be a
+        dict of arguments {'folder': folder, 'overwrite': overwrite}. If given, the
+        ResultStores of the results/histories are returned instead of the
+        Result/History, and only individual saving (save_args with 'indiv': True)
+        is supported. The default is False.
+    share_nominal : bool, optional
+        Whether to store fault scenario histories sparsely, with the values that are
+        the same as in the nominal history shared with it by reference (see
+        :meth:`History.share_nominal`). In this case, max_mem is checked against the
+        memory of the unshared values as the scenarios complete, rather than the
+        size of the nominal history times the number of scenarios. The default is
+        False.
 """
 
 
@@ -200,6 +276,313 @@ def unpack_mult_kwargs(kwargs):
     """Unpack the mult kwarg parameters for the :func:`parameter_sample`."""
     return (kwargs.pop(k, v) for k, v in mult_kwargs.items())
 
+
+class ModelPool(object):
+    """
+    Process pool which loads the model (and staged snapshots) into each worker once.
+
+    When a process pool is given to :func:`fault_sample` etc., the model and
+    simulation kwargs (including the nominal history) are pickled along with every
+    scenario. A ModelPool instead sends these to each of its workers when loaded, so
+    that only the Scenario objects are sent to the workers, in chunks. Workers are
+    started on the first load and kept until the pool is closed, so that they are
+    reused by later loads (e.g., for the inner samples of :func:`nested_sample`).
+
+    Attributes
+    ----------
+    processes : int
+        Number of worker processes. Default is os.cpu_count().
+    chunksize : int
+        Number of scenarios to send to a worker at once. Default is None, which
+        splits the scenarios into ~4 chunks per worker.
+    pool_class : callable
+        Pool constructor with arguments (processes, initializer, initargs), e.g.
+        multiprocessing.Pool (default) or multiprocess.Pool.
+    barrier_class : callable
+        Barrier constructor used to send the model to every worker when loaded, e.g.
+        multiprocessing.Barrier (default) or multiprocess.Barrier.
+    pool : Pool
+        Currently-started pool (False if not started).
+
+    Examples
+    --------
+    >>> mp = ModelPool(2)
+    >>> mp
+    ModelPool(processes=2, loaded=False)
+    >>> mp.get_chunksize(100)
+    13
+    """
+
+    def __init__(self, processes=None, chunksize=None, pool_class=multiprocessing.Pool,
+                 barrier_class=multiprocessing.Barrier):
+        self.processes = processes or os.cpu_count()
+        self.chunksize = chunksize
+        self.pool_class = pool_class
+        self.barrier_class = barrier_class
+        self.pool = False
+
+    def __repr__(self):
+        return ("ModelPool(processes=" + str(self.processes)
+                + ", loaded=" + str(bool(self.pool)) + ")")
+
+    def load(self, mdl, snapshots={}, kwargs={}):
+        """
+        Load the given model, snapshots, and kwargs into each worker.
+
+        Workers are started if not already running. Each worker is sent one load
+        task, and waits for the others to receive theirs, so that every worker has
+        the same model loaded.
+
+        Parameters
+        ----------
+        mdl : Simulable
+            Model to simulate in each worker.
+        snapshots : dict, optional
+            Snapshots of the nominal model for staged execution {time: snapshot}.
+            The default is {}.
+        kwargs : dict, optional
+            kwargs to use in the simulation of each scenario. The default is {}.
+        """
+        if not self.pool:
+            barrier = self.barrier_class(self.processes)
+            self.pool = self.pool_class(self.processes,
+                                        initializer=init_worker,
+                                        initargs=(barrier,))
+        self.pool.map(load_worker, [(mdl, snapshots, kwargs)] * self.processes,
+                      chunksize=1)
+
+    def get_chunksize(self, num):
+        """Get the number of scenarios to send to each worker at once."""
+        if self.chunksize:
+            return self.chunksize
+        chunksize, extra = divmod(num, self.processes * 4)
+        return max(chunksize + bool(extra), 1)
+
+    def imap(self, func, inputs):
+        """Map the function over the inputs (in chunks) in the loaded pool."""
+        if not self.pool:
+            raise Exception("ModelPool must be loaded prior to use")
+        return self.pool.imap(func, inputs, chunksize=self.get_chunksize(len(inputs)))
+
+    def close(self):
+        """Close the workers (if loaded)."""
+        if self.pool:
+            self.pool.close()
+
+    def terminate(self):
+        """Terminate the workers (if loaded)."""
+        if self.pool:
+            self.pool.terminate()
+
+    def join(self):
+        """Join the workers (if loaded) and reset the pool."""
+        if self.pool:
+            self.pool.join()
+            self.pool = False
+
+
+class ResultCache(object):
+    """
+    On-disk cache of the results/histories of simulated scenarios.
+
+    Entries are keyed by a hash of the code of the model (and its roles), its
+    parameters (p, sp, r.seed, track), the scenario (excluding its name), and the
+    simulation kwargs, so that a cached entry is only used when simulating the
+    scenario again would give the same result. Changing the model code (or the
+    modules it is defined in) thus invalidates its entries, which are evicted
+    (least-recently-used first) when the cache exceeds max_size. The state of the
+    cache is kept on disk, so it may be copied or sent to parallel workers.
+
+    Entries are loaded without unpickling (see
+    :func:`fmdtools.analyze.result.load_cols`), so results/histories with object
+    values (e.g., dicts or sets) are not cached.
+
+    Use by passing to the propagate methods via the `cache` kwarg, e.g.,::
+
+        cache = ResultCache("sim_cache")
+        res, hist = fault_sample(mdl, fs, cache=cache)
+
+    Attributes
+    ----------
+    folder : str
+        Folder to save the entries in.
+    max_size : float
+        Maximum size of the cache (in bytes). The default is 1e9.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> cache = ResultCache(tempfile.mkdtemp() + "/cache", max_size=1e6)
+    >>> cache.save('a1', Result(cost=1.0), History(x=np.array([1.0])), 1.0)
+    >>> cache
+    ResultCache(entries=1, max_size=1000000.0)
+    >>> res, hist, _, t_end = cache.load('a1')
+    >>> res
+    cost:                                1.0
+    >>> hist.x
+    array([1.])
+    >>> cache.load('b2') is None
+    True
+    >>> cache.save('c3', Result(faults={'a': 1}), History(), 1.0)
+    >>> cache.load('c3') is None
+    True
+    >>> cache.invalidate('a1')
+    >>> len(cache)
+    0
+    """
+
+    def __init__(self, folder, max_size=1e9):
+        self.folder = folder
+        self.max_size = max_size
+        os.makedirs(folder, exist_ok=True)
+
+    def __repr__(self):
+        return ("ResultCache(entries=" + str(len(self))
+                + ", max_size=" + str(self.max_size) + ")")
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __bool__(self):
+        # an empty cache is still a cache (e.g., for `if cache:` checks)
+        return True
+
+    def keys(self):
+        """Get the keys of the entries in the cache."""
+        return [k for k in os.listdir(self.folder) if '.' not in k]
+
+    def get_key(self, mdl, scen, **kwargs):
+        """
+        Get the key for the simulation of a given scenario in a given model.
+
+        Parameters
+        ----------
+        mdl : Simulable
+            Model to simulate.
+        scen : Scenario
+            Scenario to simulate.
+        **kwargs : kwargs
+            :data:`sim_kwargs` for the simulation.
+
+        Returns
+        -------
+        key : str
+            Hex digest of the hash of the model code/parameters, scenario, and kwargs.
+        """
+        sim_kwarg = {k: v for k, v in pack_sim_kwargs(**kwargs).items()
+                     if k not in ['cache', 'warn_faults']}
+        scen_dict = {k: v for k, v in asdict(scen).items() if k != 'name'}
+        sources = get_code_sources(mdl)
+        # time is reset at the start of the simulation, so is not part of the key
+        params = {k: v for k, v in mdl.new_params().items() if k != 't'}
+        keystr = "\n".join([canonical_repr(sources),
+                            canonical_repr(params),
+                            scen.__class__.__name__,
+                            canonical_repr(scen_dict),
+                            canonical_repr(sim_kwarg)])
+        return hashlib.sha256(keystr.encode('utf8')).hexdigest()
+
+    def get_entryname(self, key):
+        """Get the folder name of the entry with the given key."""
+        return self.folder + "/" + key
+
+    def load(self, key):
+        """
+        Load the entry with the given key (if in the cache).
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry (see :meth:`ResultCache.get_key`)
+
+        Returns
+        -------
+        outs : tuple/None
+            (result, mdlhist, c_mdl, t_end) outputs of :func:`prop_one_scen` for the
+            scenario, or None if the entry is not in the cache.
+        """
+        entryname = self.get_entryname(key)
+        if not os.path.exists(entryname):
+            return None
+        try:
+            res = Result.load(entryname + "/res.cols", renest_dict=True)
+            hist = History.load(entryname + "/hist.cols", renest_dict=True)
+            os.utime(entryname)
+        except Exception:
+            # entry may have been removed (e.g., by another process) while loading
+            return None
+        if 'result' not in res:
+            res['result'] = Result()
+        return res['result'], hist, {}, res['t_end']
+
+    def save(self, key, result, mdlhist, t_end):
+        """
+        Save the result/history of a simulation to the cache with the given key.
+
+        Results/histories with object values are not saved, since they could only be
+        loaded by unpickling them. Entries are written to a temporary folder and then
+        moved into place, so that a partially-written entry is never loaded.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry (see :meth:`ResultCache.get_key`)
+        result : Result
+            Result from the simulation.
+        mdlhist : History
+            History from the simulation.
+        t_end : float
+            End time of the simulation.
+        """
+        for val in [*result.flatten().values(), *mdlhist.flatten().values()]:
+            if np.asarray(val).dtype.hasobject:
+                return
+        entryname = self.get_entryname(key)
+        tempname = entryname + "." + str(os.getpid()) + ".tmp"
+        os.makedirs(tempname)
+        Result(result=result, t_end=t_end).save(tempname + "/res.cols")
+        mdlhist.save(tempname + "/hist.cols")
+        try:
+            os.rename(tempname, entryname)
+        except OSError:
+            # entry already saved (e.g., by another process)
+            shutil.rmtree(tempname, ignore_errors=True)
+        self.evict()
+
+    def get_entry_size(self, key):
+        """Get the size of the entry with the given key (in bytes)."""
+        size = 0
+        for path, _, files in os.walk(self.get_entryname(key)):
+            size += sum([os.path.getsize(path + "/" + f) for f in files])
+        return size
+
+    def evict(self):
+        """Remove the least-recently-used entries until the cache is under max_size."""
+        entries = {}
+        for key in self.keys():
+            try:
+                entries[key] = (os.path.getmtime(self.get_entryname(key)),
+                                self.get_entry_size(key))
+            except OSError:
+                continue
+        size = sum([e[1] for e in entries.values()])
+        for key in sorted(entries, key=lambda k: entries[k][0]):
+            if size <= self.max_size:
+                break
+            self.invalidate(key)
+            size -= entries[key][1]
+
+    def invalidate(self, *keys):
+        """Remove the entries with the given keys (or all entries if none given)."""
+        if not keys:
+            keys = self.keys()
+        for key in keys:
+            shutil.rmtree(self.get_entryname(key), ignore_errors=True)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        self.invalidate()
+
 # FAULT PROPAGATION
 
 
@@ -283,7 +666,7 @@ def save_helper(save_args, endclass, mdlhist, indiv_id='', result_id=''):
             endclass.save(**save_args['endclass'])
 
 
-def parameter_sample(mdl, ps, **kwargs):
+def parameter_sample(mdl, ps, batch=False, **kwargs):
     """
     Simulate a set of nominal scenarios through a model.
 
@@ -296,6 +679,10 @@ def parameter_sample(mdl, ps, **kwargs):
         Model to simulate
     ps: ParameterSample
         Parameter Sample defining the nominal scenarios to run the system over.
+    batch : bool
+        Whether to simulate the scenarios as a single batch, with array-valued
+        parameters and states (see :func:`batch_helper`). Requires a batch-safe model.
+        The default is False.
     **kwargs : kwargs
         Additional keyword arguments, may include:
 
@@ -315,42 +702,141 @@ def parameter_sample(mdl, ps, **kwargs):
     """
     kwargs.update(pack_run_kwargs(**kwargs))
     check_overwrite(kwargs['save_args'])
-    kwargs['max_mem'], showprogress, pool, close_p = unpack_mult_kwargs(kwargs)
+    mult = unpack_mult_kwargs(kwargs)
+    kwargs['max_mem'], showprogress, pool, close_p, stream, _ = mult
     num_scens = ps.num_scenarios()
     kwargs['num_scens'] = num_scens
-
-    if pool:
+    if stream:
+        # histories are not held in memory when streamed
+        kwargs['max_mem'] = np.inf
+        n_results, n_mdlhists = init_stores(stream, kwargs['save_args'])
+    else:
+        n_results, n_mdlhists = Result(), History()
+
+    if batch:
+        b_results, b_mdlhists = batch_helper(mdl, ps, **kwargs)
+        for scenname in b_results:
+            n_results[scenname] = b_results[scenname]
+            n_mdlhists[scenname] = b_mdlhists[scenname]
+    elif isinstance(pool, ModelPool):
+        pool.load(mdl, kwargs=kwargs)
+        inputs = [*ps.named_scenarios().items()]
+        res_list = tqdm.tqdm(pool.imap(exec_nom_worker, inputs),
+                             total=len(inputs),
+                             disable=not (showprogress),
+                             desc="SCENARIOS COMPLETE")
+        unpack_res_list(ps.scenarios(), res_list, n_results, n_mdlhists)
+    elif pool:
         check_mdl_memory(mdl, num_scens, max_mem=kwargs['max_mem'])
         inputs = [(mdl, sc, name, kwargs) for name, sc in ps.named_scenarios().items()]
-        res_list = list(tqdm.tqdm(pool.imap(exec_nom_par, inputs),
-                                  total=len(inputs),
-                                  disable=not (showprogress),
-                                  desc="SCENARIOS COMPLETE"))
-        n_results, n_mdlhists = unpack_res_list(ps.scenarios(), res_list)
+        res_list = tqdm.tqdm(pool.imap(exec_nom_par, inputs),
+                             total=len(inputs),
+                             disable=not (showprogress),
+                             desc="SCENARIOS COMPLETE")
+        unpack_res_list(ps.scenarios(), res_list, n_results, n_mdlhists)
     else:
-        scennames = ps.scen_names()
-        n_results = Result.fromkeys(scennames)
-        n_mdlhists = History.fromkeys(scennames)
         for scenname, scen in tqdm.tqdm(ps.named_scenarios().items(),
                                         disable=not (showprogress),
                                         desc="SCENARIOS COMPLETE"):
             loc_kwargs = {**kwargs, 'use_end_condition': False}
             res, hist = exec_nom_helper(mdl, scen, scenname, **loc_kwargs)
             n_results[scenname], n_mdlhists[scenname] = res, hist
-    save_helper(kwargs['save_args'], n_results, n_mdlhists)
     close_pool({'pool': pool, 'close_pool': close_p})
-    return n_results.flatten(), n_mdlhists.flatten()
+    return return_helper(kwargs['save_args'], n_results, n_mdlhists)
 
 
-def unpack_res_list(scenlist, res_list):
-    """Create result/history from output list."""
-    results = Result()
-    mdlhists = History()
-    results.data = {scen.name: res_list[i][0] for i, scen in enumerate(scenlist)}
-    mdlhists.data = {scen.name: res_list[i][1] for i, scen in enumerate(scenlist)}
+def unpack_res_list(scenlist, res_list, results=False, mdlhists=False, share=False):
+    """Create result/history (or add to the given results/mdlhists) from outputs."""
+    if results is False:
+        results = Result()
+    if mdlhists is False:
+        mdlhists = History()
+    for scen, res in zip(scenlist, res_list):
+        share_helper(share, res[1])
+        results[scen.name], mdlhists[scen.name] = res[0], res[1]
+    return results, mdlhists
+
+
+def share_helper(share, mdlhist):
+    """
+    Share the values of mdlhist that are the same as the nominal (helper function).
+
+    Parameters
+    ----------
+    share : dict/False
+        Dict with structure {'nomhist': nomhist, 'max_mem': max_mem, 'mem': mem},
+        where mem is the running memory of the unshared values over the scenarios.
+        If False, the history is left as-is.
+    mdlhist : History
+        Fault scenario history to share values with the nominal.
+    """
+    if share:
+        share['mem'] += mdlhist.share_nominal(share['nomhist'])
+        if share['mem'] > share['max_mem']:
+            raise Exception("Model histories are too large: " + str(share['mem'])
+                            + " > " + str(share['max_mem']) + ". To avoid, use the"
+                            + " track= option to track less information in the"
+                            + " mdlhist, or stream= to write histories to disk.")
+
+
+def init_stores(stream, save_args={}):
+    """
+    Create new ResultStores to stream results/histories to (see :data:`mult_kwargs`).
+
+    Parameters
+    ----------
+    stream : str/dict/tuple
+        Folder to create the stores in, or dict with structure
+        {'folder': folder, 'overwrite': overwrite}. May also be a tuple of existing
+        (results, mdlhists) ResultStores to write to (e.g., views with a prefix).
+    save_args : dict
+        save_args given to the simulation (see :func:`save_helper`). Since streamed
+        results are never held in memory together, only individual saving
+        ({'indiv': True}) is supported. The default is {}.
+
+    Returns
+    -------
+    results : ResultStore
+        Store of Results in folder/result
+    mdlhists : ResultStore
+        Store of Histories in folder/hist
+
+    Examples
+    --------
+    >>> init_stores("folder", save_args={'endclass': {'filename': 'res.npz'}})
+    Traceback (most recent call last):
+      ...
+    Exception: Only individual saving ('indiv': True) supported with stream
+    """
+    if {*save_args} - {'indiv'} and not save_args.get('indiv', False):
+        raise Exception("Only individual saving ('indiv': True) supported with stream")
+    if isinstance(stream, tuple):
+        return stream
+    if isinstance(stream, str):
+        stream = {'folder': stream}
+    folder = stream['folder']
+    overwrite = stream.get('overwrite', False)
+    # stores are written by the simulation itself, so object values are loaded
+    results = ResultStore(folder + "/result", Result, new=True, overwrite=overwrite,
+                          allow_pickle=True)
+    mdlhists = ResultStore(folder + "/hist", History, new=True, overwrite=overwrite,
+                           allow_pickle=True)
     return results, mdlhists
 
 
+def return_helper(save_args, results, mdlhists):
+    """
+    Save and flatten the results/histories.
+
+    Results/histories streamed to ResultStores are returned as-is, since they have
+    already been saved (individually) as they were simulated.
+    """
+    if isinstance(results, ResultStore):
+        return results, mdlhists
+    save_helper(save_args, results, mdlhists)
+    return results.flatten(), mdlhists.flatten()
+
+
 def exec_nom_par(arg):
     """Execute a nominal scenario (helper function/interface for parallel pools)."""
     endclass, mdlhist = exec_nom_helper(arg[0], arg[1], arg[2],
@@ -367,6 +853,174 @@ def exec_nom_helper(mdl, scen, name, **kwargs):
     return result, mdlhist
 
 
+def batch_helper(mdl, ps, **kwargs):
+    """
+    Simulate the scenarios of a ParameterSample as a single batch (helper function).
+
+    Instead of instantiating a model for each scenario, a single model is instantiated
+    with a batched Parameter (see :func:`batch_params`) with array-valued fields where
+    the scenarios differ. Behaviors are then run once per timestep for all scenarios,
+    with states (and the model history) holding a value for each scenario.
+
+    Requires that every function in the model is batch-safe (see
+    Simulable.is_batch_safe), i.e., its behaviors hold for array-valued parameters and
+    states. Stochastic simulation, end conditions (use_end_condition=True), and
+    results at specific times are not supported.
+
+    Parameters
+    ----------
+    mdl : Simulable
+        Model to simulate
+    ps : ParameterSample
+        Parameter Sample defining the nominal scenarios to run the system over.
+    **kwargs : kwargs
+        Additional keyword arguments (see :func:`parameter_sample`)
+
+    Returns
+    -------
+    results : Result
+        Result dict of result corresponding to desired result {'scenname': result}
+    mdlhists : History
+        History of model histories, with structure {'scenname': mdlhist}
+    """
+    if not mdl.is_batch_safe():
+        raise Exception("Model " + mdl.name + " must be batch-safe for batch=True")
+    if kwargs.get('run_stochastic', False):
+        raise Exception("Stochastic simulation not supported for batch=True")
+    if kwargs.get('use_end_condition', False):
+        # scenarios in the batch may end at different times
+        raise Exception("use_end_condition=True not supported for batch=True")
+    desired_result = kwargs.get('desired_result', sim_kwargs['desired_result'])
+    if type(desired_result) is dict and not all([type(k) is str
+                                                 for k in desired_result]):
+        raise Exception("Results at specific times not supported for batch=True")
+    scens = ps.scenarios()
+    if any([scen.sp != scens[0].sp for scen in scens]):
+        raise Exception("Scenarios must have the same sp for batch=True")
+    num = len(scens)
+
+    mdl_kwargs = mdl.new_params(sp=scens[0].sp)
+    if hasattr(mdl, 'p'):
+        mdl_kwargs['p'] = batch_params(*[mdl.p.copy_with_vals(**scen.p)
+                                         for scen in scens])
+    mdl_batch = mdl.__class__(name=mdl.name, **mdl_kwargs)
+    mdl_batch.h = mdl_batch.h.init_batch(num)
+    loc_kwargs = {**kwargs, 'use_end_condition': False, 'desired_result': {}}
+    _, batch_hist, _, t_end = prop_one_scen(mdl_batch, scens[0], **loc_kwargs)
+
+    results = Result()
+    mdlhists = History()
+    ref_result = None
+    for i, hist in enumerate(batch_hist.split_batch(num)):
+        scen = scens[i]
+        mdl_batch.h = hist
+        result = get_result(scen, mdl_batch, desired_result, time=t_end)
+        if i == 0 and any([is_batch_ambiguous(v, num)
+                           for v in result.flatten().values()]):
+            # arrays which may or may not be batched are checked against the result
+            # of simulating the first scenario without batching
+            mdl_ref = mdl.new(p=scen.p, sp=scen.sp, r=scen.r)
+            ref_kwargs = {**kwargs, 'use_end_condition': False,
+                          'desired_result': desired_result}
+            ref_result, _, _, _ = prop_one_scen(mdl_ref, scen, **ref_kwargs)
+        results[scen.name] = unbatch_result(result, i, num, ref_result)
+        mdlhists[scen.name] = hist
+        check_hist_memory(hist, num, max_mem=kwargs['max_mem'])
+        save_helper(kwargs['save_args'], results[scen.name], hist, scen.name,
+                    scen.name)
+    return results, mdlhists
+
+
+def is_batch_ambiguous(value, num):
+    """Check if a value in a batch result may or may not be batched."""
+    return (isinstance(value, np.ndarray) and not isinstance(value, BatchArray)
+            and value.ndim > 0 and value.shape[0] == num)
+
+
+def unbatch_result(result, ind, num, ref_result=None):
+    """
+    Get the result for the scenario at index ind from a result of a batch.
+
+    Values which are BatchArrays (i.e., computed from the batched parameters) are
+    split along their first (batch) axis. Other arrays with a first axis of size num
+    (e.g., batched values converted with np.where or np.asarray) are split if they
+    differ from the result of the non-batched simulation of the first scenario
+    ref_result, and are otherwise the same for every scenario. Other values are the
+    same for every scenario.
+
+    Parameters
+    ----------
+    result : Result
+        Result of the batch.
+    ind : int
+        Index of the scenario in the batch.
+    num : int
+        Number of scenarios in the batch.
+    ref_result : Result, optional
+        Result of the first scenario simulated without batching. Required if there
+        are arrays with a first axis of size num that are not BatchArrays.
+        The default is None.
+
+    Returns
+    -------
+    unbatched : Result
+        Result of the scenario.
+
+    Examples
+    --------
+    >>> batched = np.array([1.0, 2.0]).view(BatchArray)
+    >>> unbatch_result(Result(a=batched, b=3.0, c=np.array([4.0])), 1, 2)
+    a:                                   2.0
+    b:                                   3.0
+    c:                              array(1)
+
+    Arrays that may be batched are checked against the non-batched result:
+
+    >>> res = Result(c=np.array([4.0, 5.0]), d=np.array([6.0, 7.0]))
+    >>> unbatch_result(res, 1, 2, Result(c=np.array([4.0, 5.0]), d=6.0))
+    c:                              array(2)
+    d:                                   7.0
+    >>> unbatch_result(res, 1, 2)
+    Traceback (most recent call last):
+      ...
+    Exception: Unable to unbatch value c without the non-batched result
+    >>> unbatch_result(res, 1, 2, Result(c=np.array([1.0, 2.0]), d=6.0))
+    Traceback (most recent call last):
+      ...
+    Exception: Unable to unbatch value c: differs from the non-batched result
+    """
+    unbatched = Result()
+    for k, v in result.items():
+        if isinstance(v, (dict, Result)):
+            ref = None if ref_result is None else ref_result[k]
+            unbatched[k] = unbatch_result(v, ind, num, ref)
+        elif isinstance(v, BatchArray) and v.ndim > 0:
+            unbatched[k] = np.asarray(v)[ind]
+        elif is_batch_ambiguous(v, num):
+            if ref_result is None:
+                raise Exception("Unable to unbatch value " + str(k)
+                                + " without the non-batched result")
+            ref = np.asarray(ref_result[k])
+            if ref.shape == v.shape and same_values(ref, v):
+                unbatched[k] = v
+            elif ref.shape == v.shape[1:] and same_values(ref, v[0]):
+                unbatched[k] = v[ind]
+            else:
+                raise Exception("Unable to unbatch value " + str(k)
+                                + ": differs from the non-batched result")
+        else:
+            unbatched[k] = v
+    return unbatched
+
+
+def same_values(arr, arr1):
+    """Check if the values of two arrays of the same shape are (numerically) equal."""
+    try:
+        return np.allclose(arr, arr1, equal_nan=True)
+    except TypeError:
+        return np.array_equal(arr, arr1)
+
+
 def one_fault(mdl, *fxnfault, time=0, **kwargs):
     """
     Run one fault in the model at a specified time.
@@ -471,21 +1125,29 @@ def sequence(mdl, seq={}, faultseq={}, disturbances={}, scen={}, rate=np.nan,
         scen = Scenario(sequence=seq,
                         rate=rate,
                         name='faulty',
+                        time=min(seq),
                         times=tuple([*seq.keys()]))
 
+    nomstates = {}
     n_outs = nom_helper(mdl,
                         [min(scen.sequence)],
+                        nomstates=nomstates,
                         **{**sim_kwarg, 'use_end_condition': False},
                         **run_kwarg)
     nomresult, nomhist, nomscen, mdls, t_end_nom = n_outs
 
-    mdl_f = [*mdls.values()][0]
+    if sim_kwarg['staged']:
+        mdl_f = mdl.new(**run_kwarg['mdl_kwargs'])
+        restore_helper(mdl_f, mdls[min(scen.sequence)], nomhist)
+    else:
+        mdl_f = mdls[0]
 
     result, faulthist, _, t_end = prop_one_scen(mdl_f,
                                                 scen,
                                                 **sim_kwarg,
                                                 nomhist=nomhist,
-                                                nomresult=nomresult)
+                                                nomresult=nomresult,
+                                                nomstates=nomstates)
     if include_nominal:
         nomhist.cut(t_end_nom)
         mdlhists = History(nominal=nomhist, faulty=faulthist)
@@ -494,7 +1156,7 @@ def sequence(mdl, seq={}, faultseq={}, disturbances={}, scen={}, rate=np.nan,
 
 
 def nom_helper(mdl, ctimes, protect=True, save_args={}, mdl_kwargs={}, scen={},
-               warn_faults=True, **kwargs):
+               warn_faults=True, nomstates=None, **kwargs):
     """
     Run initial run of nominal scenario.
 
@@ -527,6 +1189,9 @@ def nom_helper(mdl, ctimes, protect=True, save_args={}, mdl_kwargs={}, scen={},
     warn_faults : bool
         choose whether to display a warning message if faults are identified during
         nominal runs. Default is True.
+    nomstates : dict, optional
+        Dict to record the nominal states to (see the statelog argument of
+        :func:`prop_one_scen`) if reconverge=True. The default is None.
     **kwargs : kwargs
         :data:`sim_kwargs` simulation options for :func:`prop_one_scen`
 
@@ -538,8 +1203,9 @@ def nom_helper(mdl, ctimes, protect=True, save_args={}, mdl_kwargs={}, scen={},
         result history from nominal sim
     nomscen : dict
         nominal scenario dict
-    mdls : list
-        Models from copy time(s) ctimes
+    mdls : dict
+        Snapshots of the model (see Simulable.get_snapshot) at copy time(s) ctimes
+        (if staged), or a new model {0: mdl} to simulate (if not staged)
     t_end_nom : float
         Nominal simulation end time
     """
@@ -565,9 +1231,12 @@ def nom_helper(mdl, ctimes, protect=True, save_args={}, mdl_kwargs={}, scen={},
     else:
         ctimes = []
 
+    if not kwargs.get('reconverge', False):
+        nomstates = None
     result, nommdlhist, mdls, t_end_nom = prop_one_scen(mdl,
                                                         nomscen,
                                                         ctimes=ctimes,
+                                                        statelog=nomstates,
                                                         **kwargs)
 
     endfaults, endfaultprops = mdl.return_faultmodes()
@@ -622,8 +1291,10 @@ def fault_sample(mdl, fs, include_nominal=True, get_phasemap=False, **kwargs):
         A History dictionary with the tracked scenario (including the nominal)
     """
     kwargs.update(pack_run_kwargs(**kwargs))
+    nomstates = {}
     n_outs = nom_helper(mdl,
                         fs.times(),
+                        nomstates=nomstates,
                         **{**kwargs, 'use_end_condition': False})
     nomresult, nomhist, nomscen, c_mdl, t_end_nom = n_outs
     scenlist = fs.scenarios()
@@ -633,13 +1304,13 @@ def fault_sample(mdl, fs, include_nominal=True, get_phasemap=False, **kwargs):
                                         c_mdl,
                                         **kwargs,
                                         nomhist=nomhist,
-                                        nomresult=nomresult)
+                                        nomresult=nomresult,
+                                        nomstates=nomstates)
 
     if include_nominal:
         process_nominal(mdlhists, nomhist, results, nomresult, t_end_nom, **kwargs)
-    save_helper(kwargs['save_args'], results, mdlhists)
     close_pool(kwargs)
-    return results.flatten(), mdlhists.flatten()
+    return return_helper(kwargs['save_args'], results, mdlhists)
 
 
 #  pool=pool, close_pool=False, showprogress=False,
@@ -698,6 +1369,200 @@ def fault_sample_from(mdl, faultdomains={}, faultsamples={}, get_phasemap=True,
     return res, hist, app
 
 
+def fault_sample_adaptive(mdl, fs, *phases_to_sample, init_pts=3, metrics=['cost'],
+                          tol=0.0, max_iter=20, include_nominal=True, **kwargs):
+    """
+    Adaptively sample the times of the faults in a FaultSample/SampleApproach.
+
+    Each fault is first simulated at init_pts times spread over each phase. Then, for
+    each pair of neighboring sampled times where the given metrics differ, the time
+    between them is sampled, until the metrics are the same between all neighbors (or
+    there are no times between them to sample). The nominal model is simulated once,
+    and (if staged=True) the scenarios at each iteration are restored from its
+    snapshots.
+
+    The sampled scenarios are added to the FaultSample(s) with weights corresponding
+    to the fraction of times in the phase nearest to each sampled time (see
+    :func:`fmdtools.sim.sample.calc_nearest_weights`). At each iteration, scenarios
+    are simulated with the rate given by the weights of the current sample. Since
+    adding samples changes the weights of their neighbors, scenarios whose rate
+    changes by the final sample are simulated again with their final rate, so that
+    the results (and any values calculated from the rate in find_classification) are
+    the same as those from :func:`fault_sample` with the resulting FaultSample.
+
+    Parameters
+    ----------
+    mdl : Simulable
+        The model to inject faults in.
+    fs : FaultSample/SampleApproach
+        FaultSample (or SampleApproach with FaultSamples) to add the scenarios to.
+    *phases_to_sample : str
+        Names of phases to sample (see FaultSample.get_phasetimes). If none are
+        provided, all phases are sampled.
+    init_pts : int, optional
+        Number of times to initially sample in each phase (including the first and
+        last time in the phase). The default is 3.
+    metrics : list, optional
+        Values of the results (e.g., 'cost', 'endclass.cost') to compare between
+        neighboring times. The default is ['cost'].
+    tol : float, optional
+        Absolute difference in the (numeric) metrics considered a change in outcome.
+        The default is 0.0.
+    max_iter : int, optional
+        Maximum number of refinement iterations. The default is 20.
+    include_nominal : bool, optional
+        Whether to return nominal hists/results back. Default is True.
+    **kwargs : kwargs
+        Additional keyword arguments (see :func:`fault_sample`).
+
+    Returns
+    -------
+    results : Result
+        A Result dictionary with results desired from each sampled scenario.
+    mdlhists : History
+        A History dictionary with the tracked scenario (including the nominal)
+
+    Examples
+    --------
+    >>> from examples.pump.ex_pump import Pump
+    >>> from fmdtools.sim.sample import FaultDomain, FaultSample
+    >>> mdl = Pump()
+    >>> fd = FaultDomain(mdl)
+    >>> fd.add_fault("move_water", "mech_break")
+    >>> fs = FaultSample(fd)
+    >>> res, hist = fault_sample_adaptive(mdl, fs, "on", metrics=['endclass.cost'],
+    ...                                   tol=1000, showprogress=False)
+
+    Rather than all 45 times in the 'on' phase, only 17 are sampled, with weights
+    based on the times they are nearest to:
+
+    >>> fs.num_scenarios()
+    17
+    >>> [s.time for s in fs.scenarios()][:5]
+    [5.0, 7.0, 10.0, 13.0, 16.0]
+    >>> round(res.expected('endclass.cost'), 4)
+    0.0734
+
+    Since each scenario is simulated with its final rate, values calculated from the
+    rate (here, expected_cost) are the same as in fault_sample:
+
+    >>> res_fs, hist_fs = fault_sample(mdl, fs, showprogress=False)
+    >>> res.get_values('expected_cost') == res_fs.get_values('expected_cost')
+    True
+    """
+    kwargs.update(pack_run_kwargs(**kwargs))
+    if kwargs.get('stream', False):
+        raise Exception("stream not supported for fault_sample_adaptive")
+    if isinstance(fs, SampleApproach):
+        faultsamples = [*fs.faultsamples.values()]
+    else:
+        faultsamples = [fs]
+    # sample state {(faultsample index, fault, phase): (times, {ind: metrics})}
+    samples = {}
+    pending = {}
+    for i, faultsample in enumerate(faultsamples):
+        phasetimes = faultsample.get_phasetimes(*phases_to_sample)
+        for fault in faultsample.faultdomain.faults:
+            for phase, times in phasetimes.items():
+                key = (i, fault, phase)
+                samples[key] = ([*times], {})
+                pts = np.linspace(0, len(times) - 1, max(min(init_pts, len(times)), 1))
+                pending[key] = sorted({int(round(pt)) for pt in pts})
+    all_times = sorted({t for times, _ in samples.values() for t in times})
+    nomstates = {}
+    n_outs = nom_helper(mdl,
+                        all_times,
+                        nomstates=nomstates,
+                        **{**kwargs, 'use_end_condition': False})
+    nomresult, nomhist, nomscen, c_mdl, t_end_nom = n_outs
+
+    def get_scens(key, inds, sampled_inds):
+        # scenarios for inds with weights based on the current sample
+        i, fault, phase = key
+        times = samples[key][0]
+        all_inds = sorted({*sampled_inds, *inds})
+        weights = calc_nearest_weights(all_inds, len(times))
+        weights = [weights[all_inds.index(ind)] for ind in inds]
+        scens = [SingleFaultScenario.from_fault(fault, times[ind], mdl=mdl,
+                                                weight=weight,
+                                                phasemap=faultsamples[i].phasemap)
+                 for ind, weight in zip(inds, weights)]
+        return scens, weights
+
+    def sim_scens(scenlist):
+        it_results, it_mdlhists = scenlist_helper(mdl,
+                                                  scenlist,
+                                                  c_mdl,
+                                                  **kwargs,
+                                                  nomhist=nomhist,
+                                                  nomresult=nomresult,
+                                                  nomstates=nomstates)
+        for scen in scenlist:
+            results[scen.name] = it_results[scen.name]
+            mdlhists[scen.name] = it_mdlhists[scen.name]
+            sim_rates[scen.name] = scen.rate
+
+    results, mdlhists = Result(), History()
+    sim_rates = {}
+    for iteration in range(max_iter):
+        if not pending:
+            break
+        scenlist = []
+        for key, inds in pending.items():
+            scenlist.extend(get_scens(key, inds, samples[key][1])[0])
+        sim_scens(scenlist)
+        for key, inds in pending.items():
+            times, outcomes = samples[key]
+            for ind in inds:
+                name = create_scenname((key[1],), times[ind])
+                outcomes[ind] = [*results[name].get_values(*metrics).values()]
+        pending = {}
+        for key, (times, outcomes) in samples.items():
+            inds = sorted(outcomes)
+            new_inds = [(ind0 + ind1)//2 for ind0, ind1 in zip(inds[:-1], inds[1:])
+                        if ind1 - ind0 > 1
+                        and outcomes_differ(outcomes[ind0], outcomes[ind1], tol=tol)]
+            if new_inds:
+                pending[key] = new_inds
+
+    # re-simulate the scenarios whose rate has changed since they were simulated
+    resim = []
+    for key, (times, outcomes) in samples.items():
+        inds = sorted(outcomes)
+        for scen, weight in zip(*get_scens(key, inds, inds)):
+            faultsamples[key[0]].add_single_fault_scenario(key[1], scen.time,
+                                                           weight=weight)
+            if scen.rate != sim_rates[scen.name]:
+                resim.append(scen)
+    if resim:
+        sim_scens(resim)
+
+    if include_nominal:
+        process_nominal(mdlhists, nomhist, results, nomresult, t_end_nom, **kwargs)
+    close_pool(kwargs)
+    return return_helper(kwargs['save_args'], results, mdlhists)
+
+
+def outcomes_differ(outcome0, outcome1, tol=0.0):
+    """
+    Check whether the metrics of two scenarios differ (for fault_sample_adaptive).
+
+    Examples
+    --------
+    >>> outcomes_differ([1.0, 'a'], [1.05, 'a'], tol=0.1)
+    False
+    >>> outcomes_differ([1.0, 'a'], [1.0, 'b'])
+    True
+    """
+    for val0, val1 in zip(outcome0, outcome1):
+        if is_numeric(val0) and is_numeric(val1):
+            if not np.all(np.abs(np.subtract(val0, val1)) <= tol):
+                return True
+        elif np.any(val0 != val1):
+            return True
+    return False
+
+
 def process_nominal(mdlhists, nomhist, results, nomresult, t_end_nom, **kwargs):
     """Add/save nominal hists/result to overall hist/result."""
     nomhist.cut(t_end_nom)
@@ -750,8 +1615,10 @@ def single_faults(mdl, times=[0.0], include_nominal=True, **kwargs):
         (including the nominal)
     """
     kwargs.update(pack_run_kwargs(**kwargs))
+    nomstates = {}
     n_outs = nom_helper(mdl,
                         times,
+                        nomstates=nomstates,
                         **{**kwargs, 'use_end_condition': False})
     nomresult, nomhist, nomscen, c_mdl, t_end_nom = n_outs
 
@@ -761,46 +1628,67 @@ def single_faults(mdl, times=[0.0], include_nominal=True, **kwargs):
                                         c_mdl,
                                         **kwargs,
                                         nomhist=nomhist,
-                                        nomresult=nomresult)
+                                        nomresult=nomresult,
+                                        nomstates=nomstates)
     if include_nominal:
         process_nominal(mdlhists, nomhist, results, nomresult, t_end_nom, **kwargs)
-    save_helper(kwargs['save_args'], results, mdlhists)
     close_pool(kwargs)
-    return results.flatten(), mdlhists.flatten()
+    return return_helper(kwargs['save_args'], results, mdlhists)
 
 
 def scenlist_helper(mdl, scenlist, c_mdl, **kwargs):
-    max_mem, showprogress, pool, close_p = unpack_mult_kwargs(kwargs)
+    max_mem, showprogress, pool, close_p, stream, share = unpack_mult_kwargs(kwargs)
     staged = kwargs.get('staged', False)
     mem, mem_profile = kwargs['nomhist'].get_memory()
-    if mem * len(scenlist) > max_mem:
+    if mem * len(scenlist) > max_mem and not (stream or share):
         raise Exception("Model history will be too large: "
                         + str(mem) + " > " + str(max_mem))
-    results = Result()
-    mdlhists = History()
-    if pool:
+    if share and not stream:
+        share = {'nomhist': kwargs['nomhist'], 'max_mem': max_mem, 'mem': mem}
+    else:
+        share = False
+    if stream:
+        results, mdlhists = init_stores(stream, kwargs.get('save_args', {}))
+    else:
+        results, mdlhists = Result(), History()
+    if isinstance(pool, ModelPool):
+        if staged:
+            pool.load(mdl.new(**kwargs.get('mdl_kwargs', {})), c_mdl, kwargs)
+        else:
+            pool.load(c_mdl[0], kwargs=kwargs)
+        inputs = [(scen, str(i)) for i, scen in enumerate(scenlist)]
+        res_list = tqdm.tqdm(pool.imap(exec_scen_worker, inputs),
+                             total=len(inputs),
+                             disable=not (showprogress),
+                             desc="SCENARIOS COMPLETE")
+        unpack_res_list(scenlist, res_list, results, mdlhists, share=share)
+    elif pool:
         check_mdl_memory(mdl, len(scenlist), max_mem=max_mem)
         if staged:
-            inputs = [(c_mdl[scen.time], scen, kwargs, str(i))
+            mdl_s = mdl.new(**kwargs.get('mdl_kwargs', {}))
+            inputs = [(mdl_s, scen, kwargs, str(i), c_mdl[scen.time])
                       for i, scen in enumerate(scenlist)]
         else:
             inputs = [(c_mdl[0], scen, kwargs, str(i))
                       for i, scen in enumerate(scenlist)]
-        res_list = list(tqdm.tqdm(pool.imap(exec_scen_par, inputs),
-                                  total=len(inputs),
-                                  disable=not (showprogress),
-                                  desc="SCENARIOS COMPLETE"))
-        results, mdlhists = unpack_res_list(scenlist, res_list)
+        res_list = tqdm.tqdm(pool.imap(exec_scen_par, inputs),
+                             total=len(inputs),
+                             disable=not (showprogress),
+                             desc="SCENARIOS COMPLETE")
+        unpack_res_list(scenlist, res_list, results, mdlhists, share=share)
     else:
+        if staged:
+            mdl_s = mdl.new(**kwargs.get('mdl_kwargs', {}))
         for i, scen in enumerate(tqdm.tqdm(scenlist,
                                            disable=not (showprogress),
                                            desc="SCENARIOS COMPLETE")):
             name = scen.name
             if staged:
-                mdl_i = c_mdl[scen.time].copy()
+                mdl_i = restore_helper(mdl_s, c_mdl[scen.time], kwargs['nomhist'])
             else:
                 mdl_i = c_mdl[0].new()
             ec, mh, t_end = exec_scen(mdl_i, scen, indiv_id=str(i), **kwargs)
+            share_helper(share, mh)
             results[name], mdlhists[name] = ec, mh
     return results, mdlhists
 
@@ -813,9 +1701,75 @@ def close_pool(kwargs):
         kwargs['pool'].join()
 
 
+def restore_helper(mdl, snapshot, nomhist):
+    """
+    Restore the model to a nominal snapshot for staged execution.
+
+    Parameters
+    ----------
+    mdl : Simulable
+        Model to restore (with the same structure as the nominal model).
+    snapshot : dict
+        Snapshot of the nominal model at the scenario start time (from prop_one_scen).
+    nomhist : History
+        Nominal history, which is copied to the model as the start of its history.
+        The values after the start time are logged over when the scenario is
+        simulated (up to the end of the simulation or the end condition).
+
+    Returns
+    -------
+    mdl : Simulable
+        The restored model.
+    """
+    mdl.restore(snapshot)
+    mdl.h = nomhist.copy()
+    return mdl
+
+
 def exec_scen_par(args):
     """Execute scenario (parallel execution helper function for pool.map)."""
-    return exec_scen(args[0].copy(), args[1], **args[2], indiv_id=args[3])
+    mdl = args[0].copy()
+    if len(args) > 4:
+        restore_helper(mdl, args[4], args[2]['nomhist'])
+    return exec_scen(mdl, args[1], **args[2], indiv_id=args[3])
+
+
+worker = {}
+"""Model, snapshots, and kwargs loaded in the current ModelPool worker process."""
+
+
+def init_worker(barrier):
+    """Initialize a ModelPool worker with the barrier used when loading."""
+    worker.clear()
+    worker['barrier'] = barrier
+
+
+def load_worker(args):
+    """Load the model, snapshots, and kwargs in a ModelPool worker."""
+    try:
+        mdl, snapshots, kwargs = args
+        worker.update(mdl=mdl, snapshots=snapshots, kwargs=kwargs)
+    finally:
+        # wait so that each worker gets one load task
+        worker['barrier'].wait()
+
+
+def exec_scen_worker(args):
+    """Execute scenario (scen, indiv_id) in a ModelPool worker."""
+    scen, indiv_id = args
+    if worker['snapshots']:
+        mdl = restore_helper(worker['mdl'], worker['snapshots'][scen.time],
+                             worker['kwargs']['nomhist'])
+    else:
+        mdl = worker['mdl'].new()
+    return exec_scen(mdl, scen, **worker['kwargs'], indiv_id=indiv_id)
+
+
+def exec_nom_worker(args):
+    """Execute nominal scenario (name, scen) in a ModelPool worker."""
+    name, scen = args
+    return exec_nom_helper(worker['mdl'], scen, name,
+                           **{**worker['kwargs'], 'use_end_condition': False})
 
 
 def exec_scen(mdl, scen, save_args={}, indiv_id='', **kwargs):
@@ -940,27 +1894,39 @@ def nested_sample(mdl, ps, get_phasemap=False, faultdomains={}, faultsamples={},
     """
     save_args = kwargs.get('save_args', {})
     check_overwrite(save_args)
-    max_mem, showprogress, pool, close_p = unpack_mult_kwargs(kwargs)
+    max_mem, showprogress, pool, close_p, stream, share = unpack_mult_kwargs(kwargs)
     sim_kwarg = pack_sim_kwargs(**kwargs)
     run_kwargs_nest = pack_run_kwargs(**kwargs)
     scennames = ps.scen_names()
-    nest_hist = History.fromkeys(scennames)
-    nest_res = Result.fromkeys(scennames)
+    if stream:
+        nest_res, nest_hist = init_stores(stream, save_args)
+    else:
+        nest_res, nest_hist = Result(), History()
     apps = dict.fromkeys(scennames)
     for scenname, scen in tqdm.tqdm(ps.named_scenarios().items(),
                                     disable=not (showprogress),
                                     desc="NESTED SCENARIOS COMPLETE"):
-        loc_kwarg = {**sim_kwarg, 'scen': scen, 'close_pool': False,
+        loc_kwarg = {**sim_kwarg, 'scen': scen, 'pool': pool, 'close_pool': False,
+                     'share_nominal': share,
                      'get_phasemap': get_phasemap, 'showprogress': False,
                      'include_nominal': include_nominal}
+        if stream:
+            # inner scenarios are written to the nested stores as they complete
+            n_written = len(nest_res)
+            loc_kwarg['stream'] = (nest_res.with_prefix(scenname + "."),
+                                   nest_hist.with_prefix(scenname + "."))
         res, hist, app = fault_sample_from(mdl, faultdomains, faultsamples, **loc_kwarg)
+        if stream and save_args:
+            inner_scens = nest_res.keys()[n_written:]
+            res = nest_res.load(*inner_scens).all_with(scenname)
+            hist = nest_hist.load(*inner_scens).all_with(scenname)
         save_helper(save_args, res, hist, indiv_id=scenname, result_id=scenname)
-        nest_res[scenname] = res
-        nest_hist[scenname] = hist
+        if not stream:
+            nest_res[scenname] = res
+            nest_hist[scenname] = hist
         apps[scenname] = app
-    save_helper(save_args, nest_res, nest_hist)
     close_pool({'pool': pool, 'close_pool': close_p})
-    return nest_res.flatten(), nest_hist.flatten(), apps
+    return (*return_helper(save_args, nest_res, nest_hist), apps)
 
 
 def gen_sampleapproach(mdl, faultdomains={}, faultsamples={},
@@ -1041,7 +2007,8 @@ def check_end_condition(mdl, use_end_condition, t):
         return False
 
 
-def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
+def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, nomstates={},
+                  statelog=None, **kwargs):
     """
     Simulate a single scenario in the model over time.
 
@@ -1052,13 +2019,20 @@ def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
     scen : Scenario
         The Scenario to run.
     ctimes : list, optional
-        List of times to copy the model (for use in staged execution).
+        List of times to snapshot the model (for use in staged execution).
         The default is [].
     nomhist : dict, optional
         Model history dictionary from previous runs, for use in creating the new
         mdlhist. The default is {}.
     nomresult : dict, optional
         Nominal result dictionary (to compare with current if desired)
+    nomstates : dict, optional
+        Hashes of the nominal state at each time (and the final nominal snapshot at
+        'end') from the statelog of the nominal run, for ending the scenario when it
+        reconverges to nominal (if reconverge=True). The default is {}.
+    statelog : dict, optional
+        Dict to record the hashes of the state of the model at each time to (and the
+        final snapshot at 'end'). The default is None, which does not record them.
     **kwargs : kwargs
         simulation options, see :data:`sim_kwargs`
     Returns
@@ -1068,13 +2042,20 @@ def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
     mdlhist : dict
         A dictionary with a history of modelstates.
     c_mdl : dict
-        A dictionary of models at each time given in ctimes with structure {time:model}
+        A dictionary of model snapshots (see Simulable.get_snapshot) at each time given
+        in ctimes with structure {time:snapshot}
     t_end: float
         Last sim time
     """
-    desired_result, staged, cut_hist, run_stochastic, use_end_condition, warn_faults = unpack_sim_kwargs(**kwargs)
+    desired_result, staged, cut_hist, run_stochastic, use_end_condition, warn_faults, cache, reconverge = unpack_sim_kwargs(**kwargs)
+    # scenarios which snapshot/log the model (ctimes) are always simulated
+    if cache and not ctimes and statelog is None:
+        key = cache.get_key(mdl, scen, **kwargs)
+        cached = cache.load(key)
+        if cached:
+            return cached
     # if staged, we want it to start a new run from the starting time of the scenario,
-    # using a copy of the input model (which is the nominal run) at this time
+    # using the input model (restored from the nominal run) at this time
     if staged:
         start_time = scen.time
     else:
@@ -1087,6 +2068,14 @@ def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
                             + str(timerange))
     shift = mdl.sp.get_shift(start_time)
     mdl.init_time_hist()
+    check_states = (reconverge and nomstates and scen['sequence']
+                    and not (use_end_condition and mdl.sp.end_condition)
+                    and not (type(desired_result) is dict
+                             and ('all' in desired_result
+                                  or not all([type(k) is str
+                                              for k in desired_result]))))
+    if check_states:
+        last_inj_time = max(scen['sequence'])
     # run model through the time range defined in the object
     c_mdl = dict.fromkeys(ctimes)
     result = Result()
@@ -1094,7 +2083,7 @@ def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
         # inject fault when it occurs, track defined flow states and graph
         try:
             if t in ctimes:
-                c_mdl[t] = mdl.copy()
+                c_mdl[t] = mdl.get_snapshot()
             if t in scen['sequence']:
                 fxnfaults = scen['sequence'][t].get('faults', {})
                 disturbances = scen['sequence'][t].get('disturbances', {})
@@ -1122,10 +2111,19 @@ def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
                                                   nom_res, time=t)
             if check_end_condition(mdl, use_end_condition, t):
                 break
+            if statelog is not None:
+                statelog[t] = get_state_hash(mdl)
+            elif (check_states and t >= last_inj_time
+                  and nomstates.get(t) == get_state_hash(mdl)):
+                splice_nominal(mdl, nomhist, nomstates, t)
+                t_ind, t = len(timerange) - 1, timerange[-1]
+                break
         except:
             print("Error at t=" + str(t) + ' in scenario ' + str(scen))
             raise
             break
+    if statelog is not None:
+        statelog['end'] = mdl.get_snapshot()
     if cut_hist:
         mdl.h.cut(t_ind + shift)
     if type(desired_result) is dict and 'end' in desired_result:
@@ -1138,9 +2136,101 @@ def prop_one_scen(mdl, scen, ctimes=[], nomhist={}, nomresult={}, **kwargs):
     if None in c_mdl.values():
         raise Exception("Sample times" + str(ctimes)
                         + " go beyond simulation time " + str(t))
+    if cache and not ctimes and statelog is None:
+        cache.save(key, result, mdl.h, t_ind + shift)
     return result, mdl.h, c_mdl, t_ind + shift
 
 
+def get_state_hash(mdl):
+    """
+    Get a hash of the mutable state of the model.
+
+    The state includes everything saved in a snapshot (see BaseObject.get_snapshot),
+    including the state of random number generators and active actions, so that
+    models with the same hash will have the same simulation going forward.
+
+    Examples
+    --------
+    >>> from examples.pump.ex_pump import Pump
+    >>> mdl = Pump()
+    >>> hash0 = get_state_hash(mdl)
+    >>> mdl.fxns['move_water'].m.add_fault('mech_break')
+    >>> hash0 == get_state_hash(mdl)
+    False
+    >>> mdl.fxns['move_water'].m.remove_fault('mech_break')
+    >>> hash0 == get_state_hash(mdl)
+    True
+
+    Since it includes the rng state, the hash changes when random numbers are drawn:
+
+    >>> from examples.pump.pump_stochastic import Pump as StochasticPump
+    >>> mdl = StochasticPump()
+    >>> hash0 = get_state_hash(mdl)
+    >>> _ = mdl.fxns['import_ee'].r.rng.random()
+    >>> hash0 == get_state_hash(mdl)
+    False
+    """
+    return hashlib.md5(snapshot_repr(mdl).encode()).digest()
+
+
+def snapshot_repr(obj, seen=None):
+    """Represent the mutable roles of obj (see BaseObject.get_snapshot) as a string."""
+    if seen is None:
+        seen = set()
+    seen.add(id(obj))
+    reprs = []
+    for rolename, role in obj.get_snapshot_roles().items():
+        if hasattr(role, 'get_snapshot_roles'):
+            if id(role) not in seen:
+                reprs.append(rolename + ":" + snapshot_repr(role, seen))
+            continue
+        elif hasattr(role, 'return_mutables'):
+            role_repr = state_repr(role.return_mutables())
+        else:
+            role_repr = state_repr(role)
+        if isinstance(getattr(role, 'rng', None), np.random.Generator):
+            role_repr += canonical_repr(role.rng.bit_generator.state)
+        reprs.append(rolename + ":" + role_repr)
+    return "{" + ", ".join(reprs) + "}"
+
+
+def state_repr(obj):
+    """Represent (nested) mutables as strings, including all array values."""
+    if isinstance(obj, np.ndarray):
+        return obj.dtype.str + str(obj.shape) + obj.tobytes().hex()
+    elif isinstance(obj, (list, tuple)):
+        return "(" + ", ".join([state_repr(v) for v in obj]) + ")"
+    elif isinstance(obj, dict):
+        return ("{" + ", ".join([repr(k) + ": " + state_repr(v)
+                                 for k, v in sorted(obj.items(),
+                                                    key=lambda x: repr(x[0]))])
+                + "}")
+    else:
+        return canonical_repr(obj)
+
+
+def splice_nominal(mdl, nomhist, nomstates, t):
+    """
+    Splice the rest of the nominal run into a scenario which has reconverged at t.
+
+    Parameters
+    ----------
+    mdl : Simulable
+        Model (in the same state as the nominal model at t).
+    nomhist : History
+        Nominal history, which the history of the model after t is copied from.
+    nomstates : dict
+        Nominal states (with the final nominal snapshot at 'end'), which the model is
+        restored to.
+    t : float
+        Time the scenario reconverged.
+    """
+    inds = np.flatnonzero(nomhist['time'] > t)
+    for k, hist in mdl.h.items():
+        hist[inds] = nomhist[k][inds]
+    mdl.restore(nomstates['end'])
+
+
 def get_result(scen, mdl, desired_result, nomhist={}, nomresult={}, time=0.0):
     """Get the desired_result specified from the model."""
     mdlhist = mdl.h
@@ -1238,3 +2328,141 @@ def get_endclass_vars(mdl, desired_result, result):
     var_result = mdl.get_vars(*vars_to_get, trunc_tuple=False)
     for i, var in enumerate(vars_to_get):
         result[var] = var_result[i]
+
+
+class_sources = {}
+"""Source code of each class found by :func:`get_code_sources` (per-process)."""
+
+module_sources = {}
+"""Hash of the source of each module file by (filename, mtime) (per-process)."""
+
+
+def get_module_source(modulename):
+    """
+    Get the hash of the source code of a given module ('' if not available).
+
+    Hashes are kept per file and modification time, so that editing a module
+    (e.g., a helper function used by a behavior) changes its hash.
+    """
+    try:
+        filename = inspect.getsourcefile(sys.modules[modulename])
+        key = (filename, os.path.getmtime(filename))
+    except (KeyError, TypeError, OSError):
+        return ''
+    if key not in module_sources:
+        with open(filename, 'rb') as file_handle:
+            module_sources[key] = hashlib.sha256(file_handle.read()).hexdigest()
+    return module_sources[key]
+
+
+def get_code_sources(obj, sources=None):
+    """
+    Get the source code of the classes (and base classes) of an object and its roles.
+
+    Since behaviors may call module-level helpers, the (hash of the) source of the
+    modules defining each class is included. Classes without a module file (e.g.,
+    defined interactively) are represented by their own source (if available).
+
+    Parameters
+    ----------
+    obj : BaseObject
+        Object (e.g., Model) to get the code of.
+    sources : dict, optional
+        Sources found so far. The default is None.
+
+    Returns
+    -------
+    sources : dict
+        Dict of source code hashes for each module with structure {'module': hash},
+        and for each class without a module file with structure
+        {'module.class': source}. Classes without source available map to ''.
+
+    Examples
+    --------
+    >>> from examples.pump.ex_pump import Pump
+    >>> sources = get_code_sources(Pump())
+    >>> 'examples.pump.ex_pump' in sources
+    True
+    >>> 'fmdtools.define.block.function' in sources
+    True
+    """
+    if sources is None:
+        sources = {}
+    clsname = obj.__class__.__module__ + "." + obj.__class__.__qualname__
+    if clsname in sources:
+        return sources
+    sources[clsname] = ''
+    for cls in obj.__class__.__mro__:
+        if cls.__module__ == 'builtins' or cls.__module__ in sources:
+            continue
+        module_source = get_module_source(cls.__module__)
+        if module_source:
+            sources[cls.__module__] = module_source
+        else:
+            if cls not in class_sources:
+                try:
+                    class_sources[cls] = inspect.getsource(cls)
+                except (OSError, TypeError):
+                    class_sources[cls] = ''
+            sources[cls.__module__ + "." + cls.__qualname__] = class_sources[cls]
+    if hasattr(obj, 'get_roles_as_dict'):
+        for role_obj in obj.get_roles_as_dict().values():
+            get_code_sources(role_obj, sources)
+    return sources
+
+
+def canonical_repr(obj):
+    """
+    Represent (nested) values as strings independent of order/hash seed/address.
+
+    Arrays are represented by all of their values (rather than their possibly
+    truncated repr), containers by their fields, rngs by their state, classes by their
+    qualified name, and functions by their qualified name and code.
+
+    Examples
+    --------
+    >>> a = np.zeros(2000)
+    >>> b = a.copy()
+    >>> b[1000] = 1.0
+    >>> repr(a) == repr(b)
+    True
+    >>> canonical_repr(a) == canonical_repr(b)
+    False
+    >>> canonical_repr({'b': {2, 1}, 'a': np.equal, 'c': Result})
+    "{'a': <ufunc 'equal'>, 'b': {1, 2}, 'c': fmdtools.analyze.result.Result}"
+    >>> canonical_repr(lambda x: x > 1) == canonical_repr(lambda x: x > 2)
+    False
+    >>> rng = np.random.default_rng(1)
+    >>> canonical_repr(rng) == canonical_repr(np.random.default_rng(1))
+    True
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            return "array(" + canonical_repr(obj.tolist()) + ")"
+        return obj.dtype.str + str(obj.shape) + obj.tobytes().hex()
+    elif isinstance(obj, np.random.Generator):
+        return "Generator(" + canonical_repr(obj.bit_generator.state) + ")"
+    elif inspect.iscode(obj):
+        return ("code(" + obj.co_code.hex() + canonical_repr(obj.co_consts)
+                + canonical_repr(obj.co_names) + ")")
+    elif isinstance(obj, type) or inspect.isroutine(obj):
+        name = str(getattr(obj, '__module__', '')) + "." + obj.__qualname__
+        if inspect.isfunction(obj):
+            name += canonical_repr(obj.__code__)
+        return name
+    elif hasattr(obj, '__fields__'):
+        return obj.__class__.__qualname__ + canonical_repr(asdict(obj))
+    elif isinstance(obj, dict) or (hasattr(obj, 'items') and hasattr(obj, 'keys')):
+        return ("{" + ", ".join([repr(k) + ": " + canonical_repr(v)
+                                 for k, v in sorted(obj.items(),
+                                                    key=lambda x: repr(x[0]))])
+                + "}")
+    elif isinstance(obj, (set, frozenset)):
+        return "{" + ", ".join(sorted([canonical_repr(v) for v in obj])) + "}"
+    elif isinstance(obj, (list, tuple)):
+        return "(" + ", ".join([canonical_repr(v) for v in obj]) + ")"
+    elif hasattr(obj, '__dict__') and " at 0x" in repr(obj):
+        # default object reprs include the address, which changes between runs
+        return obj.__class__.__qualname__ + canonical_repr(vars(obj))
+    else:
+        return repr(obj)
@@ -29,7 +29,8 @@ specific language governing permissions and limitations under the License.
 from fmdtools.define.base import get_var, nest_dict
 from fmdtools.define.container.parameter import Parameter, ExampleParameter
 from fmdtools.sim.scenario import SingleFaultScenario, JointFaultScenario
-from fmdtools.sim.scenario import ParameterScenario
+from fmdtools.sim.scenario import ParameterScenario, ScenarioTable, calc_joint_rate
+from fmdtools.sim.scenario import combine_rates
 from fmdtools.analyze.common import is_numeric
 from fmdtools.analyze.phases import gen_interval_times, PhaseMap, join_phasemaps
 
@@ -334,6 +335,40 @@ def same_mode(modename1, modename2, exact=True):
         return modename1 in modename2
 
 
+def make_group_index(scens, *groupnames):
+    """
+    Group the names of the given scenarios by their values of *groupnames.
+
+    Parameters
+    ----------
+    scens : list
+        List of Scenarios.
+    *groupnames : str
+        Fields of the scenarios to group. e.g., 'function' or 'fault'
+
+    Returns
+    -------
+    group_index : dict
+        Dict of scenario names in each group with structure
+        {(field1_val, field2_val): [scennames]}
+
+    Examples
+    --------
+    >>> scens = [SingleFaultScenario(function="f1", fault="a", time=1, name="s1"),
+    ...          SingleFaultScenario(function="f2", fault="a", time=1, name="s2"),
+    ...          SingleFaultScenario(function="f1", fault="b", time=2, name="s3")]
+    >>> make_group_index(scens, "function")
+    {('f1',): ['s1', 's3'], ('f2',): ['s2']}
+    >>> make_group_index(scens, "fault", "time")
+    {('a', 1): ['s1', 's2'], ('b', 2): ['s3']}
+    """
+    group_index = {}
+    for scen in scens:
+        group = tuple([get_var(scen, groupname) for groupname in groupnames])
+        group_index.setdefault(group, []).append(scen.name)
+    return group_index
+
+
 def sample_times_even(times, numpts, dt=1.0):
     """
     Get sample time for the number of points from sampling evenly.
@@ -401,6 +436,40 @@ def sample_times_quad(times, nodes, weights):
     return sampletimes, list(weights)
 
 
+def calc_nearest_weights(sampleinds, numtimes):
+    """
+    Get weights for sample points from the fraction of times they are nearest to.
+
+    Each of the times (given by their index, 0 to numtimes-1) is assigned to the
+    nearest sample point (or the earlier point, if equally near), so that the
+    weighted sample points represent all of the times (as in a piecewise-constant
+    approximation of the outcome over the times).
+
+    Parameters
+    ----------
+    sampleinds : list
+        Indices of the sampled times (sorted, unique).
+    numtimes : int
+        Number of times the samples represent.
+
+    Returns
+    -------
+    weights : list
+        Weight for each sample point.
+
+    Examples
+    --------
+    >>> calc_nearest_weights([0, 4, 10], 11)
+    [0.2727272727272727, 0.45454545454545453, 0.2727272727272727]
+    >>> calc_nearest_weights([0, 1, 2, 3], 4)
+    [0.25, 0.25, 0.25, 0.25]
+    """
+    sampleinds = np.array(sampleinds)
+    midpoints = (sampleinds[1:] + sampleinds[:-1]) / 2
+    nearest = np.searchsorted(midpoints, np.arange(numtimes), side='left')
+    return list(np.bincount(nearest, minlength=len(sampleinds)) / numtimes)
+
+
 class FaultDomain(object):
     """
     Defines the faults which will be sampled from in an approach.
@@ -616,11 +685,44 @@ class BaseSample():
         scens : dict
             Dict of scenarios with the given properties.
         """
-        scens = {i.name: i for i in self.scenarios()}
-        for kwarg in kwargs:
-            scens = {k: v for k, v in scens.items() if get_var(v, kwarg) == kwargs[kwarg]}
+        scens = self.named_scenarios()
+        try:
+            names = self.get_group_index(*kwargs).get(tuple(kwargs.values()), [])
+            scens = {name: scens[name] for name in names}
+        except TypeError:
+            # unhashable values (e.g., dicts) are compared to each scenario directly
+            for kwarg in kwargs:
+                scens = {k: v for k, v in scens.items()
+                         if get_var(v, kwarg) == kwargs[kwarg]}
         return scens
 
+    def get_group_index(self, *groupnames):
+        """
+        Get the names of the scenarios in each group of values of *groupnames.
+
+        The index is made in one pass over the scenarios and cached (for the given
+        groupnames) until scenarios are added to or pruned from the sample.
+
+        Parameters
+        ----------
+        *groupnames : str
+            Fields of the scenarios to group. e.g., 'function' or 'fault'
+
+        Returns
+        -------
+        group_index : dict
+            Dict of scenario names in each group with structure
+            {(field1_val, field2_val): [scennames]}
+        """
+        if groupnames not in self._group_index:
+            self._group_index[groupnames] = make_group_index(self.scenarios(),
+                                                             *groupnames)
+        return self._group_index[groupnames]
+
+    def reset_group_index(self):
+        """Reset the cached group index (e.g., when scenarios are added/removed)."""
+        self._group_index = {}
+
     def get_groups_scens(self, groupnames, groups):
         """
         Get scenarios related to the given groups.
@@ -638,12 +740,8 @@ class BaseSample():
             dict of scenarios for each group with structure
             {(field1_val, field2_val) : [scenarios]}
         """
-        scen_groups = {}
-        for group in groups:
-            group_kwargs = {groupname: group[i]
-                            for i, groupname in enumerate(groupnames)}
-            scen_groups[group] = list(self.get_scens(**group_kwargs))
-        return scen_groups
+        group_index = self.get_group_index(*groupnames)
+        return {group: [*group_index.get(group, [])] for group in groups}
 
     def group_scens(self, *groupnames):
         """
@@ -659,9 +757,7 @@ class BaseSample():
         groups : list
             List of tuples corresponding to the groups
         """
-        groups = list(set([tuple([get_var(v, groupname) for groupname in groupnames])
-                           for v in self.scenarios()]))
-        return groups
+        return [*self.get_group_index(*groupnames)]
 
     def get_scen_groups(self, *groupnames):
         """
@@ -677,8 +773,8 @@ class BaseSample():
         scen_groups : dict
             Dict of scenarios
         """
-        groups = self.group_scens(*groupnames)
-        return self.get_groups_scens(groupnames, groups)
+        return {group: [*names]
+                for group, names in self.get_group_index(*groupnames).items()}
 
     def num_scenarios(self):
         """Get the number of scenarios in the sample."""
@@ -763,8 +859,10 @@ class FaultSample(BaseSample):
         
     Attributes
     ----------
-    _scenarios : list
-        List of scenarios to sample.
+    _scenarios : ScenarioTable
+        Table of scenarios to sample.
+    _scen_objs : list
+        Scenario objects created from the table so far (None where not yet created).
     _times : set
         Set of times where the scenarios will occur
     """
@@ -774,8 +872,9 @@ class FaultSample(BaseSample):
         if not phasemap and def_mdl_phasemap:
             phasemap = PhaseMap(faultdomain.mdl.sp.phases)
         self.phasemap = phasemap
-        self._scenarios = []
+        self._scenarios = ScenarioTable()
         self._times = set()
+        self.reset_group_index()
 
     def __repr__(self):
         scens = self.scen_names()
@@ -798,16 +897,126 @@ class FaultSample(BaseSample):
         value : float, optional
             Value to compare against. The default is 0.0.
         """
-        self._scenarios = [scen for scen in self._scenarios
-                           if comparator(get_var(scen, scen_var), value)]
+        if scen_var in ScenarioTable.numeric_columns:
+            mask = np.asarray(comparator(self._scenarios.get_column(scen_var), value))
+        else:
+            mask = np.array([comparator(get_var(scen, scen_var), value)
+                             for scen in self._scenarios], dtype=bool)
+        self._scenarios = self._scenarios.select(np.flatnonzero(mask))
+        self.reset_group_index()
 
     def times(self):
         """Get all sampled times."""
         return list(self._times)
 
     def scenarios(self):
-        """Get all sampled scenarios."""
-        return [*self._scenarios]
+        """
+        Get all sampled scenarios.
+
+        The Scenario objects are created from the table once and kept until scenarios
+        are added to or pruned from the sample.
+
+        Examples
+        --------
+        >>> from examples.multirotor.drone_mdl_rural import Drone
+        >>> fd = FaultDomain(Drone())
+        >>> fd.add_fault("affect_dof", "rf_propwarp")
+        >>> fs = FaultSample(fd)
+        >>> fs.add_fault_times([1, 2])
+        >>> [s.name for s in fs.scenarios()]
+        ['affect_dof_rf_propwarp_t1', 'affect_dof_rf_propwarp_t2']
+        >>> fs.scenarios()[0] is fs.scenarios()[0]
+        True
+        """
+        return [self.get_scenario(i) for i in range(len(self._scenarios))]
+
+    def get_scenario(self, ind):
+        """Get the Scenario at index ind of the table, creating it if needed."""
+        if self._scen_objs[ind] is None:
+            self._scen_objs[ind] = self._scenarios[ind]
+        return self._scen_objs[ind]
+
+    def scenario_table(self):
+        """
+        Get the (columnar) table of sampled scenarios.
+
+        The table is held by the sample (rather than copied) and should not be modified
+        directly--use add_single_fault_scenario, prune_scenarios, etc. instead.
+
+        Returns
+        -------
+        scenario_table : ScenarioTable
+            Table with name/time/rate/weight/phase/fault columns for the scenarios.
+
+        Examples
+        --------
+        >>> from examples.multirotor.drone_mdl_rural import Drone
+        >>> fd = FaultDomain(Drone())
+        >>> fd.add_fault("affect_dof", "rf_propwarp")
+        >>> fs = FaultSample(fd)
+        >>> fs.add_fault_times([1, 2])
+        >>> fs.scenario_table().get_column('time')
+        array([1., 2.])
+        """
+        return self._scenarios
+
+    def named_scenarios(self):
+        """Get dict of scenarios by name."""
+        return dict(zip(self.scen_names(), self.scenarios()))
+
+    def get_scens(self, **kwargs):
+        """
+        Get scenarios with the values corresponding to **kwargs (see BaseSample).
+
+        Only the Scenario objects in the resulting group are created.
+
+        Examples
+        --------
+        >>> from examples.multirotor.drone_mdl_rural import Drone
+        >>> fd = FaultDomain(Drone())
+        >>> fd.add_fault("affect_dof", "rf_propwarp")
+        >>> fd.add_fault("affect_dof", "lf_propwarp")
+        >>> fs = FaultSample(fd)
+        >>> fs.add_fault_times([1, 2])
+        >>> [*fs.get_scens(fault='rf_propwarp')]
+        ['affect_dof_rf_propwarp_t1', 'affect_dof_rf_propwarp_t2']
+        >>> [*fs.get_scens(fault='rf_propwarp', time=2)]
+        ['affect_dof_rf_propwarp_t2']
+        """
+        try:
+            names = self.get_group_index(*kwargs).get(tuple(kwargs.values()), [])
+        except TypeError:
+            return super().get_scens(**kwargs)
+        if 'inds' not in self._scen_index:
+            self._scen_index['inds'] = {name: i for i, name
+                                        in enumerate(self.scen_names())}
+        inds = self._scen_index['inds']
+        return {name: self.get_scenario(inds[name]) for name in names}
+
+    def reset_group_index(self):
+        """Reset the cached group index and Scenario objects (e.g., when scenarios
+        are added/removed)."""
+        self._group_index = {}
+        self._scen_index = {}
+        self._scen_objs = [None] * len(self._scenarios)
+
+    def num_scenarios(self):
+        """Get the number of scenarios in the sample."""
+        return len(self._scenarios)
+
+    def scen_names(self):
+        """Get list of scen names."""
+        return [*self._scenarios.get_column('name')]
+
+    def get_group_index(self, *groupnames):
+        """Get the group index (see BaseSample) from the columns of the table."""
+        if groupnames not in self._group_index:
+            try:
+                group_index = self._scenarios.get_group_index(*groupnames)
+            except KeyError:
+                group_index = make_group_index(self._scenarios, *groupnames)
+            self._group_index[groupnames] = group_index
+        return self._group_index[groupnames]
 
     def add_single_fault_scenario(self, faulttup, time, weight=1.0):
         """
@@ -835,9 +1044,16 @@ class FaultSample(BaseSample):
          - affect_dof_rf_propwarp_t5
         """
         self._times.add(time)
-        scen = SingleFaultScenario.from_fault(faulttup, time, mdl=self.faultdomain.mdl,
-                                              weight=weight, phasemap=self.phasemap)
-        self._scenarios.append(scen)
+        if len(faulttup) == 1:
+            faulttup = faulttup[0]
+        if self.phasemap:
+            phase = self.phasemap.find_base_phase(time)
+        else:
+            phase = ''
+        rate = self.faultdomain.mdl.get_scen_rate(*faulttup, time, weight=weight,
+                                                  phasemap=self.phasemap)
+        self._scenarios.add((faulttup,), time, rate=rate, weight=weight, phase=phase)
+        self.reset_group_index()
 
     def add_joint_fault_scenario(self, faulttups, time, weight=1.0, baserate='ind',
                                  p_cond=1.0):
@@ -879,10 +1095,10 @@ class FaultSample(BaseSample):
         True
         """
         self._times.add(time)
-        scen = JointFaultScenario.from_faults(faulttups, time, mdl=self.faultdomain.mdl,
-                                              weight=weight, baserate=baserate,
-                                              p_cond=p_cond)
-        self._scenarios.append(scen)
+        rate = calc_joint_rate(faulttups, time, mdl=self.faultdomain.mdl,
+                               weight=weight, baserate=baserate, p_cond=p_cond)
+        self._scenarios.add(faulttups, time, rate=rate, weight=weight, joint=True)
+        self.reset_group_index()
 
     def add_fault_times(self, times, weights=[], n_joint=1, **joint_kwargs):
         """
@@ -897,7 +1113,7 @@ class FaultSample(BaseSample):
         n_joint : int
             Number of joint fault modes.
         **joint_kwargs : kwargs
-            baserate and p_cond arguments to add_joint_fault_scenario.
+            weight, baserate, and p_cond arguments to add_joint_fault_scenario.
 
         Examples
         --------
@@ -927,21 +1143,76 @@ class FaultSample(BaseSample):
          FaultSample of scenarios: 
           - affect_dof_rf_propwarp__affect_dof_lf_propwarp__affect_dof_rr_propwarp_t5
         """
+        times = [*times]
+        if self.phasemap:
+            phases = self.phasemap.find_base_phases(*times)
+        else:
+            phases = ['' for time in times]
+        if weights:
+            weights = [weights[i] for i in range(len(times))]
+        elif self.phasemap:
+            phase_samples = self.phasemap.calc_samples_in_phases(*times)
+            weights = [1/phase_samples[phase] for phase in phases]
+        else:
+            weights = [1.0 for time in times]
+        # rates are calculated for each fault over all times at once
+        mdl = self.faultdomain.mdl
+        if n_joint == 1:
+            fault_rates = {fault: mdl.get_scen_rates(*fault, times, weights=weights,
+                                                     phasemap=self.phasemap)
+                           for fault in self.faultdomain.faults}
+        else:
+            joint_weight = joint_kwargs.get('weight', 1.0)
+            fault_rates = {fault: mdl.get_scen_rates(*fault, times,
+                                                     weights=joint_weight)
+                           for fault in self.faultdomain.faults}
         jointfaults = itertools.combinations(self.faultdomain.faults, n_joint)
         for faulttups in jointfaults:
-            for i, time in enumerate(times):
-                if weights:
-                    weight = weights[i]
-                elif self.phasemap:
-                    phase_samples = self.phasemap.calc_samples_in_phases(*times)
-                    phase = self.phasemap.find_base_phase(time)
-                    weight = 1/phase_samples[phase]
-                else:
-                    weight = 1.0
-                if n_joint == 1:
-                    self.add_single_fault_scenario(faulttups[0], time, weight=weight)
-                else:
-                    self.add_joint_fault_scenario(faulttups, time, **joint_kwargs)
+            if n_joint == 1:
+                rates = fault_rates[faulttups[0]].tolist()
+                for i, time in enumerate(times):
+                    self._scenarios.add(faulttups, time, rate=rates[i],
+                                        weight=weights[i], phase=phases[i])
+            else:
+                rates = combine_rates({f: fault_rates[f] for f in faulttups},
+                                      baserate=joint_kwargs.get('baserate', 'ind'),
+                                      p_cond=joint_kwargs.get('p_cond', 1.0)).tolist()
+                for i, time in enumerate(times):
+                    self._scenarios.add(faulttups, time, rate=rates[i],
+                                        weight=joint_weight, joint=True)
+        self._times.update(times)
+        self.reset_group_index()
+
+    def get_phasetimes(self, *phases_to_sample):
+        """
+        Get the times that may be sampled in each of the given phases.
+
+        Parameters
+        ----------
+        *phases_to_sample : str
+            Names of phases to sample. If none are provided, all phases are used.
+
+        Returns
+        -------
+        phasetimes : dict
+            Times in each phase, with structure {'phase': [t0, t1, ...]}. If the
+            FaultSample has no phasemap, all times are in the phase 'phase'.
+
+        Examples
+        --------
+        >>> from examples.multirotor.drone_mdl_rural import Drone
+        >>> fd = FaultDomain(Drone())
+        >>> fs = FaultSample(fd, phasemap=PhaseMap({"on": [0, 2], "off": [3, 5]}))
+        >>> fs.get_phasetimes("off")
+        {'off': [3.0, 4.0, 5.0]}
+        """
+        if self.phasemap:
+            phasetimes = self.phasemap.get_sample_times(*phases_to_sample)
+        else:
+            interval = [0, self.faultdomain.mdl.sp.times[-1]]
+            tstep = self.faultdomain.mdl.sp.dt
+            phasetimes = {'phase': gen_interval_times(interval, tstep)}
+        return phasetimes
 
     def add_fault_phases(self, *phases_to_sample, method='even', args=(1,),
                          phase_methods={}, phase_args={},
@@ -967,7 +1238,7 @@ class FaultSample(BaseSample):
         n_joint : int
             Number of joint fault modes to include in sample.
         **joint_kwargs : kwargs
-            baserate and p_cond arguments to add_joint_fault_scenario.
+            weight, baserate, and p_cond arguments to add_joint_fault_scenario.
 
         Examples
         --------
@@ -981,13 +1252,7 @@ class FaultSample(BaseSample):
         FaultSample of scenarios: 
          - affect_dof_rf_propwarp_t4p0
         """
-        if self.phasemap:
-            phasetimes = self.phasemap.get_sample_times(*phases_to_sample)
-        else:
-            interval = [0, self.faultdomain.mdl.sp.times[-1]]
-            tstep = self.faultdomain.mdl.sp.dt
-            phasetimes = {'phase': gen_interval_times(interval, tstep)}
-
+        phasetimes = self.get_phasetimes(*phases_to_sample)
         for phase, times in phasetimes.items():
             loc_method = phase_methods.get(phase, method)
             loc_args = phase_args.get(phase, args)
@@ -1015,6 +1280,9 @@ class JointFaultSample(FaultSample):
             self.phasemap = join_phasemaps(phasemaps)
         elif def_mdl_phasemap:
             self.phasemap = PhaseMap(faultdomains[0].mdl.sp.phases)
+        self._scenarios = ScenarioTable()
+        self._times = set()
+        self.reset_group_index()
 
 
 class SampleApproach(BaseSample):
@@ -1204,6 +1472,14 @@ class SampleApproach(BaseSample):
         return [scen for faultsample in self.faultsamples.values()
                 for scen in faultsample.scenarios()]
 
+    def get_group_index(self, *groupnames):
+        """Get the group index (see BaseSample) merged over the FaultSamples."""
+        group_index = {}
+        for faultsample in self.faultsamples.values():
+            for group, names in faultsample.get_group_index(*groupnames).items():
+                group_index.setdefault(group, []).extend(names)
+        return group_index
+
     def prune_scenarios(self, scen_var='rate', comparator=np.greater, value=0.0):
         """
         Prune scenarios from the FaultSample.
@@ -1245,6 +1521,7 @@ class ParameterSample(BaseSample):
         self.sp = sp
         self.paramdomain = paramdomain
         self._scenarios = []
+        self._group_index = {}
 
     def __repr__(self):
         scens = self.scen_names()
@@ -1312,6 +1589,7 @@ class ParameterSample(BaseSample):
                                  name=name,
                                  inputparams=inputparams)
         self._scenarios.append(scen)
+        self.reset_group_index()
 
     def add_variable_replicates(self, x_combos, replicates=1, seed_comb='shared',
                                 name='var', weight=1.0):
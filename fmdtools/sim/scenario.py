@@ -12,6 +12,7 @@ Classes:
 - :class:`JointFaultScenario`: Defines the scenario of multiple faults injected in a
   function at the same time.
 - :class:`ParameterScenario`: Defines the scenario of a model having parameter values.
+- :class:`ScenarioTable`: Defines a columnar table of single/joint fault scenarios.
 - :class:`Sequence`: Creates an overall sequence of Injections from a given sequence of
   faults and disturbances.
 
@@ -33,6 +34,7 @@ from fmdtools.define.base import t_key
 
 from recordclass import dataobject, asdict
 from collections import UserDict
+from collections import abc
 from typing import ClassVar
 import numpy as np
 
@@ -42,6 +44,82 @@ def create_scenname(faulttup, time):
     return '_'.join([fm[0]+'_'+fm[1]+'_' for fm in faulttup])+t_key(time)
 
 
+def calc_joint_rate(faulttups, time, mdl=None, phasemap=None, weight=1.0,
+                    baserate='ind', p_cond=1.0):
+    """
+    Calculate the rate of a joint-fault scenario.
+
+    Parameters
+    ----------
+    faulttups : tuple
+        Faults in the scenario (('blockname', 'faultname'), ...).
+    time : float
+        Time of the scenario.
+    mdl : Simulable, optional
+        Model to get the rates of the individual faults from. If not given, the
+        rate of each fault is the weight. The default is None.
+    phasemap : PhaseMap, optional
+        Phases to get the individual fault rates over. The default is None.
+    weight : float, optional
+        Weighting factor for the individual fault rates. The default is 1.0.
+    baserate : str/tuple, optional
+        Fault (fxn, mode) to get base rate for the scenario from. Default is 'ind'
+        which calculates the rate as independent (rate1*rate2*...). Can also be 'max',
+        which uses the max fault likelihood.
+    p_cond : float, optional
+        Conditional fault probability for joint fault modes. The default is 1.0.
+
+    Returns
+    -------
+    rate : float
+        Rate of the scenario.
+    """
+    rates = {}
+    for faulttup in faulttups:
+        if mdl:
+            rate = mdl.get_scen_rate(*faulttup, time, phasemap=phasemap, weight=weight)
+        else:
+            rate = weight
+        rates[faulttup] = rate
+    return combine_rates(rates, baserate=baserate, p_cond=p_cond)
+
+
+def combine_rates(rates, baserate='ind', p_cond=1.0):
+    """
+    Combine the rates of individual faults into the rate of a joint-fault scenario.
+
+    Parameters
+    ----------
+    rates : dict
+        Rates of the individual faults, with structure {(fxnname, mode): rate}. Rates
+        may be floats or arrays (e.g., for the scenario at multiple times).
+    baserate : str/tuple, optional
+        'ind', 'max', or the fault (fxn, mode) to get the base rate from. See
+        :func:`calc_joint_rate`. The default is 'ind'.
+    p_cond : float, optional
+        Conditional fault probability for joint fault modes. The default is 1.0.
+
+    Returns
+    -------
+    rate : float/np.array
+        Rate(s) of the scenario.
+
+    Examples
+    --------
+    >>> combine_rates({('a', 'f1'): np.array([0.1, 0.2]), ('b', 'f1'): 0.5})
+    array([0.05, 0.1 ])
+    >>> combine_rates({('a', 'f1'): 0.1, ('b', 'f1'): 0.5}, baserate='max', p_cond=0.5)
+    0.25
+    """
+    if baserate == 'ind':
+        rate = np.prod(np.broadcast_arrays(*rates.values()), axis=0)
+    elif baserate == 'max':
+        rate = np.max(np.broadcast_arrays(*rates.values()), axis=0)
+    else:
+        rate = rates[baserate]
+    return rate * p_cond
+
+
 class BaseScenObj(dataobject, readonly=True, mapping=True):
     """Base class for Scenarios and injections."""
 
@@ -236,18 +314,22 @@ class SingleFaultScenario(BaseScenario):
 
     @classmethod
     def from_fault(cls, faulttup, time, mdl=None, weight=1.0, phasemap=None,
-                   starttime=None):
-        """Generate the fault scenario for faulttup at time."""
+                   starttime=None, rate=None, phase=None):
+        """
+        Generate the fault scenario for faulttup at time.
+
+        The phase and rate are calculated from the phasemap/mdl unless given.
+        """
         if len(faulttup) == 1:
             faulttup = faulttup[0]
-        if phasemap:
+        if phase is None and phasemap:
             phase = phasemap.find_base_phase(time)
-        else:
+        elif phase is None:
             phase = ''
-        if mdl:
+        if rate is None and mdl:
             rate = mdl.get_scen_rate(faulttup[0], faulttup[1], time,
                                      phasemap=phasemap, weight=weight)
-        else:
+        elif rate is None:
             rate = weight
         if not starttime:
             starttime = time
@@ -286,28 +368,19 @@ class JointFaultScenario(BaseScenario):
 
     @classmethod
     def from_faults(cls, faulttups, time, mdl=None, phasemap=None, weight=1.0,
-                    baserate='ind', p_cond=1.0, starttime=None):
-        """Generate JointFaultScenario given fault names, time."""
-        if phasemap:
+                    baserate='ind', p_cond=1.0, starttime=None, rate=None, phase=None):
+        """
+        Generate JointFaultScenario given fault names, time.
+
+        The phase and rate are calculated from the phasemap/mdl unless given.
+        """
+        if phase is None and phasemap:
             phase = phasemap.find_base_phase(time)
-        else:
+        elif phase is None:
             phase = ''
-        # calculate rate
-        rates = {}
-        for i, faulttup in enumerate(faulttups):
-            if mdl:
-                rate = mdl.get_scen_rate(*faulttup, time,
-                                         phasemap=phasemap, weight=weight)
-            else:
-                rate = weight
-            rates[faulttup] = rate
-        if baserate == 'ind':
-            rate = np.prod([*rates.values()])
-        elif baserate == 'max':
-            rate = np.max([*rates.values()])
-        else:
-            rate = rates[baserate]
-        rate *= p_cond
+        if rate is None:
+            rate = calc_joint_rate(faulttups, time, mdl=mdl, phasemap=phasemap,
+                                   weight=weight, baserate=baserate, p_cond=p_cond)
         # create sequence
         faults = {}
         for faulttup in faulttups:
@@ -331,6 +404,272 @@ class JointFaultScenario(BaseScenario):
         return scen
 
 
+class ScenarioTable(abc.Sequence):
+    """
+    Columnar table of single/joint fault scenarios.
+
+    Rather than holding a list of Scenario objects, the table holds each field of the
+    scenarios in a column (list), with the faults and phases interned as integer codes
+    and the faults of each scenario given (CSR-style) by the slice
+    fault_ids[fault_ptr[i]:fault_ptr[i+1]]. Scenario objects are only created when
+    accessed (e.g., when iterating over the table to simulate the scenarios), while
+    selection and grouping may be performed over (numpy) arrays of the columns.
+
+    Examples
+    --------
+    >>> st = ScenarioTable()
+    >>> st.add((("f1", "a"),), 1.0, rate=0.1, phase="on")
+    >>> st.add((("f1", "b"), ("f2", "a")), 2.0, rate=0.02, joint=True)
+    >>> st
+    ScenarioTable of scenarios: 
+     - f1_a_t1p0
+     - f1_b__f2_a_t2p0
+    >>> st[0]
+    SingleFaultScenario(sequence={1.0: Injection(faults={'f1': ['a']}, disturbances={})}, times=(1.0,), function='f1', fault='a', rate=0.1, name='f1_a_t1p0', time=1.0, phase='on')
+    >>> st[1].rate
+    0.02
+    >>> st.get_column('rate')
+    array([0.1 , 0.02])
+    >>> st.select([1])
+    ScenarioTable of scenarios: 
+     - f1_b__f2_a_t2p0
+
+    Attributes
+    ----------
+    faults : list
+        Interned faults (fxnname, mode), which are referred to by their index.
+    fault_codes : dict
+        Index of each fault in faults, with structure {(fxnname, mode): code}.
+    phases : list
+        Interned phases, which are referred to by their index.
+    phase_codes : dict
+        Index of each phase in phases, with structure {phase: code}
+    columns : dict
+        Columns of the table, with structure {colname: [values]}, for:
+        'name', 'time', 'rate', 'weight', 'phase' (codes), 'joint' (whether the
+        scenario is a JointFaultScenario), 'fault_ptr' (start of the faults for each
+        scenario in 'fault_ids'), and 'fault_ids' (codes of the faults).
+    """
+
+    colnames = ('name', 'time', 'rate', 'weight', 'phase', 'joint', 'fault_ids')
+    numeric_columns = ('time', 'rate', 'weight')
+
+    def __init__(self):
+        self.faults = []
+        self.fault_codes = {}
+        self.phases = []
+        self.phase_codes = {}
+        self.columns = {col: [] for col in self.colnames}
+        self.columns['fault_ptr'] = [0]
+        self._arrays = {}
+
+    def __len__(self):
+        return len(self.columns['name'])
+
+    def __repr__(self):
+        scens = self.columns['name']
+        tot = len(scens)
+        if tot > 10:
+            scens = scens[0:10]+["... (" + str(tot) + " total)"]
+        return "ScenarioTable of scenarios: " + "\n - " + "\n - ".join(scens)
+
+    def __getitem__(self, ind):
+        if isinstance(ind, slice):
+            return self.select(range(len(self))[ind])
+        if ind < 0:
+            ind += len(self)
+        if not 0 <= ind < len(self):
+            raise IndexError("ScenarioTable index out of range: " + str(ind))
+        return self.get_scenario(ind)
+
+    def __iter__(self):
+        for ind in range(len(self)):
+            yield self.get_scenario(ind)
+
+    def get_code(self, val, vals, codes):
+        """Get the code for the value val in the interned values (adding if new)."""
+        code = codes.get(val)
+        if code is None:
+            code = len(vals)
+            codes[val] = code
+            vals.append(val)
+        return code
+
+    def add(self, faulttups, time, rate=1.0, weight=1.0, phase='', joint=False,
+            name=''):
+        """
+        Add a scenario to the table.
+
+        Parameters
+        ----------
+        faulttups : tuple
+            Faults in the scenario (('blockname', 'faultname'), ...).
+        time : float
+            Time of the scenario.
+        rate : float, optional
+            Rate of the scenario. The default is 1.0.
+        weight : float, optional
+            Weight used for the scenario rate. The default is 1.0.
+        phase : str, optional
+            Phase of the scenario. The default is ''.
+        joint : bool, optional
+            Whether the scenario is a JointFaultScenario. The default is False.
+        name : str, optional
+            Name of the scenario. The default is '', which names the scenario using
+            :func:`create_scenname`.
+        """
+        cols = self.columns
+        cols['name'].append(name or create_scenname(faulttups, time))
+        cols['time'].append(time)
+        cols['rate'].append(rate)
+        cols['weight'].append(weight)
+        cols['phase'].append(self.get_code(phase, self.phases, self.phase_codes))
+        cols['joint'].append(joint)
+        cols['fault_ids'].extend([self.get_code(tuple(faulttup), self.faults,
+                                                self.fault_codes)
+                                  for faulttup in faulttups])
+        cols['fault_ptr'].append(len(cols['fault_ids']))
+        self._arrays.clear()
+
+    def get_faults(self, ind):
+        """Get the faults ((fxnname, mode), ...) of the scenario at index ind."""
+        ptr = self.columns['fault_ptr']
+        return tuple([self.faults[code]
+                      for code in self.columns['fault_ids'][ptr[ind]:ptr[ind+1]]])
+
+    def get_scenario(self, ind):
+        """Create the Scenario object for the scenario at index ind."""
+        cols = self.columns
+        faulttups = self.get_faults(ind)
+        kwargs = {'rate': cols['rate'][ind], 'phase': self.phases[cols['phase'][ind]]}
+        if cols['joint'][ind]:
+            return JointFaultScenario.from_faults(faulttups, cols['time'][ind], **kwargs)
+        else:
+            return SingleFaultScenario.from_fault(faulttups[0], cols['time'][ind],
+                                                  **kwargs)
+
+    def get_column(self, colname):
+        """
+        Get the values of the given field for each scenario.
+
+        Parameters
+        ----------
+        colname : str
+            Field to get. Numeric fields ('time', 'rate', 'weight', 'joint_faults') are
+            returned as arrays, while 'name', 'phase', 'function', and 'fault' are
+            returned as lists. 'function' and 'fault' are only available if the table
+            only has single-fault scenarios.
+
+        Returns
+        -------
+        column : np.array/list
+            Values of the field for each scenario.
+        """
+        if colname in self.numeric_columns:
+            if colname not in self._arrays:
+                self._arrays[colname] = np.array(self.columns[colname], dtype=float)
+            return self._arrays[colname]
+        elif colname == 'joint_faults':
+            return np.diff(self.columns['fault_ptr'])
+        elif colname == 'name':
+            return self.columns['name']
+        elif colname == 'phase':
+            return [self.phases[code] for code in self.columns['phase']]
+        elif colname in ('function', 'fault') and not any(self.columns['joint']):
+            ind = int(colname == 'fault')
+            return [self.faults[code][ind] for code in self.columns['fault_ids']]
+        else:
+            raise KeyError("Column " + colname + " not in ScenarioTable")
+
+    def get_codes(self, colname):
+        """Get integer codes (equal for equal values) of the given field."""
+        if colname == 'phase':
+            return np.array(self.columns['phase'], dtype=int)
+        elif colname in ('function', 'fault') and not any(self.columns['joint']):
+            ind = int(colname == 'fault')
+            fault_codes = np.array(self.columns['fault_ids'], dtype=int)
+            _, codes = np.unique([f[ind] for f in self.faults] or [''],
+                                 return_inverse=True)
+            return codes.reshape(-1)[fault_codes]
+        else:
+            _, codes = np.unique(self.get_column(colname), return_inverse=True)
+            return codes.reshape(-1)
+
+    def select(self, inds):
+        """
+        Create a new ScenarioTable with the scenarios at the given indices.
+
+        Parameters
+        ----------
+        inds : list/array
+            Indices of the scenarios to select (e.g., from np.where(mask)).
+
+        Returns
+        -------
+        table : ScenarioTable
+            Table with the selected scenarios (sharing the interned faults/phases).
+        """
+        new = self.__class__()
+        new.faults, new.fault_codes = [*self.faults], {**self.fault_codes}
+        new.phases, new.phase_codes = [*self.phases], {**self.phase_codes}
+        inds = np.asarray(inds, dtype=int)
+        cols, newcols = self.columns, new.columns
+        ind_list = inds.tolist()
+        for col in self.colnames[:-1]:
+            newcols[col] = list(map(cols[col].__getitem__, ind_list))
+        # gather the (CSR) fault ids of the selected rows
+        ptr = np.array(cols['fault_ptr'], dtype=int)
+        starts, lens = ptr[inds], ptr[inds + 1] - ptr[inds]
+        new_ptr = np.concatenate([[0], np.cumsum(lens)])
+        id_inds = np.repeat(starts - new_ptr[:-1], lens) + np.arange(new_ptr[-1])
+        newcols['fault_ids'] = np.array(cols['fault_ids'], dtype=int)[id_inds].tolist()
+        newcols['fault_ptr'] = new_ptr.tolist()
+        return new
+
+    def copy(self):
+        """Copy the ScenarioTable."""
+        return self.select(range(len(self)))
+
+    def get_group_index(self, *groupnames):
+        """
+        Get the names of the scenarios in each group of values of *groupnames.
+
+        Groups are found using the (integer codes of the) columns of the table, giving
+        the same groups (in order of first appearance) as
+        :func:`fmdtools.sim.sample.make_group_index`.
+
+        Parameters
+        ----------
+        *groupnames : str
+            Fields of the scenarios to group (see :meth:`ScenarioTable.get_column`).
+
+        Returns
+        -------
+        group_index : dict
+            Dict of scenario names in each group with structure
+            {(field1_val, field2_val): [scennames]}
+        """
+        names = self.columns['name']
+        if not names:
+            return {}
+        codes = np.stack([self.get_codes(g) for g in groupnames]
+                         + [np.zeros(len(names), dtype=int)], axis=1)
+        _, first, inverse = np.unique(codes, axis=0, return_index=True,
+                                      return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.cumsum(np.bincount(inverse))
+        cols = [self.get_column(g) for g in groupnames]
+        group_index = {}
+        for group in np.argsort(first, kind='stable'):
+            start = bounds[group - 1] if group else 0
+            ind = first[group]
+            key = tuple([self.columns[g][ind] if g in self.numeric_columns
+                         else col[ind] for g, col in zip(groupnames, cols)])
+            group_index[key] = [names[i] for i in order[start:bounds[group]]]
+        return group_index
+
+
 class ParameterScenario(BaseScenario, readonly=True):
     """
     Class defining a nominal (non-fault-injection) Scenario.
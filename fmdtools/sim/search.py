@@ -773,7 +773,8 @@ class ScenarioProblem(BaseSimProblem):
     ----------
     prepped_sims : dict
         Dict of outputs from propagate.nom_helper. Used for staged execution of
-        scenarios (where the model is copied instead of re-simulated).
+        scenarios (where the model is restored from a snapshot instead of
+        re-simulated).
     """
 
     def __init__(self, mdl, faultdomain=None, phasemap=None, **kwargs):
@@ -797,7 +798,8 @@ class ScenarioProblem(BaseSimProblem):
                              "hist": n_outs[1],
                              "scen": n_outs[2],
                              "mdls": n_outs[3],
-                             "t_end_nom": n_outs[4]}
+                             "t_end_nom": n_outs[4],
+                             "mdl": self.mdl.new(**run_kwarg['mdl_kwargs'])}
 
     def sim_mdl(self, *x):
         """
@@ -820,7 +822,9 @@ class ScenarioProblem(BaseSimProblem):
 
         scen = self.gen_scenario(*x)
 
-        mdl = [*self.prepped_sims['mdls'].values()][0].copy()
+        snapshot = [*self.prepped_sims['mdls'].values()][0]
+        mdl = propagate.restore_helper(self.prepped_sims['mdl'], snapshot,
+                                       self.prepped_sims['hist'])
         nomhist = self.prepped_sims['hist'].copy()
         nomresult = self.prepped_sims['result'].copy()
         desired_result = self.obj_con_des_res()
@@ -77,6 +77,7 @@ class CommonTests():
             - History and Result consistent in staged option
             - History and Result consistent in parallel option
             - History and Result consistent with both staged and parallel = True
+            - History and Result consistent when staged in a ModelPool
         """
         from multiprocessing import Pool
         res, hist = prop.fault_sample(mdl, fs, showprogress=False, pool=False,
@@ -96,6 +97,11 @@ class CommonTests():
                                                           track=track)
         stage_par_by_scen = hist_stage_par.nest(1)
 
+        res_mpool, hist_mpool = prop.fault_sample(mdl, fs, showprogress=False,
+                                                  pool=prop.ModelPool(4), staged=True,
+                                                  track=track)
+        mpool_by_scen = hist_mpool.nest(1)
+
         for scen in hist_by_scen.keys():
             mdlhist = hist_by_scen[scen]
             try:
@@ -107,11 +113,15 @@ class CommonTests():
 
                 stage_par = stage_par_by_scen[scen]
                 self.check_same_hist(mdlhist, stage_par, hist1name="staged-parallel")
+
+                mpool = mpool_by_scen[scen]
+                self.check_same_hist(mdlhist, mpool, hist1name="staged-modelpool")
             except AssertionError as e:
                 raise AssertionError("Problem with scenario: " + scen) from e
         self.check_same_res(res, res_stage, res1name="staged")
         self.check_same_res(res, res_par, res1name="par")
         self.check_same_res(res, res_stage_par, res1name="staged-par")
+        self.check_same_res(res, res_mpool, res1name="staged-modelpool")
 
     def check_same_res(self, res, res1, res1name="res1"):
         """Check that two Results have the same values."""
@@ -286,6 +296,11 @@ class CommonTests():
                               [*res_saved_flattened.keys()])
         # check that they are the same value
         self.compare_results(res_flattened, res_saved_flattened)
+        if resfile.endswith(".npz") or resfile.endswith(".cols"):
+            # check that memory-mapped results are also the same
+            res_lazy = Rclass.load(resfile, lazy=True).flatten()
+            self.assertCountEqual([*res_flattened.keys()], [*res_lazy.keys()])
+            self.compare_results(res_flattened, res_lazy)
         if check_link and isinstance(res_saved_flattened['time'], (np.ndarray, list)):
             # check to see that they aren't linked somehow
             res_flattened['time'][0] = 100
@@ -339,18 +354,18 @@ class CommonTests():
 
     def start_sample_test(self, histfile, resfile):
         """Create paths for save/load tests."""
-        if os.path.exists(histfile):
-            os.remove(histfile)
-        if os.path.exists(resfile):
-            os.remove(resfile)
+        for file in (histfile, resfile):
+            if os.path.isdir(file):
+                shutil.rmtree(file)
+            elif os.path.exists(file):
+                os.remove(file)
 
     def end_sample_test(self, hist, histfile, res, resfile):
         """Check files and remove from folder."""
         self.check_same_file(hist, histfile)
         self.check_same_file(res, resfile)
 
-        os.remove(histfile)
-        os.remove(resfile)
+        self.start_sample_test(histfile, resfile)
 
     def check_fs_save(self, mdl, fs, histfile='file', resfile='file', **kwargs):
         """
@@ -467,6 +482,68 @@ class CommonTests():
         res, hist = prop.parameter_sample(mdl, ps, **loc_kwargs)
         self.end_indiv_save(res, hist, resfolder, histfolder, ext)
 
+    def check_fs_stream(self, mdl, fs, folder, **kwargs):
+        """Check that results streamed by prop.fault_sample match the direct outputs."""
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        loc_kwargs = {'showprogress': False, **kwargs}
+        res, hist = prop.fault_sample(mdl, fs, **loc_kwargs)
+        res_store, hist_store = prop.fault_sample(mdl, fs, stream=folder, **loc_kwargs)
+        self.assertEqual(len(res_store), len(res.nest(1)))
+        self.check_same_res(res, res_store.load(), res1name="streamed")
+        self.check_same_hist(hist, hist_store.load(), hist1name="streamed")
+        self.check_same_hist(hist, hist_store.load(lazy=True), hist1name="lazy")
+        self.check_same_res(res.get_values('endclass.rate'),
+                            res_store.get_values('endclass.rate'),
+                            res1name="streamed")
+        shutil.rmtree(folder)
+
+    def check_ns_stream(self, mdl, ps, faultdomains, faultsamples, folder,
+                        resfolder, histfolder, ext, **kwargs):
+        """Check that results streamed by prop.nested_sample match the direct outputs
+        (and are saved individually, when given save_args)."""
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        self.start_indiv_save(resfolder, histfolder)
+        loc_kwargs = {'showprogress': False, 'faultdomains': faultdomains,
+                      'faultsamples': faultsamples, **kwargs}
+        res, hist, _ = prop.nested_sample(mdl, ps, **loc_kwargs)
+        save_args = {'mdlhist': {'filename': histfolder+"."+ext},
+                     'endclass': {'filename': resfolder+"."+ext},
+                     'indiv': True}
+        res_store, hist_store, _ = prop.nested_sample(mdl, ps, stream=folder,
+                                                      save_args=save_args,
+                                                      **loc_kwargs)
+        inner_scens = {".".join(k.split(".")[:2]) for k in res}
+        self.assertEqual(set(res_store.keys()), inner_scens)
+        self.check_same_res(res, res_store.load(), res1name="streamed")
+        self.check_same_hist(hist, hist_store.load(), hist1name="streamed")
+        self.end_indiv_save(res, hist, resfolder, histfolder, ext)
+        with self.assertRaises(Exception):
+            prop.nested_sample(mdl, ps, stream={'folder': folder, 'overwrite': True},
+                               save_args={'endclass': save_args['endclass']},
+                               **loc_kwargs)
+        shutil.rmtree(folder)
+
+    def check_fs_cache(self, mdl, fs, folder, **kwargs):
+        """Check that results loaded from a ResultCache match the direct outputs."""
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        loc_kwargs = {'showprogress': False, **kwargs}
+        res, hist = prop.fault_sample(mdl, fs, **loc_kwargs)
+        cache = prop.ResultCache(folder)
+        # staged nominal runs (which snapshot the model) are not cached
+        num_entries = len(fs.scenarios()) + (not kwargs.get('staged', False))
+        for i in range(2):
+            res_c, hist_c = prop.fault_sample(mdl, fs, cache=cache, **loc_kwargs)
+            self.assertEqual(len(cache), num_entries)
+            self.check_same_res(res, res_c, res1name="cached")
+            self.check_same_hist(hist, hist_c, hist1name="cached")
+        cache.max_size = 0
+        cache.evict()
+        self.assertEqual(len(cache), 0)
+        shutil.rmtree(folder)
+
     def check_ns_isave(self, mdl, ps, faultdomains, faultsamples,
                        resfolder, histfolder, ext, **kwargs):
         """Check that individually saved prop.nested_sample results match outputs."""
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of batched simulation of parameter samples.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.define.container.parameter import Parameter
+from fmdtools.define.container.state import State
+from fmdtools.define.flow.base import Flow
+from fmdtools.define.block.function import Function
+from fmdtools.define.architecture.function import FunctionArchitecture
+from fmdtools.sim.sample import ParameterSample, ParameterDomain
+from fmdtools.sim import propagate as prop
+
+import unittest
+import numpy as np
+
+
+class TankParam(Parameter, readonly=True):
+    """Inflow and outflow coefficient of the tank."""
+
+    inflow: float = 1.0
+    outflow_coeff: float = 0.1
+
+
+class LiquidStates(State):
+    rate: float = 0.0
+
+
+class Liquid(Flow):
+    __slots__ = ()
+    container_s = LiquidStates
+
+
+class LevelStates(State):
+    level: float = 0.0
+
+
+class StoreLiquid(Function):
+    """Tank which fills at a constant rate and drains according to its level."""
+
+    __slots__ = ('liq',)
+    container_p = TankParam
+    container_s = LevelStates
+    flow_liq = Liquid
+    batch_safe = True
+
+    def static_behavior(self, time):
+        self.liq.s.rate = self.p.outflow_coeff * self.s.level
+
+    def dynamic_behavior(self, time):
+        self.s.inc(level=self.p.inflow - self.liq.s.rate)
+
+
+class DrainStates(State):
+    total: float = 0.0
+
+
+class DrainLiquid(Function):
+    """Drain which totals the liquid drained from the tank."""
+
+    __slots__ = ('liq',)
+    container_s = DrainStates
+    flow_liq = Liquid
+    batch_safe = True
+
+    def dynamic_behavior(self, time):
+        self.s.inc(total=self.liq.s.rate)
+
+
+class BatchTank(FunctionArchitecture):
+    __slots__ = ()
+    container_p = TankParam
+    default_sp = dict(end_time=20)
+
+    def init_architecture(self, **kwargs):
+        self.add_flow('liq', Liquid)
+        self.add_fxn('store', StoreLiquid, 'liq', p=self.p)
+        self.add_fxn('drain', DrainLiquid, 'liq')
+
+    def find_classification(self, scen, mdlhists):
+        return {'level': self.fxns['store'].s.level,
+                'total': self.fxns['drain'].s.total}
+
+
+class VectorBatchTank(BatchTank):
+    """Tank with a (non-batched) vector result the same length as the batch."""
+
+    __slots__ = ()
+
+    def find_classification(self, scen, mdlhists):
+        return {**super().find_classification(scen, mdlhists),
+                'weights': np.array([1.0, 2.0, 3.0, 4.0])}
+
+
+class WhereBatchTank(BatchTank):
+    """Tank with a batched result that is not a BatchArray (from np.where)."""
+
+    __slots__ = ()
+
+    def find_classification(self, scen, mdlhists):
+        level = self.fxns['store'].s.level
+        return {**super().find_classification(scen, mdlhists),
+                'overflow': np.where(level > 8, 1.0, 0.0)}
+
+
+class UnsafeDrainLiquid(DrainLiquid):
+    __slots__ = ()
+    batch_safe = False
+
+
+class UnsafeBatchTank(BatchTank):
+    __slots__ = ()
+
+    def init_architecture(self, **kwargs):
+        self.add_flow('liq', Liquid)
+        self.add_fxn('store', StoreLiquid, 'liq', p=self.p)
+        self.add_fxn('drain', UnsafeDrainLiquid, 'liq')
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        pd = ParameterDomain(TankParam)
+        pd.add_variable("inflow")
+        pd.add_variable("outflow_coeff")
+        self.ps = ParameterSample(pd)
+        self.ps.add_variable_replicates([[1.0, 0.1], [2.0, 0.1], [1.0, 0.3], [0.5, 0.2]])
+
+    def test_batch_same_as_serial(self):
+        """Check that a batch gives the same results/histories as running serially."""
+        mdl = BatchTank()
+        res, hist = prop.parameter_sample(mdl, self.ps, showprogress=False)
+        b_res, b_hist = prop.parameter_sample(mdl, self.ps, showprogress=False,
+                                              batch=True)
+        self.assertEqual(set(res), set(b_res))
+        for k, v in res.items():
+            self.assertAlmostEqual(v, b_res[k])
+        self.assertEqual(set(hist), set(b_hist))
+        for k, v in hist.items():
+            np.testing.assert_allclose(v, b_hist[k])
+
+    def test_batch_unbatch_by_batch_axis(self):
+        """Check that only batched values are split between scenarios in the result,
+        even when other array values are the same length as the batch."""
+        mdl = VectorBatchTank()
+        res, hist = prop.parameter_sample(mdl, self.ps, showprogress=False)
+        b_res, b_hist = prop.parameter_sample(mdl, self.ps, showprogress=False,
+                                              batch=True)
+        self.assertEqual(set(res), set(b_res))
+        for k, v in res.items():
+            np.testing.assert_allclose(v, b_res[k])
+
+    def test_batch_unbatch_non_batcharray(self):
+        """Check that batched values which are not BatchArrays are split between
+        scenarios in the result."""
+        mdl = WhereBatchTank()
+        res, hist = prop.parameter_sample(mdl, self.ps, showprogress=False)
+        b_res, b_hist = prop.parameter_sample(mdl, self.ps, showprogress=False,
+                                              batch=True)
+        self.assertEqual(len({float(v) for k, v in res.items() if 'overflow' in k}), 2)
+        self.assertEqual(set(res), set(b_res))
+        for k, v in res.items():
+            np.testing.assert_allclose(v, b_res[k])
+
+    def test_batch_end_condition(self):
+        """Check that end conditions are not silently ignored in a batch."""
+        with self.assertRaises(Exception):
+            prop.parameter_sample(BatchTank(), self.ps, showprogress=False,
+                                  batch=True, use_end_condition=True)
+        prop.parameter_sample(BatchTank(), self.ps, showprogress=False,
+                              batch=True, use_end_condition=False)
+
+    def test_batch_requires_batch_safe(self):
+        """Check that models with functions that are not batch-safe are not run."""
+        self.assertTrue(BatchTank().is_batch_safe())
+        mdl = UnsafeBatchTank()
+        self.assertFalse(mdl.is_batch_safe())
+        with self.assertRaises(Exception):
+            prop.parameter_sample(mdl, self.ps, showprogress=False, batch=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
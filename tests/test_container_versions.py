@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of the container versions used to check for changes in propagation.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.define.container.base import container_versions
+from fmdtools.define.container.state import State
+
+import unittest
+import gc
+import numpy as np
+
+
+class ExStates(State):
+    x: float = 1.0
+    y: float = 2.0
+
+
+class ExArrayStates(State):
+    x: np.ndarray = np.array([1.0, 2.0])
+
+
+class ContainerVersionTests(unittest.TestCase):
+    def test_version_changes(self):
+        """Check that the version changes when values change (and only then)."""
+        s = ExStates()
+        v0 = s.return_version()
+        s.x = 1.0
+        self.assertEqual(v0, s.return_version())
+        s.x = 3.0
+        v1 = s.return_version()
+        self.assertNotEqual(v0, v1)
+        s.inc(y=1.0)
+        v2 = s.return_version()
+        self.assertNotEqual(v1, v2)
+        s.put(x=0.0, y=0.0)
+        self.assertNotEqual(v2, s.return_version())
+
+    def test_version_reverts(self):
+        """Check that a container changed and changed back keeps its version."""
+        s = ExStates()
+        v0 = s.return_version()
+        s.x = 5.0
+        s.x = 1.0
+        self.assertEqual(v0, s.return_version())
+
+    def test_version_reverts_many(self):
+        """Check that a container keeps its version after several changes back."""
+        s = ExStates()
+        v0 = s.return_version()
+        s.x = 5.0
+        s.inc(y=1.0)
+        v1 = s.return_version(observe=False)
+        self.assertNotEqual(v0, v1)
+        s.put(x=1.0, y=2.0)
+        self.assertEqual(v0, s.return_version())
+        s.x = 4.0
+        self.assertNotEqual(v0, s.return_version())
+
+    def test_versioned_at_class_creation(self):
+        """Check that whether a container is versioned is set when it is defined."""
+        self.assertIn('_versioned', ExStates.__dict__)
+        self.assertTrue(ExStates._versioned)
+        self.assertFalse(ExArrayStates._versioned)
+
+    def test_versions_independent(self):
+        """Check that changing one container does not change the version of others."""
+        s1, s2 = ExStates(), ExStates()
+        v2 = s2.return_version()
+        s1.x = 3.0
+        self.assertEqual(v2, s2.return_version())
+
+    def test_entries_removed(self):
+        """Check that the registry does not grow with the containers created."""
+        gc.collect()
+        n_changed = len(container_versions.changed)
+        for i in range(1000):
+            s = ExStates()
+            s.return_version()
+            s.x = float(i)
+        del s
+        gc.collect()
+        self.assertEqual(len(container_versions.changed), n_changed)
+        self.assertEqual(len(container_versions.refs), n_changed)
+
+    def test_new_container_version(self):
+        """Check that new containers do not inherit the versions of collected ones."""
+        for i in range(100):
+            s = ExStates()
+            s.x = 3.0
+            del s
+            self.assertEqual(container_versions.get(ExStates()), 0)
+
+    def test_unversioned(self):
+        """Check that containers with mutable fields return their values."""
+        self.assertFalse(ExArrayStates.is_versioned())
+        s = ExArrayStates()
+        np.testing.assert_array_equal(s.return_version()[0], [1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of copying and querying Coords.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.define.object.coords import ExampleCoords, array_mutables
+
+import unittest
+import numpy as np
+
+
+class CoordsCopyTests(unittest.TestCase):
+    def setUp(self):
+        self.ex = ExampleCoords(r={'seed': 10})
+        self.ex.set(0, 0, "st", 25.0)
+
+    def test_copy_rng_state(self):
+        """Check that the copy keeps the current rng state rather than re-seeding."""
+        self.ex.r.rng.random(5)
+        cop = self.ex.copy()
+        reseeded = ExampleCoords(r={'seed': 10})
+        val = cop.r.rng.random()
+        self.assertEqual(val, self.ex.r.rng.random())
+        self.assertNotEqual(val, reseeded.r.rng.random())
+        # the rngs are independent
+        cop.r.rng.random()
+        self.assertNotEqual(cop.r.rng.random(), self.ex.r.rng.random())
+
+    def test_copy_states_independent(self):
+        """Check that state arrays and role dicts are not shared with the copy."""
+        cop = self.ex.copy()
+        cop.set(0, 0, "st", 5.0)
+        self.assertEqual(self.ex.get(0, 0, "st"), 25.0)
+        self.assertEqual(cop.get(0, 0, "st"), 5.0)
+        self.assertIsNot(cop.states, self.ex.states)
+        self.assertIsNot(cop.properties, self.ex.properties)
+        self.assertIsNot(cop._kwargs, self.ex._kwargs)
+        cop.states['new_st'] = (float, 0.0)
+        self.assertNotIn('new_st', self.ex.states)
+
+    def test_copy_shares_features(self):
+        """Check that read-only features and spatial indexes are shared."""
+        index = self.ex.get_spatial_index("high_v")
+        cop = self.ex.copy()
+        self.assertIs(cop.v, self.ex.v)
+        self.assertIs(cop.get_spatial_index("high_v"), index)
+        with self.assertRaises(ValueError):
+            cop.v[0, 0] = 0.0
+
+
+class CoordsSpatialIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.ex = ExampleCoords()
+
+    def test_unhashable_value(self):
+        """Check that queries with unhashable values work (without being cached)."""
+        np.testing.assert_array_equal(self.ex.find_closest(20, 0, "v", value=[1.0]),
+                                      self.ex.find_closest(20, 0, "v", value=1.0))
+        self.assertEqual([*self.ex._spatial_indexes], [("v", 1.0, np.equal)])
+
+    def test_lambda_not_cached(self):
+        """Check that comparators which are new objects each call are not cached."""
+        for i in range(10):
+            closest = self.ex.find_closest(20, 0, "v", value=5.0,
+                                           comparator=lambda a, b: a > b)
+            np.testing.assert_array_equal(closest, [10.0, 0.0])
+        self.assertEqual(len(self.ex._spatial_indexes), 0)
+
+    def test_cache_bounded(self):
+        """Check that the cache is bounded over many values."""
+        for i in range(2 * self.ex.max_spatial_indexes):
+            self.ex.get_spatial_index("v", float(i))
+        self.assertEqual(len(self.ex._spatial_indexes), self.ex.max_spatial_indexes)
+        self.assertIn(("v", 2.0 * self.ex.max_spatial_indexes - 1, np.equal),
+                      self.ex._spatial_indexes)
+
+
+class CoordsMutablesTests(unittest.TestCase):
+    def setUp(self):
+        self.ex = ExampleCoords()
+        self.rng = np.random.default_rng(10)
+
+    def test_same_as_tuples(self):
+        """Check that byte representations change exactly when the values do."""
+        arr = self.rng.random((20, 20))
+        for _ in range(50):
+            before, before_tup = array_mutables(arr), tuple(map(tuple, arr))
+            i, j = self.rng.integers(0, 20, size=2)
+            arr[i, j] = self.rng.choice([arr[i, j], self.rng.random()])
+            same_tup = before_tup == tuple(map(tuple, arr))
+            self.assertEqual(before == array_mutables(arr), same_tup)
+
+    def test_dtype_and_shape(self):
+        """Check that arrays with the same bytes but other dtypes/shapes differ."""
+        arr = np.zeros((2, 2))
+        self.assertNotEqual(array_mutables(arr), array_mutables(arr.reshape(4)))
+        self.assertNotEqual(array_mutables(np.zeros(4, dtype=np.int64)),
+                            array_mutables(np.zeros(4, dtype=np.float64)))
+
+    def test_nan_unchanged(self):
+        """Check that unchanged NaN values are not seen as changes."""
+        arr = np.full((3, 3), np.nan)
+        self.assertEqual(array_mutables(arr), array_mutables(arr.copy()))
+
+    def test_object_arrays(self):
+        """Check that object arrays fall back to tuples of their values."""
+        arr = np.array([["a", 1], ["b", 2]], dtype=object)
+        self.assertEqual(array_mutables(arr), (("a", 1), ("b", 2)))
+
+    def test_coords_mutables(self):
+        """Check that Coords mutables follow changes/reverts to each state."""
+        m0 = self.ex.return_mutables()
+        self.ex.st[2, 3] = 4.0
+        self.assertNotEqual(m0, self.ex.return_mutables())
+        self.ex.set(20.0, 30.0, "st", 0.0)
+        self.assertEqual(m0, self.ex.return_mutables())
+        self.ex.set_range("st", 1.0)
+        self.assertNotEqual(m0, self.ex.return_mutables())
+        self.assertEqual(self.ex.return_mutables(), self.ex.copy().return_mutables())
+
+
+if __name__ == '__main__':
+    unittest.main()
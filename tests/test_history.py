@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of logging and storing values in History and SparseHist.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.analyze.history import History, SparseHist
+from fmdtools.define.object.coords import ExampleCoords
+
+import unittest
+import types
+import tempfile
+import shutil
+import numpy as np
+
+
+class HistoryLogTests(unittest.TestCase):
+    def setUp(self):
+        self.obj = types.SimpleNamespace(s={'a'}, d={'x': 1.0}, nd={'x': [1.0]})
+        self.hist = History({k: np.empty(3, dtype=object) for k in ['s', 'd', 'nd']})
+
+    def log_changes(self):
+        self.hist.log(self.obj, 0)
+        self.obj.s.add('b')
+        self.obj.d['x'] = 2.0
+        self.obj.nd['x'].append(2.0)
+        self.hist.log(self.obj, 1)
+        self.obj.s.clear()
+        self.hist.log(self.obj, 2)
+
+    def test_log_set_type(self):
+        """Check that logged sets are (independent) sets, not frozensets."""
+        self.log_changes()
+        for s in self.hist.s:
+            self.assertIs(type(s), set)
+        self.assertEqual(list(self.hist.s), [{'a'}, {'a', 'b'}, set()])
+        self.assertIsNot(self.hist.s[2], self.obj.s)
+
+    def test_log_dicts(self):
+        """Check that logged dicts (including nested values) are independent."""
+        self.log_changes()
+        self.assertEqual(list(self.hist.d), [{'x': 1.0}, {'x': 2.0}, {'x': 2.0}])
+        self.assertEqual(list(self.hist.nd), [{'x': [1.0]}, {'x': [1.0, 2.0]},
+                                              {'x': [1.0, 2.0]}])
+
+
+class SparseCoords(ExampleCoords):
+    sparse_hist = True
+    keyframe_interval = 4
+
+
+class SparseHistTests(unittest.TestCase):
+    def setUp(self):
+        self.times = np.arange(20.0)
+        self.sparse = self.log_coords(SparseCoords())
+        self.dense = self.log_coords(ExampleCoords())
+
+    def log_coords(self, coords):
+        """Log random changes to coords (re-logging some steps out of order)."""
+        rng = np.random.default_rng(10)
+        hist = coords.create_hist(self.times)
+        hist['time'] = self.times
+        for t_ind in [*range(20), 5, 6, 13, 19]:
+            for _ in range(rng.integers(0, 3)):
+                coords.st[rng.integers(0, 10), rng.integers(0, 10)] = rng.random()
+            hist.log(coords, t_ind, time=self.times[t_ind])
+        return hist
+
+    def test_same_as_dense(self):
+        """Check that sparse histories have the same values as dense ones."""
+        self.assertIsInstance(self.sparse.st, SparseHist)
+        self.assertLess(self.sparse.st.nbytes, self.dense.st.nbytes)
+        np.testing.assert_array_equal(self.sparse.st, self.dense.st)
+        for key in [7, -1, slice(3, 11), slice(0, 20, 3), (6, 2), (4, 2, 5)]:
+            np.testing.assert_array_equal(self.sparse.st[key], self.dense.st[key])
+
+    def test_cut_copy(self):
+        """Check that cut/copied sparse histories match dense ones."""
+        for end_ind, start_ind in [(9, None), (14, 5), (None, 11)]:
+            sparse = self.sparse.cut(end_ind, start_ind, newcopy=True)
+            dense = self.dense.cut(end_ind, start_ind, newcopy=True)
+            np.testing.assert_array_equal(sparse.st, dense.st)
+        copy = self.sparse.copy()
+        copy.st[3] = np.ones((10, 10))
+        np.testing.assert_array_equal(self.sparse.st, self.dense.st)
+        np.testing.assert_array_equal(copy.st[4:], self.dense.st[4:])
+
+    def test_save_load(self):
+        """Check that sparse histories are saved (and loaded) as dense arrays."""
+        folder = tempfile.mkdtemp()
+        try:
+            for filetype in ['npz', 'cols']:
+                filename = folder + "/hist." + filetype
+                self.sparse.save(filename)
+                loaded = History.load(filename)
+                self.assertIsInstance(loaded.st, np.ndarray)
+                np.testing.assert_array_equal(loaded.st, self.dense.st)
+        finally:
+            shutil.rmtree(folder)
+
+    def test_degraded_hist(self):
+        """Check that degradation is calculated the same as for dense histories."""
+        nom_sparse = SparseCoords().create_hist(self.times)
+        nom_dense = ExampleCoords().create_hist(self.times)
+        for hist in [nom_sparse, nom_dense]:
+            hist['time'] = self.times
+            for t_ind in range(20):
+                hist.log(ExampleCoords(), t_ind, time=self.times[t_ind])
+        deg_sparse = self.sparse.get_degraded_hist('st', nomhist=nom_sparse)
+        deg_dense = self.dense.get_degraded_hist('st', nomhist=nom_dense)
+        self.assertEqual(set(deg_sparse), set(deg_dense))
+        for k, v in deg_dense.items():
+            np.testing.assert_array_equal(deg_sparse[k], v)
+
+
+if __name__ == '__main__':
+    unittest.main()
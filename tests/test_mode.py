@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of the encoding of Mode faults as integer bitmasks.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.define.container.mode import Mode
+from fmdtools.define.block.function import Function
+from fmdtools.sim import propagate as prop
+
+import unittest
+import itertools
+
+
+class MultiMode(Mode):
+    fm_args = ("leak", "clog", "break")
+
+
+class FaultFxn(Function):
+    __slots__ = ()
+    container_m = MultiMode
+
+
+class ModeBitsTests(unittest.TestCase):
+    def setUp(self):
+        self.m = MultiMode()
+
+    def test_bits_roundtrip(self):
+        """Check that each combination of faults is encoded as a distinct bitmask."""
+        bits = set()
+        for n in range(len(self.m.faultmodes) + 1):
+            for faults in itertools.combinations(self.m.faultmodes, n):
+                self.m.faults.clear()
+                self.m.add_fault(*faults)
+                bit = self.m.get_fault_bits()
+                bits.add(bit)
+                self.assertEqual(self.m.return_mutables(), (self.m.mode, bit))
+        self.assertEqual(bits, set(range(2 ** len(self.m.faultmodes))))
+
+    def test_index_on_class(self):
+        """Check that the fault index is shared by instances and only added to."""
+        m1 = MultiMode()
+        self.assertIs(m1.get_fault_index(), self.m.get_fault_index())
+        self.assertNotIn('_fault_index', Mode.__dict__)
+        m1.add_fault('clog')
+        bit = m1.get_fault_bits()
+        m1.faultmodes['crack'] = m1.faultmodes['leak']
+        m1.add_fault('crack')
+        self.assertEqual(m1.get_fault_bits(), bit | 1 << len(self.m.faultmodes))
+        m1.faults.discard('crack')
+        self.assertEqual(m1.get_fault_bits(), bit)
+        self.assertEqual(MultiMode().get_fault_bits(), 0)
+
+    def test_fault_outside_faultmodes(self):
+        """Check that faults not in faultmodes fall back to (copied) fault sets."""
+        self.m.add_fault("leak", "other")
+        self.assertRaises(KeyError, self.m.get_fault_bits)
+        mutables = self.m.return_mutables()
+        self.assertEqual(mutables, (self.m.mode, {"leak", "other"}))
+        self.m.faults.discard("other")
+        self.assertEqual(mutables[1], {"leak", "other"})
+        self.assertNotEqual(mutables, self.m.return_mutables())
+        self.assertEqual(self.m.return_mutables(),
+                         (self.m.mode, self.m.get_fault_bits()))
+
+    def test_fault_checks(self):
+        """Check the fault checks with and without faults present."""
+        self.assertFalse(self.m.any_faults())
+        self.assertFalse(self.m.has_fault("leak", "clog"))
+        self.assertTrue(self.m.no_fault("leak"))
+        self.m.add_fault("clog", "other")
+        self.assertTrue(self.m.any_faults())
+        self.assertTrue(self.m.has_fault("leak", "clog"))
+        self.assertTrue(self.m.has_fault("other"))
+        self.assertFalse(self.m.no_fault("other"))
+        self.assertTrue(self.m.no_fault("leak"))
+
+    def test_change_detection(self):
+        """Check that block versions/state hashes change with any added fault."""
+        fxn = FaultFxn()
+        version = fxn.return_version()
+        statehash = prop.get_state_hash(fxn)
+        for fault in ["leak", "other"]:
+            fxn.m.add_fault(fault)
+            self.assertNotEqual(version, fxn.return_version())
+            self.assertNotEqual(statehash, prop.get_state_hash(fxn))
+            fxn.m.faults.clear()
+            self.assertEqual(version, fxn.return_version())
+            self.assertEqual(statehash, prop.get_state_hash(fxn))
+
+
+if __name__ == '__main__':
+    unittest.main()
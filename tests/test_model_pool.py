@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of the ModelPool, which loads the model into parallel workers once.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from examples.pump.ex_pump import Pump
+from fmdtools.sim.sample import FaultDomain, FaultSample
+from fmdtools.sim import propagate as prop
+
+import unittest
+import numpy as np
+
+
+class ModelPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.mp = prop.ModelPool(2)
+
+    def tearDown(self):
+        self.mp.close()
+        self.mp.terminate()
+        self.mp.join()
+
+    def get_pids(self):
+        return {p.pid for p in self.mp.pool._pool}
+
+    def test_reuse_workers(self):
+        """Check that workers are kept across loads and run the last loaded model."""
+        for p in [{}, {'delay': 5}]:
+            mdl = Pump(p=p)
+            fd = FaultDomain(mdl)
+            fd.add_all()
+            fs = FaultSample(fd)
+            fs.add_fault_times([5, 20])
+            res, hist = prop.fault_sample(mdl, fs, showprogress=False)
+            res_mp, hist_mp = prop.fault_sample(mdl, fs, showprogress=False,
+                                                pool=self.mp, close_pool=False)
+            if not p:
+                pool, pids = self.mp.pool, self.get_pids()
+            self.assertIs(self.mp.pool, pool)
+            self.assertEqual(self.get_pids(), pids)
+            self.assertEqual(set(res), set(res_mp))
+            for k, v in res.items():
+                self.assertEqual(v, res_mp[k])
+            for k, v in hist.items():
+                np.testing.assert_array_equal(v, hist_mp[k])
+
+    def test_close(self):
+        """Check that the workers are stopped when the pool is closed."""
+        self.mp.load(Pump())
+        prop.close_pool({'pool': self.mp})
+        self.assertFalse(self.mp.pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of finding phases in histories and looking up phases in PhaseMaps.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.analyze.phases import PhaseMap, find_mode_runs, from_hist
+from fmdtools.analyze.history import History
+
+import unittest
+import numpy as np
+
+
+def scan_phase(phasemap, time, dt=1.0):
+    """Find the phase of time by checking each phase in order."""
+    for phase, times in phasemap.phases.items():
+        if times[0] <= time < times[1] + dt:
+            return phase
+    return None
+
+
+def scan_mode_runs(modehist, times):
+    """Find the runs of each mode in modehist by checking each index."""
+    phases, modephases, counts = {}, {}, {}
+    for ind, mode in enumerate(modehist):
+        if ind == 0 or modehist[ind - 1] != mode:
+            num = counts.get(mode, 0)
+            counts[mode] = num + 1
+            phaseid = mode + str(num) if num else mode
+            phases[phaseid] = [times[ind], times[ind]]
+            modephases.setdefault(mode, set()).add(phaseid)
+        else:
+            phases[phaseid][1] = times[ind]
+    return phases, modephases
+
+
+class PhaseMapTests(unittest.TestCase):
+    def setUp(self):
+        # phases given out of order, with a gap between 'c' and 'a'
+        self.pm = PhaseMap({'b': [4, 7], 'a': [10, 12], 'c': [0, 3]},
+                           {'on': {'a', 'c'}, 'off': {'b'}})
+        self.times = np.arange(-1.0, 14.0, 0.5)
+
+    def check_same_as_scan(self, pm, dt=1.0):
+        for time in self.times:
+            phase = scan_phase(pm, time, dt)
+            if phase is None:
+                self.assertRaises(Exception, pm.find_phase, time, dt)
+                self.assertRaises(Exception, pm.find_phase_inds, time, dt=dt)
+            else:
+                self.assertEqual(pm.find_phase(time, dt), phase)
+                ind = pm.find_phase_inds(time, dt=dt)[0]
+                self.assertEqual([*pm.phases][ind], phase)
+
+    def test_same_as_scan(self):
+        """Check that indexed lookups match checking each phase."""
+        self.assertIsNotNone(self.pm.get_interval_index())
+        self.check_same_as_scan(self.pm)
+        self.check_same_as_scan(self.pm, dt=0.5)
+
+    def test_overlapping(self):
+        """Check that overlapping phases fall back to checking phases in order."""
+        pm = PhaseMap({'a': [0, 5], 'b': [3, 8], 'c': [9, 10]})
+        self.assertIsNone(pm.get_interval_index())
+        self.check_same_as_scan(pm)
+
+    def test_vectorized(self):
+        """Check that phases of multiple times are found at once."""
+        times = [0, 3.5, 4, 11, 12.5]
+        inds = self.pm.find_phase_inds(*times)
+        self.assertEqual([[*self.pm.phases][i] for i in inds],
+                         [self.pm.find_phase(t) for t in times])
+        self.assertEqual(self.pm.find_base_phases(*times),
+                         ['on', 'on', 'off', 'on', 'on'])
+        self.assertEqual(len(self.pm.find_phase_inds()), 0)
+
+
+class ModeRunTests(unittest.TestCase):
+    def test_same_as_scan(self):
+        """Check that mode runs are the same as found by checking each index."""
+        rng = np.random.default_rng(10)
+        for _ in range(20):
+            modehist = rng.choice(['off', 'on', 'standby'], size=rng.integers(1, 30),
+                                  p=[0.45, 0.45, 0.1])
+            modehist = np.repeat(modehist, rng.integers(1, 4, size=len(modehist)))
+            times = np.arange(len(modehist)) * 0.5
+            phases, modephases = find_mode_runs(modehist, times)
+            phases_scan, modephases_scan = scan_mode_runs(modehist, times)
+            self.assertEqual(phases, phases_scan)
+            self.assertEqual(modephases, modephases_scan)
+
+    def test_from_hist(self):
+        """Check that from_hist gets PhaseMaps of the mode runs."""
+        hist = History({'fxns.f1.m.mode': np.array(['off', 'on', 'on', 'off']),
+                        'time': np.arange(4.0)})
+        phasemaps = from_hist(hist)
+        self.assertEqual(phasemaps['f1'].phases,
+                         {'off': [0.0, 0.0], 'on': [1.0, 2.0], 'off1': [3.0, 3.0]})
+        self.assertEqual(phasemaps['f1'].modephases,
+                         {'off': {'off', 'off1'}, 'on': {'on'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
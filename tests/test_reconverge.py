@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of ending scenarios early when they reconverge to the nominal scenario.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.define.container.state import State
+from fmdtools.define.container.rand import Rand
+from fmdtools.define.flow.base import Flow
+from fmdtools.define.block.function import Function
+from fmdtools.define.architecture.function import FunctionArchitecture
+from fmdtools.define.architecture.action import ExampleActionArchitecture
+from fmdtools.define.object.coords import ExampleCoords
+from fmdtools.define.environment import Environment
+from fmdtools.sim import propagate as prop
+from fmdtools.analyze.history import SparseHist
+from examples.pump.ex_pump import Pump
+
+import unittest
+import numpy as np
+
+
+class SigStates(State):
+    x: float = 0.0
+
+
+class Sig(Flow):
+    __slots__ = ()
+    container_s = SigStates
+
+
+class DrawStates(State):
+    draw: bool = False
+
+
+class DrawSig(Function):
+    """
+    Function which draws a random signal value at t=5.
+
+    If the draw state is set, an extra random number is drawn (and the state is
+    reset), so the model state returns to nominal while the rng state does not.
+    """
+
+    __slots__ = ('sig',)
+    container_s = DrawStates
+    container_r = Rand
+    flow_sig = Sig
+
+    def dynamic_behavior(self, time):
+        if self.s.draw:
+            self.r.rng.random()
+            self.s.draw = False
+        if time == 5.0:
+            self.sig.s.x = self.r.rng.random()
+
+
+class DrawModel(FunctionArchitecture):
+    __slots__ = ()
+    default_sp = dict(end_time=10)
+
+    def init_architecture(self, **kwargs):
+        self.add_flow('sig', Sig)
+        self.add_fxn('draw_sig', DrawSig, 'sig')
+
+    def find_classification(self, scen, mdlhists):
+        return {'x': self.flows['sig'].s.x}
+
+
+class SparseCoords(ExampleCoords):
+    sparse_hist = True
+
+
+class SparseEnvironment(Environment):
+    coords_c = SparseCoords
+
+
+class MarkStates(State):
+    mark: float = 0.0
+
+
+class MarkGrid(Function):
+    """Function which marks the grid with the mark state (and then resets it)."""
+
+    __slots__ = ('grid',)
+    container_s = MarkStates
+    flow_grid = SparseEnvironment
+
+    def dynamic_behavior(self, time):
+        self.grid.c.set(0.0, 0.0, 'st', self.s.mark)
+        self.s.mark = 0.0
+
+
+class GridModel(FunctionArchitecture):
+    __slots__ = ()
+    default_sp = dict(end_time=10)
+
+    def init_architecture(self, **kwargs):
+        self.add_flow('grid', SparseEnvironment)
+        self.add_fxn('mark_grid', MarkGrid, 'grid')
+
+    def find_classification(self, scen, mdlhists):
+        return {'st': self.flows['grid'].c.get(0.0, 0.0, 'st')}
+
+
+class ReconvergeTests(unittest.TestCase):
+    def test_reconverge_rng_state(self):
+        """Check that a scenario whose rng state differs from nominal is not
+        considered reconverged (and spliced with the nominal history)."""
+        mdl = DrawModel(r={'seed': 10})
+        disturbances = {2: {'fxns.draw_sig.s.draw': True}}
+        res_nom, hist_nom = prop.nominal(mdl, run_stochastic=True)
+        res, hist = prop.sequence(mdl, disturbances=disturbances,
+                                  run_stochastic=True)
+        res_rc, hist_rc = prop.sequence(mdl, disturbances=disturbances,
+                                        run_stochastic=True, reconverge=True)
+        self.assertNotEqual(res.endclass.x, res_nom.endclass.x)
+        self.assertEqual(res.endclass.x, res_rc.endclass.x)
+        for k, v in hist.items():
+            np.testing.assert_array_equal(v, hist_rc[k])
+
+    def test_reconverge_all_results(self):
+        """Check that results at every time are kept when reconverge=True."""
+        mdl = Pump()
+        disturbances = {10: {'wat_2.s.flowrate': 5.0}}
+        desired_result = {'all': ('fxns.move_water.s.eff',), 'end': 'endclass'}
+        res, hist = prop.sequence(mdl, disturbances=disturbances,
+                                  desired_result=desired_result)
+        res_rc, hist_rc = prop.sequence(mdl, disturbances=disturbances,
+                                        desired_result=desired_result,
+                                        reconverge=True)
+        self.assertEqual(set(res), set(res_rc))
+        for k, v in res.items():
+            np.testing.assert_equal(v, res_rc[k])
+
+    def test_reconverge_sparse_hist(self):
+        """Check that the nominal history is spliced into sparse Coords histories."""
+        mdl = GridModel(track='all')
+        disturbances = {3: {'fxns.mark_grid.s.mark': 1.0}}
+        res, hist = prop.sequence(mdl, disturbances=disturbances)
+        res_rc, hist_rc = prop.sequence(mdl, disturbances=disturbances,
+                                        reconverge=True)
+        self.assertEqual(res.endclass.st, res_rc.endclass.st)
+        st = hist_rc.get_values('c.st')
+        self.assertEqual(st.faulty.flows.grid.c.st[3][0, 0], 1.0)
+        self.assertIsInstance(st.faulty.flows.grid.c.st, SparseHist)
+        for k, v in hist.items():
+            np.testing.assert_array_equal(v, hist_rc[k])
+
+    def test_state_hash_active_action(self):
+        """Check that the state hash includes the active actions."""
+        aa = ExampleActionArchitecture()
+        hash0 = prop.get_state_hash(aa)
+        active = {*aa.active_actions}
+        aa.active_actions.clear()
+        aa.active_actions.add('act_2')
+        self.assertNotEqual(hash0, prop.get_state_hash(aa))
+        aa.active_actions.clear()
+        aa.active_actions.update(active)
+        self.assertEqual(hash0, prop.get_state_hash(aa))
+
+
+if __name__ == '__main__':
+    unittest.main()
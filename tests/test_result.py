@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of the key index and cached flattening of Results and Histories.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.analyze.result import Result, KeyIndex
+from fmdtools.analyze.history import History
+
+import unittest
+import numpy as np
+
+KEYS = ['scen_1.fxns.f1.s.x', 'scen_1.fxns.f1.s.y', 'scen_1.flows.fl.s.x',
+        'scen_2.fxns.f1.s.x', 'scen_2.fxns.f1.s.y', 'scen_2.flows.fl.s.xx',
+        'nominal.fxns.f1.m.faults.scen_1', 'time']
+
+
+class KeyIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.res = Result({k: i for i, k in enumerate(KEYS)})
+
+    def test_same_as_scan(self):
+        """Check that indexed lookups give the same keys (in order) as scanning."""
+        index = KeyIndex(self.res.data)
+        for prefix in ['scen_1', 'scen_2.fxns', 'nominal.fxns.f1', 'time', 'none']:
+            self.assertEqual(index.with_prefix(prefix),
+                             [k for k in KEYS if k.startswith(prefix + ".")])
+        for comp in ['scen_1', 'f1', 'fxns.f1', 'none']:
+            self.assertEqual(index.with_component(comp),
+                             [k for k in KEYS
+                              if k.startswith(comp + ".") or "." + comp + "." in k])
+        for suffix in ['x', 's.x', 'y', 'scen_1', 'none']:
+            self.assertEqual(index.with_suffix(suffix),
+                             [k for k in KEYS if k.endswith(suffix)])
+
+    def test_result_methods(self):
+        """Check that Result lookups use the index with the same results."""
+        self.assertEqual([*self.res.get_scens('scen_1').keys()],
+                         [k for k in KEYS if 'scen_1.' in k])
+        self.assertEqual([*self.res.get_values('s.x').keys()],
+                         [k for k in KEYS if k.endswith('s.x')])
+        self.assertEqual([*self.res.all_with('scen_2.fxns').keys()],
+                         ['f1.s.x', 'f1.s.y'])
+        self.assertIsNotNone(self.res.get_index())
+
+    def test_index_updates(self):
+        """Check that the index is kept up to date as keys are added/removed."""
+        index = self.res.get_index()
+        self.res['scen_3.fxns.f1.s.x'] = 10
+        del self.res['scen_1.fxns.f1.s.y']
+        self.assertIs(self.res.get_index(), index)
+        self.assertEqual(index.with_prefix('scen_3'), ['scen_3.fxns.f1.s.x'])
+        self.assertEqual(index.with_component('f1'),
+                         [k for k in self.res if '.f1.' in k])
+        self.res.data = {**self.res.data}
+        self.assertIsNot(self.res.get_index(), index)
+
+    def test_nonstr_keys(self):
+        """Check that Results with non-str keys are not indexed."""
+        res = Result({1.0: 1, 'a.b': 2})
+        self.assertIsNone(res.get_index())
+
+
+class FlatCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.hist = History({'a': History({'x': np.zeros(3), 'y': np.ones(3)}),
+                             'time': np.arange(3)})
+
+    def test_flat_cached(self):
+        """Check that the flattened Result is cached while unchanged."""
+        flat = self.hist.get_flat()
+        self.assertEqual([*flat.keys()], ['a.x', 'a.y', 'time'])
+        self.assertIs(self.hist.get_flat(), flat)
+        flat_copy = self.hist.flatten()
+        self.assertIsNot(flat_copy, flat)
+        flat_copy['b'] = np.ones(3)
+        self.assertNotIn('b', self.hist.get_flat())
+
+    def test_flat_changes(self):
+        """Check that the cache is updated when the Result or nested Results change."""
+        flat = self.hist.get_flat()
+        self.hist.a['z'] = np.ones(3)
+        self.assertIn('a.z', self.hist.get_flat())
+        self.hist.b = np.ones(3)
+        self.assertIn('b', self.hist.get_flat())
+        del self.hist.a['x']
+        self.assertNotIn('a.x', self.hist.get_flat())
+        self.assertIsNot(self.hist.get_flat(), flat)
+
+    def test_flat_values(self):
+        """Check that the values in the cached flattened Result are current."""
+        self.hist.a['x'] = np.full(3, 2.0)
+        np.testing.assert_array_equal(self.hist.get_flat()['a.x'], np.full(3, 2.0))
+        np.testing.assert_array_equal(self.hist.get_values('x')['a.x'],
+                                      np.full(3, 2.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of the on-disk ResultCache of simulated scenarios.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from examples.pump.ex_pump import Pump
+from fmdtools.sim.sample import FaultDomain, FaultSample
+from fmdtools.sim.scenario import SingleFaultScenario
+from fmdtools.sim import propagate as prop
+
+import unittest
+import tempfile
+import shutil
+import numpy as np
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = prop.ResultCache(self.folder + "/cache")
+        self.mdl = Pump()
+        self.scen = SingleFaultScenario.from_fault(("move_water", "mech_break"), 10)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_key_stable(self):
+        """Check that keys are the same for the same model/scenario."""
+        key = self.cache.get_key(self.mdl, self.scen)
+        self.assertEqual(key, self.cache.get_key(Pump(), self.scen))
+        self.assertEqual(key, self.cache.get_key(self.mdl.copy(), self.scen))
+
+    def test_key_changes(self):
+        """Check that keys change with the parameters, scenario, and kwargs."""
+        key = self.cache.get_key(self.mdl, self.scen)
+        self.assertNotEqual(key, self.cache.get_key(Pump(p={'delay': 5}), self.scen))
+        scen2 = SingleFaultScenario.from_fault(("move_water", "mech_break"), 11)
+        self.assertNotEqual(key, self.cache.get_key(self.mdl, scen2))
+        self.assertNotEqual(key, self.cache.get_key(self.mdl, self.scen,
+                                                    staged=True))
+
+    def test_key_arrays(self):
+        """Check that values in large arrays (which repr truncates) change keys."""
+        disturbances = np.zeros(2000)
+        scen = SingleFaultScenario.from_fault(("move_water", "mech_break"), 10)
+        scen.sequence[10.0].disturbances['wat_1.s.flowrate'] = disturbances
+        key = self.cache.get_key(self.mdl, scen)
+        disturbances[1000] = 1.0
+        self.assertNotEqual(key, self.cache.get_key(self.mdl, scen))
+
+    def test_cache_same_results(self):
+        """Check that cached results/histories are the same as simulated ones."""
+        fd = FaultDomain(self.mdl)
+        fd.add_all()
+        fs = FaultSample(fd)
+        fs.add_fault_times([5, 20])
+        res, hist = prop.fault_sample(self.mdl, fs, showprogress=False)
+        res_c, hist_c = prop.fault_sample(self.mdl, fs, showprogress=False,
+                                          cache=self.cache)
+        self.assertEqual(len(self.cache), fs.num_scenarios() + 1)
+        res_c2, hist_c2 = prop.fault_sample(self.mdl, fs, showprogress=False,
+                                            cache=self.cache)
+        for r, h in [(res_c, hist_c), (res_c2, hist_c2)]:
+            self.assertEqual(set(res), set(r))
+            for k, v in res.items():
+                self.assertEqual(v, r[k])
+            for k, v in hist.items():
+                np.testing.assert_array_equal(v, h[k])
+
+
+if __name__ == '__main__':
+    unittest.main()
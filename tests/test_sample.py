@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of sampling fault scenarios in FaultSample.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from examples.multirotor.drone_mdl_rural import Drone
+from fmdtools.sim.sample import FaultDomain, FaultSample, SampleApproach
+from fmdtools.sim.sample import ParameterDomain, ParameterSample
+from fmdtools.define.base import get_var
+from fmdtools.define.container.parameter import ExampleParameter
+from fmdtools.analyze.phases import PhaseMap
+
+import unittest
+import itertools
+import numpy as np
+
+
+class FaultSampleTests(unittest.TestCase):
+    def setUp(self):
+        self.fd = FaultDomain(Drone())
+        self.fd.add_fault("affect_dof", "rf_propwarp")
+        self.fd.add_fault("affect_dof", "lf_propwarp")
+        self.fd.add_fault("affect_dof", "rr_propwarp")
+        self.phasemap = PhaseMap({"on": [0, 2], "off": [3, 5]})
+        self.times = [1, 2, 4]
+
+    def check_joint_same_as_individual(self, **joint_kwargs):
+        """Check that joint fault scenarios added over all times have the same rates
+        and weights as ones added individually with add_joint_fault_scenario."""
+        fs = FaultSample(self.fd, phasemap=self.phasemap)
+        fs.add_fault_times(self.times, n_joint=2, **joint_kwargs)
+        fs_ind = FaultSample(self.fd, phasemap=self.phasemap)
+        for faulttups in itertools.combinations(self.fd.faults, 2):
+            for time in self.times:
+                fs_ind.add_joint_fault_scenario(faulttups, time, **joint_kwargs)
+        self.assertEqual(set(fs.scen_names()), set(fs_ind.scen_names()))
+        scens_ind = fs_ind.named_scenarios()
+        for name, scen in fs.named_scenarios().items():
+            np.testing.assert_allclose(scen.rate, scens_ind[name].rate)
+        weights = dict(zip(fs.scen_names(),
+                           fs.scenario_table().get_column('weight')))
+        weights_ind = dict(zip(fs_ind.scen_names(),
+                               fs_ind.scenario_table().get_column('weight')))
+        self.assertEqual(weights, weights_ind)
+        return fs
+
+    def test_joint_rates_default(self):
+        self.check_joint_same_as_individual()
+
+    def test_joint_rates_weight(self):
+        fs = self.check_joint_same_as_individual(weight=0.25)
+        fs_default = self.check_joint_same_as_individual()
+        rates = fs.scenario_table().get_column('rate')
+        rates_default = fs_default.scenario_table().get_column('rate')
+        # each of the two independent fault rates is weighted
+        np.testing.assert_allclose(rates, rates_default * 0.25 ** 2)
+        self.assertTrue(all(fs.scenario_table().get_column('weight') == 0.25))
+
+    def test_joint_rates_kwargs(self):
+        self.check_joint_same_as_individual(weight=0.5, baserate='max', p_cond=0.1)
+
+
+def scan_groups(scens, *groupnames):
+    """Group the names of scens by *groupnames by checking every scenario."""
+    groups = {}
+    for scen in scens:
+        group = tuple([get_var(scen, name) for name in groupnames])
+        groups.setdefault(group, []).append(scen.name)
+    return groups
+
+
+class GroupIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.fd = FaultDomain(Drone())
+        self.fd.add_fault("affect_dof", "rf_propwarp")
+        self.fd.add_fault("affect_dof", "lf_propwarp")
+        self.fd.add_fault("store_ee", "nocharge")
+        self.fs = FaultSample(self.fd)
+        self.fs.add_fault_times([1, 2, 4])
+
+    def test_same_as_scan(self):
+        """Check that the group index matches grouping each scenario."""
+        for groupnames in [('function',), ('fault', 'time'), ('time',)]:
+            groups = scan_groups(self.fs.scenarios(), *groupnames)
+            self.assertEqual(self.fs.get_scen_groups(*groupnames), groups)
+            self.assertEqual(self.fs.group_scens(*groupnames), [*groups])
+        scens = self.fs.get_scens(function='affect_dof', time=2)
+        self.assertEqual([*scens],
+                         ['affect_dof_rf_propwarp_t2', 'affect_dof_lf_propwarp_t2'])
+        self.assertTrue(all(scen.time == 2 for scen in scens.values()))
+        self.assertEqual(self.fs.get_scens(fault='none'), {})
+        groups = self.fs.get_groups_scens(['fault'], [('nocharge',), ('none',)])
+        self.assertEqual(groups, {('nocharge',): ['store_ee_nocharge_t1',
+                                                  'store_ee_nocharge_t2',
+                                                  'store_ee_nocharge_t4'],
+                                  ('none',): []})
+
+    def test_reset_on_change(self):
+        """Check that the cached index is updated when scenarios are added/pruned."""
+        self.assertEqual(len(self.fs.get_scens(time=5)), 0)
+        self.fs.add_fault_times([5])
+        self.assertEqual(len(self.fs.get_scens(time=5)), 3)
+        self.fs.prune_scenarios('time', np.less, 5)
+        self.assertEqual(self.fs.group_scens('time'), [(1,), (2,), (4,)])
+        self.assertEqual(self.fs.get_scen_groups('time'),
+                         scan_groups(self.fs.scenarios(), 'time'))
+
+    def test_sample_approach(self):
+        """Check that the SampleApproach index merges those of its FaultSamples."""
+        app = SampleApproach(Drone())
+        app.add_faultdomain("fd", "fault", "store_ee", "nocharge")
+        app.add_faultsample("fs1", "fault_times", "fd", [1, 2])
+        app.add_faultsample("fs2", "fault_times", "fd", [4, 5])
+        self.assertEqual(app.get_scen_groups('time'),
+                         scan_groups(app.scenarios(), 'time'))
+        self.assertEqual([*app.get_scens(function='store_ee', time=4)],
+                         ['store_ee_nocharge_t4'])
+
+    def test_unhashable(self):
+        """Check that scenarios with unhashable values are compared directly."""
+        expd = ParameterDomain(ExampleParameter)
+        expd.add_variables("y", "x")
+        ps = ParameterSample(expd)
+        ps.add_variable_replicates([[1, 1], [2, 2]], replicates=2)
+        scen = ps.scenarios()[2]
+        scens = ps.get_scens(p=scen.p)
+        self.assertEqual([*scens], [s.name for s in ps.scenarios() if s.p == scen.p])
+        self.assertIn(scen.name, scens)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests of staged execution of scenarios from snapshots of the nominal model.
+
+Copyright © 2024, United States Government, as represented by the Administrator
+of the National Aeronautics and Space Administration. All rights reserved.
+
+The “"Fault Model Design tools - fmdtools version 2"” software is licensed
+under the Apache License, Version 2.0 (the "License"); you may not use this
+file except in compliance with the License. You may obtain a copy of the
+License at http://www.apache.org/licenses/LICENSE-2.0.
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from fmdtools.define.container.state import State
+from fmdtools.define.container.rand import Rand
+from fmdtools.define.flow.base import Flow
+from fmdtools.define.block.function import Function
+from fmdtools.define.architecture.function import FunctionArchitecture
+from fmdtools.sim import propagate as prop
+
+import unittest
+import numpy as np
+
+
+class SigStates(State):
+    x: float = 0.0
+
+
+class Sig(Flow):
+    __slots__ = ()
+    container_s = SigStates
+
+
+class SetSig(Function):
+    """Function which sets the signal to the time at each dynamic step."""
+
+    __slots__ = ('sig',)
+    flow_sig = Sig
+
+    def dynamic_behavior(self, time):
+        self.sig.s.x = time
+
+
+class CountStates(State):
+    val: float = 0.0
+    y: float = 0.0
+
+
+class CountSig(Function):
+    """
+    Function which draws a random number every time its static behavior is run.
+
+    Since the static behavior is re-run when the signal has changed since the last
+    static step, the final value depends on which flows are pending propagation.
+    """
+
+    __slots__ = ('sig',)
+    container_s = CountStates
+    container_r = Rand
+    flow_sig = Sig
+
+    def static_behavior(self, time):
+        self.r.rng.random()
+
+    def dynamic_behavior(self, time):
+        self.s.val = self.r.rng.random()
+
+
+class CountModel(FunctionArchitecture):
+    __slots__ = ()
+    default_sp = dict(end_time=10)
+
+    def init_architecture(self, **kwargs):
+        self.add_flow('sig', Sig)
+        self.add_fxn('set_sig', SetSig, 'sig')
+        self.add_fxn('count_sig', CountSig, 'sig')
+
+    def find_classification(self, scen, mdlhists):
+        return {'val': self.fxns['count_sig'].s.val}
+
+    def indicate_stopped(self, time):
+        return self.fxns['count_sig'].s.y > 1.0
+
+
+class StagedTests(unittest.TestCase):
+    def setUp(self):
+        self.mdl = CountModel(r={'seed': 10})
+        self.disturbances = {5: {'fxns.count_sig.s.y': 1.0}}
+
+    def test_staged_same_as_fresh(self):
+        """Check that scenarios restored from snapshots have the same results and
+        histories as scenarios simulated from the start."""
+        res, hist = prop.sequence(self.mdl, disturbances=self.disturbances,
+                                  staged=False)
+        res_s, hist_s = prop.sequence(self.mdl, disturbances=self.disturbances,
+                                      staged=True)
+        self.assertEqual(res.endclass.val, res_s.endclass.val)
+        for k, v in hist.items():
+            np.testing.assert_array_equal(v, hist_s[k])
+
+    def test_staged_end_condition(self):
+        """Check that scenarios ending early from snapshots have initialized
+        histories when not cut."""
+        mdl = CountModel(r={'seed': 10}, sp={'end_condition': 'indicate_stopped'})
+        disturbances = {5: {'fxns.count_sig.s.y': 2.0}}
+        res, hist = prop.sequence(mdl, disturbances=disturbances, staged=False,
+                                  cut_hist=False)
+        res_s, hist_s = prop.sequence(mdl, disturbances=disturbances, staged=True,
+                                      cut_hist=False)
+        self.assertEqual(res.endclass.val, res_s.endclass.val)
+        np.testing.assert_array_equal(hist.faulty.time, hist_s.faulty.time)
+        for k, v in hist.items():
+            np.testing.assert_array_equal(v[:6], hist_s[k][:6])
+
+    def test_snapshot_pending_flows(self):
+        """Check that flows changed since the last static step are restored as
+        changed."""
+        self.mdl.propagate(0.0)
+        self.mdl.flows['sig'].s.x = 1.0
+        snap = self.mdl.get_snapshot()
+        self.assertEqual(snap['_flowstates'], {'sig'})
+        mdl = self.mdl.new()
+        self.assertEqual(mdl.get_snapshot()['_flowstates'], None)
+        mdl.restore(snap)
+        self.assertEqual(mdl.get_snapshot()['_flowstates'], {'sig'})
+        self.mdl.propagate(1.0)
+        self.assertEqual(self.mdl.get_snapshot()['_flowstates'], set())
+
+
+if __name__ == '__main__':
+    unittest.main()